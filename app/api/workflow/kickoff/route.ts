@@ -27,6 +27,16 @@ export async function POST(request: NextRequest) {
     agent,
   });
   const kickoffResponseData = (await kickoffResponse.json()) as any;
+  if (kickoffResponseData.response?.error) {
+    // The deployed workflow is at its limit of concurrent and queued runs.
+    return NextResponse.json(
+      {
+        error: kickoffResponseData.response.error,
+        queue_status: kickoffResponseData.response.queue_status,
+      },
+      { status: 503 },
+    );
+  }
   const traceId = kickoffResponseData.response.trace_id;
   return NextResponse.json({
     trace_id: traceId,
@@ -0,0 +1,100 @@
+"""
+Microbenchmark of the per-call overhead of the V1 tool proxy.
+
+Builds a trivial V1 tool in a temporary directory (its ".venv" python is the current
+interpreter), then times repeated proxy calls against a bare interpreter start so the
+proxy's own overhead can be read off directly.
+
+Usage:
+    python bin/benchmark-tool-proxy.py [--calls N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "studio", "workflow_engine", "src"))
+
+from engine.crewai.tools import get_tool_instance_proxy  # noqa: E402
+from engine.types import Input__ToolInstance  # noqa: E402
+
+BENCHMARK_TOOL_CODE = """
+from typing import Type
+from pydantic import BaseModel, Field
+from pydantic import BaseModel as StudioBaseTool
+
+
+class UserParameters(BaseModel):
+    pass
+
+
+class EchoTool(StudioBaseTool):
+    class ToolParameters(BaseModel):
+        text: str = Field(description="Text to echo back")
+
+    name: str = "Echo"
+    description: str = "Echoes its input"
+    args_schema: Type[BaseModel] = ToolParameters
+    user_parameters: dict = {}
+
+    def _run(self, text: str) -> str:
+        return text
+"""
+
+
+def _time_calls(fn, calls: int) -> list:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label: str, timings: list) -> None:
+    print(
+        f"{label:<24} mean {statistics.mean(timings) * 1000:8.1f} ms   "
+        f"median {statistics.median(timings) * 1000:8.1f} ms   "
+        f"min {min(timings) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20, help="Number of timed calls per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workflow_directory:
+        tool_dir = os.path.join(workflow_directory, "tool")
+        os.makedirs(os.path.join(tool_dir, ".venv", "bin"))
+        os.symlink(sys.executable, os.path.join(tool_dir, ".venv", "bin", "python"))
+        with open(os.path.join(tool_dir, "tool.py"), "w") as tool_file:
+            tool_file.write(BENCHMARK_TOOL_CODE)
+
+        tool_instance = Input__ToolInstance(
+            id="benchmark",
+            name="Echo",
+            python_code_file_name="tool.py",
+            python_requirements_file_name="requirements.txt",
+            tool_metadata="{}",
+            source_folder_path="tool",
+        )
+        tool = get_tool_instance_proxy(tool_instance, {}, workflow_directory)
+        tool._run(text="warmup")
+
+        baseline = _time_calls(
+            lambda: subprocess.run([sys.executable, "-c", "from pydantic import BaseModel"], check=True), args.calls
+        )
+        proxy = _time_calls(lambda: tool._run(text="hello"), args.calls)
+
+    _report("interpreter + pydantic", baseline)
+    _report("tool proxy call", proxy)
+    print(f"{'proxy overhead':<24} mean {(statistics.mean(proxy) - statistics.mean(baseline)) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark of the kickoff latency of a deployed CrewAI workflow, with and without a
+compiled workflow plan.
+
+Builds a workflow of two agents and tasks, each agent with a V1 tool and a venv tool,
+in a temporary directory. The LLM is stubbed to answer right away, so the timings are
+the engine's own kickoff overhead: building the crew objects and running the crew.
+
+Usage:
+    python bin/benchmark-workflow-kickoff.py [--kickoffs N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "studio", "workflow_engine", "src"))
+
+from engine.crewai.crew import create_crewai_objects  # noqa: E402
+from engine.crewai.plan import compile_crewai_workflow_plan  # noqa: E402
+from engine.crewai.wrappers import AgentStudioCrewAILLM  # noqa: E402
+import engine.types as input_types  # noqa: E402
+
+V1_TOOL_CODE = """
+from typing import Type
+from pydantic import BaseModel, Field
+from pydantic import BaseModel as StudioBaseTool
+
+
+class UserParameters(BaseModel):
+    pass
+
+
+class EchoTool(StudioBaseTool):
+    class ToolParameters(BaseModel):
+        text: str = Field(description="Text to echo back")
+
+    name: str = "Echo"
+    description: str = "Echoes its input"
+    args_schema: Type[BaseModel] = ToolParameters
+    user_parameters: dict = {}
+
+    def _run(self, text: str) -> str:
+        return text
+"""
+
+VENV_TOOL_CODE = '''"""
+Counts the words of a text.
+"""
+from typing import Optional
+from pydantic import BaseModel, Field
+
+OUTPUT_KEY = "RESULT:"
+
+
+class UserParameters(BaseModel):
+    language: Optional[str] = None
+
+
+class ToolParameters(BaseModel):
+    text: str = Field(description="Text to count the words of")
+'''
+
+
+def _stub_llm_call(self, messages, *args, **kwargs) -> str:
+    return "Thought: I know the answer.\nFinal Answer: stub answer"
+
+
+def _write_tool(workflow_directory: str, name: str, code: str) -> input_types.Input__ToolInstance:
+    tool_dir = os.path.join(workflow_directory, name)
+    os.makedirs(os.path.join(tool_dir, ".venv", "bin"))
+    os.symlink(sys.executable, os.path.join(tool_dir, ".venv", "bin", "python"))
+    with open(os.path.join(tool_dir, "tool.py"), "w") as tool_file:
+        tool_file.write(code)
+    return input_types.Input__ToolInstance(
+        id=name,
+        name=name,
+        python_code_file_name="tool.py",
+        python_requirements_file_name="requirements.txt",
+        tool_metadata="{}",
+        source_folder_path=name,
+    )
+
+
+def _get_collated_input(workflow_directory: str) -> input_types.CollatedInput:
+    tool_instances = []
+    agents = []
+    tasks = []
+    for i in range(2):
+        tool_instances.append(_write_tool(workflow_directory, f"echo_{i}", V1_TOOL_CODE))
+        tool_instances.append(_write_tool(workflow_directory, f"word_count_{i}", VENV_TOOL_CODE))
+        agents.append(
+            input_types.Input__Agent(
+                id=f"agent_{i}",
+                name=f"Agent {i}",
+                crew_ai_role="Researcher",
+                crew_ai_backstory="Knows everything",
+                crew_ai_goal="Answer questions",
+                crew_ai_allow_delegation=False,
+                crew_ai_max_iter=3,
+                tool_instance_ids=[f"echo_{i}", f"word_count_{i}"],
+                mcp_instance_ids=[],
+            )
+        )
+        tasks.append(
+            input_types.Input__Task(
+                id=f"task_{i}",
+                description="Answer the question: {question}",
+                expected_output="An answer",
+                assigned_agent_id=f"agent_{i}",
+            )
+        )
+    return input_types.CollatedInput(
+        default_language_model_id="stub",
+        language_models=[input_types.Input__LanguageModel(model_id="stub", model_name="stub", generation_config={})],
+        tool_instances=tool_instances,
+        mcp_instances=[],
+        agents=agents,
+        tasks=tasks,
+        workflow=input_types.Input__Workflow(
+            id="workflow",
+            name="Benchmark",
+            crew_ai_process="sequential",
+            agent_ids=[agent.id for agent in agents],
+            task_ids=[task.id for task in tasks],
+            is_conversational=False,
+        ),
+    )
+
+
+def _time_kickoffs(collated_input, workflow_directory: str, llm_config, kickoffs: int, plan=None) -> list:
+    timings = []
+    for _ in range(kickoffs):
+        start = time.perf_counter()
+        inputs = collated_input if plan is not None else collated_input.model_copy(deep=True)
+        crewai_objects = create_crewai_objects(workflow_directory, inputs, {}, {}, llm_config, plan)
+        crewai_objects.crews[collated_input.workflow.id].kickoff(inputs={"question": "why?"})
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label: str, timings: list) -> None:
+    print(
+        f"{label:<24} mean {statistics.mean(timings) * 1000:8.1f} ms   "
+        f"median {statistics.median(timings) * 1000:8.1f} ms   "
+        f"min {min(timings) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kickoffs", type=int, default=20, help="Number of timed kickoffs per measurement")
+    args = parser.parse_args()
+
+    AgentStudioCrewAILLM.call = _stub_llm_call
+    llm_config = {"stub": {"provider_model": "gpt-4o-mini", "model_type": "OPENAI", "api_key": "stub"}}
+
+    with tempfile.TemporaryDirectory() as workflow_directory:
+        collated_input = _get_collated_input(workflow_directory)
+        # Warm up imports and caches shared by both measurements.
+        _time_kickoffs(collated_input, workflow_directory, llm_config, 1)
+
+        start = time.perf_counter()
+        plan = compile_crewai_workflow_plan(workflow_directory, collated_input, {}, llm_config)
+        compile_seconds = time.perf_counter() - start
+
+        without_plan = _time_kickoffs(collated_input, workflow_directory, llm_config, args.kickoffs)
+        with_plan = _time_kickoffs(collated_input, workflow_directory, llm_config, args.kickoffs, plan)
+
+    print(f"{'plan compile (once)':<24} {compile_seconds * 1000:8.1f} ms")
+    _report("kickoff without plan", without_plan)
+    _report("kickoff with plan", with_plan)
+
+
+if __name__ == "__main__":
+    main()
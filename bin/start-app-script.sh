@@ -154,6 +154,13 @@ if [ "$AGENT_STUDIO_RENDER_MODE" = "studio" ]; then
   echo "Upgrading DB..."
   VIRTUAL_ENV=.venv uv run --no-sync python -m alembic upgrade head
 
+  # Warm the tool wheelhouse in the background so that tool installs can be served
+  # without reaching the package index. Already warmed requirements are skipped.
+  if [ "$AGENT_STUDIO_WHEELHOUSE_OFFLINE" != "true" ]; then
+    echo "Warming tool wheelhouse in the background..."
+    VIRTUAL_ENV=.venv uv run --no-sync python bin/warm-wheelhouse.py > /tmp/warm-wheelhouse.log 2>&1 &
+  fi
+
 fi
 
 # Activate the node environment that currently ships with the app. In the future,
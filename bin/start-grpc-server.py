@@ -3,6 +3,7 @@ from concurrent import futures
 import grpc
 from studio.proto import agent_studio_pb2_grpc
 from studio.service import AgentStudioApp
+from studio.deployments.status_watcher import start_deployment_status_watcher
 from studio.consts import DEFAULT_AS_GRPC_PORT
 import cmlapi
 import os
@@ -21,7 +22,10 @@ os.chdir(os.getenv("APP_DATA_DIR"))
 def start_server(blocking: bool = False):
     port = DEFAULT_AS_GRPC_PORT
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    agent_studio_pb2_grpc.add_AgentStudioServicer_to_server(AgentStudioApp(), server=server)
+    app = AgentStudioApp()
+    agent_studio_pb2_grpc.add_AgentStudioServicer_to_server(app, server=server)
+    # Keep the status of deployed workflows in the database, see status_watcher.py.
+    start_deployment_status_watcher(app.cml, app.dao)
     server.add_insecure_port("[::]:" + port)
     server.start()
     print("Server started, listening on " + port)
@@ -0,0 +1,37 @@
+"""
+Warm the local wheelhouse that tool and MCP server dependency installs are served from.
+
+Builds wheels for the requirements of every bundled tool template (and any extra
+requirements files passed on the command line) with the package index that is
+currently configured (UV_DEFAULT_INDEX / UV_INSECURE_HOST). Requirements files that
+were already warmed are skipped, so this is cheap to re-run. Run it with the same
+interpreter tool virtual environments are created with, from the app directory:
+
+    VIRTUAL_ENV=.venv uv run --no-sync python bin/warm-wheelhouse.py [requirements.txt ...]
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "studio", "workflow_engine", "src"))
+
+import engine.tool.wheelhouse as wheelhouse  # noqa: E402
+
+TOOL_TEMPLATE_REQUIREMENTS_GLOB = "studio-data/tool_templates/*/requirements.txt"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("requirements", nargs="*", help="Extra requirements files to warm the wheelhouse with")
+    args = parser.parse_args()
+
+    requirements_files = sorted(glob.glob(TOOL_TEMPLATE_REQUIREMENTS_GLOB)) + args.requirements
+    print(f"Warming wheelhouse {wheelhouse.get_wheelhouse_dir()} from {len(requirements_files)} requirements files...")
+    warmed = wheelhouse.warm_wheelhouse(requirements_files)
+    print(f"Warmed {len(warmed)} requirements files, {len(requirements_files) - len(warmed)} up to date or failed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,19 @@ from studio.db import model as db_model, DbSession
 import studio.consts as consts
 from studio.cross_cutting.global_thread_pool import get_thread_pool
 
+# Import engine code manually. Eventually when this code becomes
+# a separate git repo, or a custom runtime image, this path call
+# will go away and workflow engine features will be available already.
+import sys
+
+app_dir = os.getenv("APP_DIR")
+if app_dir is None:
+    raise EnvironmentError("APP_DIR environment variable is not set.")
+sys.path.append(os.path.join(app_dir, "studio", "workflow_engine", "src"))
+
+import engine.tool.wheelhouse as wheelhouse
+from engine.tool.mcp_definitions import get_mcp_server_spec_key, get_mcp_tool_definitions_cached
+
 
 def _get_runtime_command(mcp_type: consts.SupportedMCPTypes) -> str:
     if mcp_type == consts.SupportedMCPTypes.PYTHON.value:
@@ -19,6 +32,13 @@ def _get_runtime_command(mcp_type: consts.SupportedMCPTypes) -> str:
         raise ValueError(f"Unsupported MCP type: {mcp_type}")
 
 
+def get_mcp_spec_key(mcp_type: str, args: List[str], env_names: List[str]) -> str:
+    """
+    Key of an MCP server spec in the shared MCP tool definitions cache.
+    """
+    return get_mcp_server_spec_key(_get_runtime_command(mcp_type), args, env_names)
+
+
 async def _get_mcp_tools(server_params: StdioServerParameters) -> List[mcp_types.Tool]:
     timeout = timedelta(seconds=60)  # 60 seconds
     async with stdio_client(server_params) as (read, write):
@@ -34,6 +54,18 @@ async def _get_mcp_tools(server_params: StdioServerParameters) -> List[mcp_types
             return tools.tools
 
 
+def _store_mcp_tools(
+    mcp_id: str,
+    db_class: Union[Type[db_model.MCPTemplate], Type[db_model.MCPInstance]],
+    tools: List[Dict],
+):
+    with get_dao().get_session() as session:
+        mcp_obj = session.query(db_class).filter(db_class.id == mcp_id).first()
+        if mcp_obj:
+            mcp_obj.tools = tools
+            session.commit()
+
+
 def _update_mcp_tools(
     mcp_id: str,
     db_class: Union[Type[db_model.MCPTemplate], Type[db_model.MCPInstance]],
@@ -49,6 +81,7 @@ def _update_mcp_tools(
 
         env_vars = env_vars or {}
         env_to_pass = os.environ.copy()
+        env_to_pass.update(wheelhouse.get_mcp_server_env())
         env_to_pass.update({k: (env_vars[k] if k in env_vars else "dummy") for k in mcp_obj.env_names})
         command = _get_runtime_command(mcp_obj.type)
         mcp_server_params = StdioServerParameters(
@@ -58,9 +91,13 @@ def _update_mcp_tools(
         )
 
         try:
-            tools = asyncio.run(_get_mcp_tools(mcp_server_params))
+            # Only start the server if the definitions of this server spec aren't cached yet.
+            mcp_obj.tools = get_mcp_tool_definitions_cached(
+                get_mcp_spec_key(mcp_obj.type, list(mcp_obj.args), list(mcp_obj.env_names)),
+                lambda: [_t.model_dump(mode="json") for _t in asyncio.run(_get_mcp_tools(mcp_server_params))],
+                on_refresh=lambda tools: _store_mcp_tools(mcp_id, db_class, tools),
+            )
             mcp_obj.status = consts.MCPStatus.VALID.value
-            mcp_obj.tools = [_t.model_dump() for _t in tools]
         except Exception as e:
             print(f"Error updating MCP tools for MCP {mcp_id}: {e}")
             mcp_obj.status = consts.MCPStatus.VALIDATION_FAILED.value
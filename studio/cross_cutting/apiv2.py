@@ -1,13 +1,17 @@
 import base64
+import hashlib
 import json
 import logging
+import time
+import threading
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from cmlapi import CMLServiceApi
 import os
 from cmlapi.models import CreateModelDeploymentRequest
 import cmlapi
+from pydantic import BaseModel
 
 from studio.db.dao import AgentStudioDao
 from studio.proto.agent_studio_pb2 import CmlApiCheckResponse, RotateCmlApiResponse, DeployedWorkflow
@@ -15,6 +19,23 @@ from studio.api import CmlApiCheckRequest, RotateCmlApiRequest
 from studio.db import model as db_model
 import studio.cross_cutting.utils as cc_utils
 
+# Import engine code manually. Eventually when this code becomes
+# a separate git repo, or a custom runtime image, this path call
+# will go away and workflow engine features will be available already.
+import sys
+
+app_dir = os.getenv("APP_DIR")
+if not app_dir:
+    raise EnvironmentError("APP_DIR environment variable is not set.")
+sys.path.append(os.path.join(app_dir, "studio", "workflow_engine", "src"))
+
+from engine.file_parts import (
+    FILE_PARTS_MANIFEST_FILENAME,
+    get_file_part_name,
+    get_file_parts_dir,
+    read_file_parts_manifest,
+)
+
 
 def _encode_value(value: str) -> str:
     """Encode value for storage in environment variables using base64"""
@@ -310,137 +331,507 @@ def get_deployed_workflows(
         return []
 
 
+DEFAULT_REDEPLOY_CONCURRENCY = 8
+DEFAULT_CML_API_RATE_LIMIT = 10.0
+
+
+class CmlApiRateLimiter:
+    """
+    Token bucket limiting CML API calls to `rate` per second, with bursts of up to
+    `burst` calls. Shared by the threads of an operation that makes many calls.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = max(1, burst if burst is not None else int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+_cml_api_rate_limiter: Optional[CmlApiRateLimiter] = None
+_cml_api_rate_limiter_lock = threading.Lock()
+
+
+def get_cml_api_rate_limiter() -> CmlApiRateLimiter:
+    """
+    Rate limiter of the CML API calls of background operations in this process (redeploys,
+    the deployment status watcher), AGENT_STUDIO_CML_API_RATE_LIMIT calls per second in total.
+    """
+    global _cml_api_rate_limiter
+    with _cml_api_rate_limiter_lock:
+        if _cml_api_rate_limiter is None:
+            _cml_api_rate_limiter = CmlApiRateLimiter(
+                float(os.getenv("AGENT_STUDIO_CML_API_RATE_LIMIT", DEFAULT_CML_API_RATE_LIMIT))
+            )
+        return _cml_api_rate_limiter
+
+
+class RateLimitedCMLServiceApi:
+    """
+    CML API client whose API calls wait for the rate limiter.
+    """
+
+    def __init__(self, cml: CMLServiceApi, rate_limiter: CmlApiRateLimiter):
+        self._cml = cml
+        self._rate_limiter = rate_limiter
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._cml, name)
+        if not callable(attribute):
+            return attribute
+
+        def rate_limited(*args, **kwargs):
+            self._rate_limiter.acquire()
+            return attribute(*args, **kwargs)
+
+        return rate_limited
+
+
+class WorkflowRedeployResult(BaseModel):
+    deployed_workflow_id: str
+    status: str
+    """
+    "redeployed", "skipped" (nothing to redeploy) or "failed".
+    """
+    message: str = ""
+    duration_seconds: float = 0.0
+
+
+class RedeployReport(BaseModel):
+    results: List[WorkflowRedeployResult] = []
+    duration_seconds: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for result in self.results if result.status == status)
+
+    def get_summary(self) -> str:
+        summary = (
+            f"Redeployed {self.count('redeployed')} of {len(self.results)} workflows in {self.duration_seconds:.1f}s "
+            f"({self.count('skipped')} skipped, {self.count('failed')} failed)"
+        )
+        failures = [
+            f"{result.deployed_workflow_id}: {result.message}" for result in self.results if result.status == "failed"
+        ]
+        return "\n".join([summary] + failures)
+
+
 def redeploy_single_workflow(
     workflow_id: str,
     cml: CMLServiceApi,
     dao: AgentStudioDao,
     logger: logging.Logger = None,
     env_var_overrides: dict = {},
-):
-    """Redeploy a single workflow"""
+    api_key: Optional[str] = None,
+) -> WorkflowRedeployResult:
+    """
+    Redeploy a single workflow. The API key is read from the project environment unless
+    it is passed. Errors are logged and returned in the result, never raised.
+    """
     if logger is None:
         logger = logging.getLogger(__name__)
 
+    start = time.perf_counter()
+
+    def result(status: str, message: str = "") -> WorkflowRedeployResult:
+        return WorkflowRedeployResult(
+            deployed_workflow_id=workflow_id,
+            status=status,
+            message=message,
+            duration_seconds=round(time.perf_counter() - start, 3),
+        )
+
     try:
+        # Don't hold a database session while waiting on the CML API.
         with dao.get_session() as session:
             deployed_workflow = session.query(db_model.DeployedWorkflowInstance).filter_by(id=workflow_id).one_or_none()
             if not deployed_workflow:
                 logger.error(f"Deployed workflow with ID '{workflow_id}' not found")
-                return
-
-            # Get latest build and its deployment
-            builds = cml.list_model_builds(
-                project_id=os.getenv("CDSW_PROJECT_ID"), model_id=deployed_workflow.cml_deployed_model_id
-            ).model_builds
-
-            if not builds:
-                logger.error(f"No builds found for model {deployed_workflow.cml_deployed_model_id}")
-                return
-
-            latest_build = sorted(builds, key=lambda x: x.created_at, reverse=True)[0]
-            deployments = cml.list_model_deployments(
-                project_id=os.getenv("CDSW_PROJECT_ID"),
-                model_id=deployed_workflow.cml_deployed_model_id,
-                build_id=latest_build.id,
-            ).model_deployments
-
-            if not deployments:
-                logger.error(f"No deployments found for model {deployed_workflow.cml_deployed_model_id}")
-                return
-
-            current_deployment = sorted(deployments, key=lambda x: x.created_at, reverse=True)[0]
-
-            # Get environment vars - fail if we can't read them
-            try:
-                env_vars = json.loads(current_deployment.environment) if current_deployment.environment else {}
-                if not env_vars:
-                    raise ValueError("Current deployment has no environment variables")
-            except Exception as e:
-                logger.error(f"Failed to read environment variables from current deployment: {str(e)}")
-                return
-
-            # Update environment variables with overrides
-            env_vars.update(env_var_overrides)
-
-            # Get API key using the method from apiv2
+                return result("skipped", "deployed workflow not found")
+            cml_model_id = deployed_workflow.cml_deployed_model_id
+
+        # Get latest build and its deployment
+        builds = cml.list_model_builds(project_id=os.getenv("CDSW_PROJECT_ID"), model_id=cml_model_id).model_builds
+
+        if not builds:
+            logger.error(f"No builds found for model {cml_model_id}")
+            return result("skipped", f"no builds found for model {cml_model_id}")
+
+        latest_build = sorted(builds, key=lambda x: x.created_at, reverse=True)[0]
+        deployments = cml.list_model_deployments(
+            project_id=os.getenv("CDSW_PROJECT_ID"),
+            model_id=cml_model_id,
+            build_id=latest_build.id,
+        ).model_deployments
+
+        if not deployments:
+            logger.error(f"No deployments found for model {cml_model_id}")
+            return result("skipped", f"no deployments found for model {cml_model_id}")
+
+        current_deployment = sorted(deployments, key=lambda x: x.created_at, reverse=True)[0]
+
+        # Get environment vars - fail if we can't read them
+        try:
+            env_vars = json.loads(current_deployment.environment) if current_deployment.environment else {}
+            if not env_vars:
+                raise ValueError("Current deployment has no environment variables")
+        except Exception as e:
+            logger.error(f"Failed to read environment variables from current deployment: {str(e)}")
+            return result("failed", f"failed to read environment variables from current deployment: {str(e)}")
+
+        # Update environment variables with overrides
+        env_vars.update(env_var_overrides)
+
+        # Get API key using the method from apiv2
+        key_value = api_key
+        if not key_value:
             key_id, key_value = get_api_key_from_env(cml, logger)
             if not key_id or not key_value:
                 raise RuntimeError(
                     "CML API v2 key not found. You need to configure a CML API v2 key for Agent Studio to deploy workflows."
                 )
 
-            # Update API key while preserving all other env vars
-            env_vars["CDSW_APIV2_KEY"] = key_value
+        # Update API key while preserving all other env vars
+        env_vars["CDSW_APIV2_KEY"] = key_value
 
-            # Create new deployment with same settings
-            new_deployment = CreateModelDeploymentRequest(
-                cpu=current_deployment.cpu,
-                memory=current_deployment.memory,
-                nvidia_gpus=0,
-                environment=env_vars,
-                replicas=current_deployment.replicas,
-            )
+        # Create new deployment with same settings
+        new_deployment = CreateModelDeploymentRequest(
+            cpu=current_deployment.cpu,
+            memory=current_deployment.memory,
+            nvidia_gpus=0,
+            environment=env_vars,
+            replicas=current_deployment.replicas,
+        )
 
-            # Create new deployment with latest build
-            cml.create_model_deployment(
-                new_deployment, os.getenv("CDSW_PROJECT_ID"), deployed_workflow.cml_deployed_model_id, latest_build.id
-            )
+        # Create new deployment with latest build
+        cml.create_model_deployment(new_deployment, os.getenv("CDSW_PROJECT_ID"), cml_model_id, latest_build.id)
 
-            logger.info(f"Successfully redeployed workflow {workflow_id}")
+        logger.info(f"Successfully redeployed workflow {workflow_id}")
+        return result("redeployed")
 
     except Exception as e:
         logger.error(f"Failed to redeploy workflow {workflow_id}: {str(e)}")
+        return result("failed", str(e))
 
 
-def redeploy_all_workflows(cml: CMLServiceApi, dao: AgentStudioDao, logger: logging.Logger = None):
-    """Redeploy all deployed workflows"""
+def redeploy_all_workflows(
+    cml: CMLServiceApi,
+    dao: AgentStudioDao,
+    logger: logging.Logger = None,
+    max_concurrency: Optional[int] = None,
+    rate_limit: Optional[float] = None,
+) -> RedeployReport:
+    """
+    Redeploy all deployed workflows, at most AGENT_STUDIO_REDEPLOY_CONCURRENCY at once,
+    with CML API calls going through the rate limiter of this process (see
+    get_cml_api_rate_limiter), or limited to `rate_limit` per second if given (0 for no
+    limit). A failed redeploy doesn't stop the others. Returns the result of every redeploy.
+    """
     if logger is None:
         logger = logging.getLogger(__name__)
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("AGENT_STUDIO_REDEPLOY_CONCURRENCY", DEFAULT_REDEPLOY_CONCURRENCY))
+    rate_limiter = get_cml_api_rate_limiter() if rate_limit is None else CmlApiRateLimiter(rate_limit)
 
+    report = RedeployReport()
+    start = time.perf_counter()
     try:
         # Get list of deployed workflows
         deployed_workflows = get_deployed_workflows(cml, dao, logger)
+        if not deployed_workflows:
+            logger.info("No deployed workflows to redeploy")
+            return report
 
-        # Create thread pool for async redeployments
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            for workflow in deployed_workflows:
-                # Submit each redeployment to thread pool
-                executor.submit(redeploy_single_workflow, workflow.deployed_workflow_id, cml, dao, logger)
+        rate_limited_cml = RateLimitedCMLServiceApi(cml, rate_limiter)
 
-        logger.info("All workflow redeployments initiated")
+        # Read the API key once instead of once per workflow.
+        key_id, key_value = get_api_key_from_env(rate_limited_cml, logger)
+        if not key_id or not key_value:
+            raise RuntimeError(
+                "CML API v2 key not found. You need to configure a CML API v2 key for Agent Studio to deploy workflows."
+            )
+
+        total = len(deployed_workflows)
+        logger.info(f"Redeploying {total} workflows, {max_concurrency} at a time")
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="redeploy_") as executor:
+            futures = [
+                executor.submit(
+                    redeploy_single_workflow,
+                    workflow.deployed_workflow_id,
+                    rate_limited_cml,
+                    dao,
+                    logger,
+                    api_key=key_value,
+                )
+                for workflow in deployed_workflows
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                report.results.append(result)
+                logger.info(
+                    f"[{len(report.results)}/{total}] Workflow {result.deployed_workflow_id} {result.status} "
+                    f"in {result.duration_seconds:.1f}s"
+                )
 
     except Exception as e:
         logger.error(f"Error redeploying workflows: {str(e)}")
 
+    report.duration_seconds = round(time.perf_counter() - start, 3)
+    logger.info(report.get_summary())
+    return report
+
+
+PROJECT_FILESYSTEM_ROOT = "/home/cdsw"
+
+DEFAULT_UPLOAD_CHUNK_SIZE = 64 * 1024 * 1024
+DEFAULT_UPLOAD_CONCURRENCY = 4
+DEFAULT_UPLOAD_RETRIES = 3
+DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS = 1.0
+
+UploadProgressCallback = Callable[[int, int], None]
+"""
+Called with the bytes uploaded so far and the size of the file.
+"""
 
-def upload_file_to_project(
-    client: cmlapi.CMLServiceApi, project_id: str, target_project_path: str, local_abs_path: str
-):
-    import time as _time
 
-    header_params = {"Content-Type": "multipart/form-data"}
-    files_payload = {target_project_path: local_abs_path}
+def get_file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _post_project_files(client: cmlapi.CMLServiceApi, project_id: str, post_params: List[Tuple]) -> None:
+    client.api_client.call_api(
+        "/api/v2/projects/{project_id}/files",
+        "POST",
+        path_params={"project_id": project_id},
+        header_params={"Content-Type": "multipart/form-data"},
+        post_params=post_params,
+        response_type=None,
+    )
+
+
+def _with_upload_retries(upload: Callable[[], None], target_project_path: str) -> None:
+    """
+    Run an upload request, retrying failures with exponential backoff.
+    """
+    retries = max(1, int(os.getenv("AGENT_STUDIO_UPLOAD_RETRIES", DEFAULT_UPLOAD_RETRIES)))
+    backoff = float(os.getenv("AGENT_STUDIO_UPLOAD_RETRY_BACKOFF_SECONDS", DEFAULT_UPLOAD_RETRY_BACKOFF_SECONDS))
+    for attempt in range(retries):
+        try:
+            logging.debug(f"[AutoSync] upload attempt={attempt + 1} target={target_project_path}")
+            upload()
+            return
+        except Exception:
+            if attempt == retries - 1:
+                logging.exception(f"[AutoSync] upload failed target={target_project_path}")
+                raise
+            time.sleep(backoff * 2**attempt)
+
+
+def _delete_project_file_quietly(client: cmlapi.CMLServiceApi, project_id: str, target_project_path: str) -> None:
     try:
         logging.debug(f"[AutoSync] delete_project_file before upload path={target_project_path}")
         client.delete_project_file(project_id=project_id, path=target_project_path)
     except Exception:
         logging.debug("[AutoSync] delete_project_file ignored (not existing or not deletable)")
-    last_exc = None
-    for attempt in range(3):
+
+
+def _get_file_part(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def _upload_file_to_project_in_parts(
+    client: cmlapi.CMLServiceApi,
+    project_id: str,
+    target_project_path: str,
+    local_abs_path: str,
+    chunk_size: int,
+    progress_callback: Optional[UploadProgressCallback] = None,
+) -> None:
+    """
+    Upload a file in parts of `chunk_size` bytes, on AGENT_STUDIO_UPLOAD_CONCURRENCY
+    threads, then its parts manifest (see engine/file_parts.py). Parts that are already
+    in the project, from an earlier upload that failed, are not uploaded again.
+    """
+    size = os.path.getsize(local_abs_path)
+    parts_dir = get_file_parts_dir(target_project_path)
+    project_parts_dir = os.path.join(PROJECT_FILESYSTEM_ROOT, parts_dir)
+    concurrency = max(1, int(os.getenv("AGENT_STUDIO_UPLOAD_CONCURRENCY", DEFAULT_UPLOAD_CONCURRENCY)))
+
+    # Neither the whole file nor the manifest of an earlier upload may shadow the new parts.
+    _delete_project_file_quietly(client, project_id, target_project_path)
+    _delete_project_file_quietly(client, project_id, os.path.join(parts_dir, FILE_PARTS_MANIFEST_FILENAME))
+
+    def upload_part(index: int) -> Dict:
+        data = _get_file_part(local_abs_path, index * chunk_size, chunk_size)
+        part = {"name": get_file_part_name(index), "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        project_part_path = os.path.join(project_parts_dir, part["name"])
+        if os.path.isfile(project_part_path) and os.path.getsize(project_part_path) == part["size"]:
+            if get_file_sha256(project_part_path) == part["sha256"]:
+                logging.debug(f"[AutoSync] part is uploaded already, resuming target={project_part_path}")
+                return part
+        target_part_path = os.path.join(parts_dir, part["name"])
+        _with_upload_retries(
+            lambda: _post_project_files(
+                client, project_id, [(target_part_path, (part["name"], data, "application/octet-stream"))]
+            ),
+            target_part_path,
+        )
+        return part
+
+    part_count = (size + chunk_size - 1) // chunk_size
+    parts: List[Optional[Dict]] = [None] * part_count
+    uploaded_bytes = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="project_upload_") as executor:
+        futures = {executor.submit(upload_part, index): index for index in range(part_count)}
         try:
-            logging.debug(f"[AutoSync] upload attempt={attempt + 1} target={target_project_path} src={local_abs_path}")
-            client.api_client.call_api(
-                f"/api/v2/projects/{{project_id}}/files",
-                "POST",
-                path_params={"project_id": project_id},
-                header_params=header_params,
-                files=files_payload,
-                response_type=None,
-            )
-            return
+            for future in as_completed(futures):
+                part = future.result()
+                parts[futures[future]] = part
+                uploaded_bytes += part["size"]
+                if progress_callback:
+                    progress_callback(uploaded_bytes, size)
         except Exception as e:
-            last_exc = e
-            _time.sleep(1 + attempt)
-    if last_exc:
-        logging.exception(f"[AutoSync] upload failed target={target_project_path}")
-        raise last_exc
+            for pending in futures:
+                pending.cancel()
+            raise RuntimeError(
+                f"Failed to upload {target_project_path} in parts: {e}. Uploaded parts are kept, "
+                "uploading the file again resumes the upload."
+            ) from e
+
+    manifest = {"size": size, "sha256": get_file_sha256(local_abs_path), "parts": parts}
+    manifest_path = os.path.join(parts_dir, FILE_PARTS_MANIFEST_FILENAME)
+    _with_upload_retries(
+        lambda: _post_project_files(
+            client,
+            project_id,
+            [(manifest_path, (FILE_PARTS_MANIFEST_FILENAME, json.dumps(manifest).encode(), "application/json"))],
+        ),
+        manifest_path,
+    )
+
+    # Parts of an earlier upload of a larger file are kept for resuming, they don't belong to this one.
+    part_names = {part["name"] for part in parts}
+    if os.path.isdir(project_parts_dir):
+        for name in sorted(os.listdir(project_parts_dir)):
+            if name.startswith("part-") and name not in part_names:
+                _delete_project_file_quietly(client, project_id, os.path.join(parts_dir, name))
+
+
+def upload_file_to_project(
+    client: cmlapi.CMLServiceApi,
+    project_id: str,
+    target_project_path: str,
+    local_abs_path: str,
+    progress_callback: Optional[UploadProgressCallback] = None,
+):
+    """
+    Upload a file to the project. Files larger than AGENT_STUDIO_UPLOAD_CHUNK_SIZE are
+    uploaded in parts, in parallel. Requests are retried with exponential backoff.
+    """
+    size = os.path.getsize(local_abs_path)
+    chunk_size = int(os.getenv("AGENT_STUDIO_UPLOAD_CHUNK_SIZE", DEFAULT_UPLOAD_CHUNK_SIZE))
+    if chunk_size > 0 and size > chunk_size:
+        _upload_file_to_project_in_parts(
+            client, project_id, target_project_path, local_abs_path, chunk_size, progress_callback
+        )
+        return
+
+    _delete_project_file_quietly(client, project_id, target_project_path)
+    if os.path.exists(os.path.join(PROJECT_FILESYSTEM_ROOT, get_file_parts_dir(target_project_path))):
+        _delete_project_file_quietly(client, project_id, get_file_parts_dir(target_project_path))
+    _with_upload_retries(
+        lambda: client.api_client.call_api(
+            f"/api/v2/projects/{{project_id}}/files",
+            "POST",
+            path_params={"project_id": project_id},
+            header_params={"Content-Type": "multipart/form-data"},
+            files={target_project_path: local_abs_path},
+            response_type=None,
+        ),
+        target_project_path,
+    )
+    if progress_callback:
+        progress_callback(size, size)
+
+
+def get_project_file_fingerprint(target_project_path: str) -> Optional[Tuple[int, str]]:
+    """
+    Size and sha256 of a project file, or of a file uploaded in parts. None if there is
+    no such file. Agent Studio runs in the project, so project files are read from the
+    project filesystem directly.
+    """
+    project_abs_path = os.path.join(PROJECT_FILESYSTEM_ROOT, target_project_path)
+    if os.path.isfile(project_abs_path):
+        return os.path.getsize(project_abs_path), get_file_sha256(project_abs_path)
+    manifest = read_file_parts_manifest(project_abs_path)
+    if manifest is not None:
+        return manifest["size"], manifest["sha256"]
+    return None
+
+
+def is_project_file_current(target_project_path: str, local_abs_path: str, local_sha256: Optional[str] = None) -> bool:
+    """
+    Whether the project file at `target_project_path` has the same size and sha256 as a
+    local file.
+    """
+    project_abs_path = os.path.join(PROJECT_FILESYSTEM_ROOT, target_project_path)
+    local_size = os.path.getsize(local_abs_path)
+    # Compare sizes before hashing whole files.
+    if os.path.isfile(project_abs_path) and os.path.getsize(project_abs_path) != local_size:
+        return False
+    fingerprint = get_project_file_fingerprint(target_project_path)
+    if fingerprint is None or fingerprint[0] != local_size:
+        return False
+    return fingerprint[1] == (local_sha256 or get_file_sha256(local_abs_path))
+
+
+def upload_file_to_project_if_changed(
+    client: cmlapi.CMLServiceApi,
+    project_id: str,
+    target_project_path: str,
+    local_abs_path: str,
+    local_sha256: Optional[str] = None,
+    progress_callback: Optional[UploadProgressCallback] = None,
+) -> bool:
+    """
+    Upload a file to the project unless the project file already matches it by size and
+    sha256. Returns whether the file was uploaded.
+    """
+    if is_project_file_current(target_project_path, local_abs_path, local_sha256):
+        logging.debug(f"[AutoSync] upload skipped, project file is current target={target_project_path}")
+        return False
+    upload_file_to_project(client, project_id, target_project_path, local_abs_path, progress_callback)
+    return True
+
+
+def delete_project_file_if_exists(client: cmlapi.CMLServiceApi, project_id: str, target_project_path: str) -> bool:
+    """
+    Delete a project file, or the parts of a file uploaded in parts, if it exists.
+    Returns whether anything was deleted.
+    """
+    deleted = False
+    for path in (target_project_path, get_file_parts_dir(target_project_path)):
+        if os.path.exists(os.path.join(PROJECT_FILESYSTEM_ROOT, path)):
+            client.delete_project_file(project_id=project_id, path=path)
+            deleted = True
+    return deleted
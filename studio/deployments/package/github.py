@@ -1,12 +1,12 @@
 import os
 from uuid import uuid4
-import tarfile
 import subprocess
 from urllib.parse import urlparse
 
 from cmlapi import CMLServiceApi
 
 from studio.deployments.types import DeploymentArtifact, DeploymentPayload
+from studio.deployments.package.archive import PackagingReport, iter_files, write_artifact_archive
 
 from sqlalchemy.orm.session import Session
 from studio.db.model import DeployedWorkflowInstance
@@ -53,36 +53,31 @@ def package_github_for_deployment(
     print(f"Repo name: {repo_name}")
     print(f"Repo path: {repo_path}")
 
-    try:
-        subprocess.run(
-            ["git", "clone", github_url, repo_path], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Failed to clone GitHub repository: {e.stderr.decode()}") from e
-
-    # For workbench model packaging reasons, we remove the .git directory
-    try:
-        subprocess.run(
-            ["rm", "-rf", os.path.join(repo_path, ".git")],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Failed to remove .git directory: {e.stderr.decode()}") from e
+    # The history isn't packaged, so a shallow clone is enough.
+    report = PackagingReport()
+    with report.phase("clone"):
+        try:
+            subprocess.run(
+                ["git", "clone", "--depth", "1", github_url, repo_path],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Failed to clone GitHub repository: {e.stderr.decode()}") from e
 
     # Step 2: Add any additional packaging logic if needed
     # For now we assume the repo structure is compatible and needs no modification.
 
-    # Step 3: Create the archive (excluding the archive itself)
+    # Step 3: Stream the repo into the archive. For workbench model packaging reasons,
+    # the .git directory is left out.
     deployment_artifact_path = os.path.join(packaging_directory, "artifact.tar.gz")
-    with tarfile.open(deployment_artifact_path, "w:gz") as tar:
-        for root, dirs, files in os.walk(repo_path):
-            for file in files:
-                full_path = os.path.join(root, file)
-                print(f"Adding file: {full_path} to archive")
-                arcname = os.path.relpath(full_path, start=repo_path)  # root-level in archive
-                print(f"arcname: {arcname}")
-                tar.add(full_path, arcname=arcname)
+    with report.phase("archive") as phase:
+        phase["files"], phase["bytes"] = write_artifact_archive(
+            deployment_artifact_path,
+            iter_files(repo_path, ".", ignore=lambda src, names: {".git"} if src == repo_path else set()),
+        )
+        phase["archive_bytes"] = os.path.getsize(deployment_artifact_path)
+    report.print_summary()
 
     return DeploymentArtifact(artifact_path=deployment_artifact_path)
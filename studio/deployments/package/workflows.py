@@ -1,15 +1,14 @@
 import os
 from uuid import uuid4
-import shutil
 import yaml
 import json
-import tarfile
 
 from cmlapi import CMLServiceApi
 
 from studio import consts
-from studio.deployments.types import DeploymentArtifact, DeploymentPayload
+from studio.deployments.types import DeploymentArtifact, DeploymentPayload, DeploymentTargetType
 from studio.deployments.package.collated_input import create_collated_input
+from studio.deployments.package.archive import PackagingReport, iter_files, write_artifact_archive
 
 from sqlalchemy.orm.session import Session
 from studio.db.model import DeployedWorkflowInstance, Workflow
@@ -26,13 +25,18 @@ if not app_dir:
 sys.path.append(os.path.join(app_dir, "studio", "workflow_engine", "src"))
 
 import engine.types as input_types
+from engine.artifact_delta import ARTIFACT_MANIFEST_FILENAME, build_artifact_manifest
+from engine.consts import MCP_DEFINITIONS_ARTIFACT_DIRECTORY, TOOL_WHEELS_ARTIFACT_DIRECTORY
+from engine.tool.mcp_definitions import copy_mcp_tool_definitions
+from engine.tool.wheel_bundles import build_tool_wheel_bundle
+from studio.as_mcp.utils import get_mcp_spec_key
 
 
 def studio_data_workflow_ignore_factory(workflow_directory_name: str):
     """
-    Ignore function for packing workflow artifacts. In the future, if we
-    decide to allow packaging up pre-build tool venvs, we should update
-    the ignore logic appropriately.
+    Ignore function for packing workflow artifacts. Tool venvs are not relocatable
+    and are never packaged; workbench artifacts can ship prebuilt tool wheels
+    instead (see DeploymentTargetRequest.prebuild_tool_environments).
     """
 
     def ignore(src, names):
@@ -70,8 +74,14 @@ def package_workflow_for_deployment(
     # Ignore logic for copying over our studio-data/ directory. NOTE: this is currently an issue with how we store
     # workflows in our DB. We assume that consts.ALL_STUDIO_DATA_LOCATION is the root of the workflow, so we need
     # some complex ignore logic to ensure we are only copying the workflow data directly.
+    # The selected files are streamed into the archive from where they are, see archive.py.
     ignore_fn = studio_data_workflow_ignore_factory(os.path.basename(workflow.directory))
-    shutil.copytree(consts.ALL_STUDIO_DATA_LOCATION, os.path.join(packaging_directory, "studio-data"), ignore=ignore_fn)
+    report = PackagingReport()
+    with report.phase("select_studio_data") as phase:
+        studio_data_members = list(iter_files(consts.ALL_STUDIO_DATA_LOCATION, "studio-data", ignore=ignore_fn))
+        phase["files"] = len(studio_data_members)
+        phase["bytes"] = sum(os.path.getsize(path) for path, _ in studio_data_members)
+
     # Create the collated input.
     collated_input: input_types.CollatedInput = create_collated_input(workflow, session, deployment.updated_at or None)
 
@@ -82,23 +92,68 @@ def package_workflow_for_deployment(
     for lm in collated_input.language_models:
         lm.generation_config.update(payload.deployment_config.generation_config)
 
+    # Ship the cached tool definitions of the workflow's MCP servers, so that the
+    # deployed model doesn't have to start the servers to list their tools.
+    copy_mcp_tool_definitions(
+        [
+            get_mcp_spec_key(mcp_instance.type, mcp_instance.args, mcp_instance.env_names)
+            for mcp_instance in collated_input.mcp_instances
+        ],
+        os.path.join(packaging_directory, MCP_DEFINITIONS_ARTIFACT_DIRECTORY),
+    )
+
+    # Optionally build the wheels of the tools' requirements once here, instead of on
+    # every start of every model replica.
+    deployment_target = payload.deployment_target
+    if (
+        deployment_target
+        and deployment_target.type == DeploymentTargetType.WORKBENCH_MODEL
+        and deployment_target.prebuild_tool_environments
+    ):
+        with report.phase("tool_wheels"):
+            build_tool_wheel_bundle(
+                [
+                    os.path.join(
+                        consts.ALL_STUDIO_DATA_LOCATION,
+                        os.path.relpath(tool_instance.source_folder_path, "studio-data"),
+                        tool_instance.python_requirements_file_name,
+                    )
+                    for tool_instance in collated_input.tool_instances
+                ],
+                os.path.join(packaging_directory, TOOL_WHEELS_ARTIFACT_DIRECTORY),
+            )
+
     # Write collated input to our packaging directory.
     collated_input_file_path = os.path.join(packaging_directory, "collated_input.json")
     with open(collated_input_file_path, "w") as f:
         json.dump(collated_input.model_dump(), f, indent=2, default=str)
 
-    # Package everything up into an archive.
+    # Package everything up into an archive: the files generated in the packaging
+    # directory, and the selected studio data.
     deployment_artifact_path = os.path.join(packaging_directory, "artifact.tar.gz")
-    with tarfile.open(deployment_artifact_path, "w:gz") as tar:
-        for root, dirs, files in os.walk(packaging_directory):
-            for file in files:
-                full_path = os.path.join(root, file)
-                # Skip the archive itself
-                if os.path.abspath(full_path) == os.path.abspath(deployment_artifact_path):
-                    continue
-                # Compute relative path inside the archive
-                arcname = os.path.relpath(full_path, start=packaging_directory)
-                tar.add(full_path, arcname=arcname)
+    generated_members = [
+        (path, arcname)
+        for path, arcname in iter_files(packaging_directory, ".")
+        # Skip the archive itself
+        if os.path.abspath(path) != os.path.abspath(deployment_artifact_path)
+    ]
+
+    # Write the manifest of the members, so that redeploys can ship only the members
+    # that changed (see engine/artifact_delta.py).
+    manifest_path = os.path.join(packaging_directory, ARTIFACT_MANIFEST_FILENAME)
+    with report.phase("manifest") as phase:
+        manifest = build_artifact_manifest(generated_members + studio_data_members)
+        phase["files"] = len(manifest)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    generated_members.append((manifest_path, ARTIFACT_MANIFEST_FILENAME))
+
+    with report.phase("archive") as phase:
+        phase["files"], phase["bytes"] = write_artifact_archive(
+            deployment_artifact_path, generated_members + studio_data_members
+        )
+        phase["archive_bytes"] = os.path.getsize(deployment_artifact_path)
+    report.print_summary()
 
     # Return the packaged artifact.
-    return DeploymentArtifact(artifact_path=deployment_artifact_path)
+    return DeploymentArtifact(artifact_path=deployment_artifact_path, manifest_path=manifest_path)
@@ -0,0 +1,259 @@
+"""
+Shared watcher of the model status of deployed workflows.
+
+Listing deployed workflows used to list the builds, and the deployments of every build,
+of the model of every deployed workflow, on every request. One background watcher now
+polls the models of all deployed workflows (except suspended ones) and writes the
+status of each model into the deployment metadata of its DeployedWorkflowInstance
+(`model_status`, `model_status_updated_at`) when it changes, so RPCs read the status
+from the database.
+
+Deployments are polled in batches of AGENT_STUDIO_DEPLOYMENT_STATUS_BATCH_SIZE, with
+CML API calls going through the rate limiter that redeploys use too, at most
+AGENT_STUDIO_CML_API_RATE_LIMIT per second in total. A deployment that is in flight,
+or whose status just changed, is polled every
+AGENT_STUDIO_DEPLOYMENT_STATUS_MIN_INTERVAL_SECONDS. The interval doubles while its
+status stays the same, up to AGENT_STUDIO_DEPLOYMENT_STATUS_MAX_INTERVAL_SECONDS. A
+failed poll keeps the last recorded status and is retried at the shortest interval.
+Resuming a deployment wakes the watcher up for it. Set
+AGENT_STUDIO_DEPLOYMENT_STATUS_WATCHER to "false" to disable the watcher, RPCs then
+call CML as before.
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from cmlapi import CMLServiceApi
+
+from studio.db.dao import AgentStudioDao
+from studio.db import model as db_model
+from studio.deployments.types import DeploymentStatus
+from studio.deployments.utils import update_deployment_metadata
+from studio.cross_cutting.apiv2 import RateLimitedCMLServiceApi, get_cml_api_rate_limiter
+
+DEFAULT_DEPLOYMENT_STATUS_MIN_INTERVAL_SECONDS = 5.0
+DEFAULT_DEPLOYMENT_STATUS_MAX_INTERVAL_SECONDS = 300.0
+DEFAULT_DEPLOYMENT_STATUS_BATCH_SIZE = 10
+
+# Model statuses that are polled at backed off intervals while they last. Other
+# statuses ("pending", "deploying", ...) are on their way to one of these.
+SETTLED_MODEL_STATUSES = ("deployed", "stopped")
+
+IN_FLIGHT_DEPLOYMENT_STATUSES = (
+    DeploymentStatus.INITIALIZED,
+    DeploymentStatus.PACKAGING,
+    DeploymentStatus.PACKAGED,
+    DeploymentStatus.DEPLOYING,
+)
+
+
+def get_deployment_metadata(deployment: db_model.DeployedWorkflowInstance) -> dict:
+    return json.loads(deployment.deployment_metadata) if deployment.deployment_metadata else {}
+
+
+def get_cml_model_status(cml: CMLServiceApi, model_id: str) -> str:
+    """
+    Status of the model of a deployed workflow: the status of the first of its
+    deployments, across builds, that isn't stopped or failed, or "stopped".
+    """
+    project_id = os.getenv("CDSW_PROJECT_ID")
+    model_builds = cml.list_model_builds(project_id=project_id, model_id=model_id).model_builds
+    for build in model_builds:
+        model_deployments = cml.list_model_deployments(
+            project_id=project_id, model_id=model_id, build_id=build.id
+        ).model_deployments
+        for deployment in model_deployments:
+            deployment_status = deployment.status.lower()
+            if deployment_status not in ["stopped", "failed"]:
+                return deployment_status
+    return "stopped"
+
+
+class DeploymentStatusWatcher:
+    def __init__(
+        self,
+        cml: CMLServiceApi,
+        dao: AgentStudioDao,
+        min_interval_seconds: float = DEFAULT_DEPLOYMENT_STATUS_MIN_INTERVAL_SECONDS,
+        max_interval_seconds: float = DEFAULT_DEPLOYMENT_STATUS_MAX_INTERVAL_SECONDS,
+        batch_size: int = DEFAULT_DEPLOYMENT_STATUS_BATCH_SIZE,
+    ):
+        self.cml = cml
+        self.dao = dao
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max(min_interval_seconds, max_interval_seconds)
+        self.batch_size = max(1, batch_size)
+        self._intervals: Dict[str, float] = {}
+        self._next_polls: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="deployment_status_watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wake(self, deployment_id: Optional[str] = None) -> None:
+        """
+        Poll a deployment (or all of them) right away, and at the shortest interval after.
+        """
+        with self._lock:
+            for key in [deployment_id] if deployment_id else list(self._next_polls):
+                self._intervals.pop(key, None)
+                self._next_polls.pop(key, None)
+        self._wake_event.set()
+
+    def _get_watched_deployments(self) -> Dict[str, Tuple[str, str, Optional[str]]]:
+        """
+        (model ID, deployment status, last model status) of every watched deployment, by ID.
+        """
+        watched = {}
+        with self.dao.get_session() as session:
+            for deployment in session.query(db_model.DeployedWorkflowInstance).all():
+                if deployment.status == DeploymentStatus.SUSPENDED:
+                    continue
+                metadata = get_deployment_metadata(deployment)
+                model_id = deployment.cml_deployed_model_id or metadata.get("cml_model_id")
+                if model_id:
+                    watched[deployment.id] = (model_id, deployment.status, metadata.get("model_status"))
+        return watched
+
+    def _get_model_status(self, model_id: str) -> Optional[str]:
+        """
+        Status of a model, or None if CML couldn't be asked.
+        """
+        try:
+            return get_cml_model_status(self.cml, model_id)
+        except Exception as e:
+            print(f"Failed to get the status of model {model_id}: {str(e)}")
+            return None
+
+    def poll_once(self) -> List[str]:
+        """
+        Poll the deployments that are due, at most one batch. Returns their IDs.
+        """
+        watched = self._get_watched_deployments()
+        now = time.monotonic()
+        with self._lock:
+            for deployment_id in list(self._next_polls):
+                if deployment_id not in watched:
+                    self._intervals.pop(deployment_id, None)
+                    self._next_polls.pop(deployment_id, None)
+            due = sorted(
+                (deployment_id for deployment_id in watched if self._next_polls.get(deployment_id, 0) <= now),
+                key=lambda deployment_id: self._next_polls.get(deployment_id, 0),
+            )[: self.batch_size]
+        if not due:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(due), thread_name_prefix="deployment_status_") as executor:
+            statuses = dict(zip(due, executor.map(lambda d: self._get_model_status(watched[d][0]), due)))
+
+        # A failed poll (None) says nothing about the model, keep its last status.
+        changed = {d: status for d, status in statuses.items() if status is not None and status != watched[d][2]}
+        if changed:
+            self._record_transitions(changed)
+
+        now = time.monotonic()
+        with self._lock:
+            for deployment_id, status in statuses.items():
+                in_flight = watched[deployment_id][1] in IN_FLIGHT_DEPLOYMENT_STATUSES
+                if deployment_id in changed or in_flight or status not in SETTLED_MODEL_STATUSES:
+                    interval = self.min_interval_seconds
+                else:
+                    interval = min(
+                        self.max_interval_seconds,
+                        self._intervals.get(deployment_id, self.min_interval_seconds) * 2,
+                    )
+                self._intervals[deployment_id] = interval
+                self._next_polls[deployment_id] = now + interval
+        return due
+
+    def _record_transitions(self, model_statuses: Dict[str, str]) -> None:
+        updated_at = datetime.now(timezone.utc).isoformat()
+        with self.dao.get_session() as session:
+            for deployment_id, model_status in model_statuses.items():
+                deployment = session.query(db_model.DeployedWorkflowInstance).filter_by(id=deployment_id).one_or_none()
+                if deployment is None:
+                    continue
+                print(f"Deployed workflow {deployment_id} model status: {model_status}")
+                update_deployment_metadata(
+                    deployment, {"model_status": model_status, "model_status_updated_at": updated_at}
+                )
+            session.commit()
+
+    def _get_wait_seconds(self) -> float:
+        with self._lock:
+            if not self._next_polls:
+                return self.min_interval_seconds
+            return max(0.0, min(self._next_polls.values()) - time.monotonic())
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                polled = self.poll_once()
+            except Exception as e:
+                print(f"Deployment status watcher failed to poll: {str(e)}")
+                polled = []
+            # Poll the next batch right away if this one was full.
+            wait_seconds = 0.0 if len(polled) == self.batch_size else self._get_wait_seconds()
+            self._wake_event.wait(max(wait_seconds, 0.1))
+            self._wake_event.clear()
+
+
+_deployment_status_watcher: Optional[DeploymentStatusWatcher] = None
+_deployment_status_watcher_lock = threading.Lock()
+
+
+def start_deployment_status_watcher(cml: CMLServiceApi, dao: AgentStudioDao) -> Optional[DeploymentStatusWatcher]:
+    """
+    Start the deployment status watcher of this process, configured from the environment.
+    """
+    global _deployment_status_watcher
+    if os.getenv("AGENT_STUDIO_DEPLOYMENT_STATUS_WATCHER", "true").lower() == "false":
+        return None
+    with _deployment_status_watcher_lock:
+        if _deployment_status_watcher is None:
+            _deployment_status_watcher = DeploymentStatusWatcher(
+                RateLimitedCMLServiceApi(cml, get_cml_api_rate_limiter()),
+                dao,
+                min_interval_seconds=float(
+                    os.getenv(
+                        "AGENT_STUDIO_DEPLOYMENT_STATUS_MIN_INTERVAL_SECONDS",
+                        DEFAULT_DEPLOYMENT_STATUS_MIN_INTERVAL_SECONDS,
+                    )
+                ),
+                max_interval_seconds=float(
+                    os.getenv(
+                        "AGENT_STUDIO_DEPLOYMENT_STATUS_MAX_INTERVAL_SECONDS",
+                        DEFAULT_DEPLOYMENT_STATUS_MAX_INTERVAL_SECONDS,
+                    )
+                ),
+                batch_size=int(
+                    os.getenv("AGENT_STUDIO_DEPLOYMENT_STATUS_BATCH_SIZE", DEFAULT_DEPLOYMENT_STATUS_BATCH_SIZE)
+                ),
+            )
+            _deployment_status_watcher.start()
+        return _deployment_status_watcher
+
+
+def get_deployment_status_watcher() -> Optional[DeploymentStatusWatcher]:
+    """
+    The running deployment status watcher of this process, if any.
+    """
+    return _deployment_status_watcher
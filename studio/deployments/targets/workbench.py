@@ -1,7 +1,9 @@
 import os
 import json
-import tarfile
-from typing import Optional
+import hashlib
+import tempfile
+import threading
+from typing import Optional, Set, Tuple
 import requests
 
 from sqlalchemy.orm.session import Session
@@ -10,7 +12,17 @@ import cmlapi
 from cmlapi import CMLServiceApi
 
 import studio.consts as consts
-from studio.cross_cutting.apiv2 import get_api_key_from_env, validate_api_key, upload_file_to_project
+from studio.cross_cutting.apiv2 import (
+    PROJECT_FILESYSTEM_ROOT,
+    UploadProgressCallback,
+    get_api_key_from_env,
+    validate_api_key,
+    get_file_sha256,
+    get_project_file_fingerprint,
+    delete_project_file_if_exists,
+    upload_file_to_project_if_changed,
+)
+from studio.deployments.package.archive import iter_files, write_artifact_archive
 from studio.deployments.types import DeploymentArtifact, DeploymentPayload
 from studio.db.model import DeployedWorkflowInstance
 from studio.workflow.utils import is_custom_model_root_dir_feature_enabled, is_workbench_gteq_2_0_47
@@ -30,6 +42,15 @@ if not app_dir:
 sys.path.append(os.path.join(app_dir, "studio", "workflow_engine", "src"))
 
 from engine.ops import get_ops_endpoint
+from engine.artifact_delta import (
+    ARTIFACT_MANIFEST_FILENAME,
+    get_artifact_delta,
+    get_artifact_delta_path,
+    read_artifact_manifest,
+    write_artifact_delta,
+)
+
+DEFAULT_ARTIFACT_DELTA_MAX_RATIO = 0.5
 
 
 def get_application_ops_url(application_subdomain: str) -> str:
@@ -157,8 +178,68 @@ def create_new_cml_model(
     return model_id
 
 
+def upload_workflow_artifact(
+    cml: cmlapi.CMLServiceApi,
+    deployment_target_project_dir: str,
+    artifact: DeploymentArtifact,
+    progress_callback: Optional[UploadProgressCallback] = None,
+) -> None:
+    """
+    Upload the artifact to the deployment directory. If the directory has an artifact and
+    manifest of a previous deployment, only the members that changed since are uploaded, in
+    a delta archive next to that base artifact (see engine/artifact_delta.py), unless they
+    make up more than AGENT_STUDIO_ARTIFACT_DELTA_MAX_RATIO of the artifact. Set it to 0 to
+    always upload whole artifacts.
+    """
+    project_id = os.getenv("CDSW_PROJECT_ID")
+    target_artifact_path = os.path.join(deployment_target_project_dir, os.path.basename(artifact.artifact_path))
+    target_manifest_path = os.path.join(deployment_target_project_dir, ARTIFACT_MANIFEST_FILENAME)
+    target_delta_path = get_artifact_delta_path(target_artifact_path)
+    base_artifact_fingerprint = get_project_file_fingerprint(target_artifact_path)
+
+    delta = None
+    if artifact.manifest_path and base_artifact_fingerprint is not None:
+        base_manifest = read_artifact_manifest(os.path.join(PROJECT_FILESYSTEM_ROOT, target_manifest_path))
+        manifest = read_artifact_manifest(artifact.manifest_path)
+        if base_manifest is not None and manifest is not None:
+            delta = get_artifact_delta(base_manifest, manifest)
+    max_ratio = float(os.getenv("AGENT_STUDIO_ARTIFACT_DELTA_MAX_RATIO", DEFAULT_ARTIFACT_DELTA_MAX_RATIO))
+
+    if delta is not None and delta.changed_bytes <= max_ratio * delta.total_bytes:
+        if delta.is_empty:
+            print("Workflow artifact is unchanged since the last deployment, not uploading it")
+            delete_project_file_if_exists(cml, project_id, target_delta_path)
+            return
+        if delta.is_collated_input_only:
+            print("Only the collated input changed since the last deployment, uploading it alone")
+        else:
+            print(
+                f"Uploading {len(delta.changed)} changed and removing {len(delta.removed)} files of the workflow "
+                f"artifact ({delta.changed_bytes} of {delta.total_bytes} bytes)"
+            )
+        delta_path = get_artifact_delta_path(artifact.artifact_path)
+        write_artifact_delta(delta_path, artifact.artifact_path, delta, base_artifact_fingerprint[1])
+        upload_file_to_project_if_changed(
+            cml, project_id, target_delta_path, delta_path, progress_callback=progress_callback
+        )
+        return
+
+    # The delta of the previous base artifact must never be applied to the new one.
+    delete_project_file_if_exists(cml, project_id, target_delta_path)
+    upload_file_to_project_if_changed(
+        cml, project_id, target_artifact_path, artifact.artifact_path, progress_callback=progress_callback
+    )
+    if artifact.manifest_path:
+        upload_file_to_project_if_changed(cml, project_id, target_manifest_path, artifact.manifest_path)
+    else:
+        delete_project_file_if_exists(cml, project_id, target_manifest_path)
+
+
 def prepare_deployment_target_dir(
-    cml: cmlapi.CMLServiceApi, deployment: DeployedWorkflowInstance, artifact: DeploymentArtifact
+    cml: cmlapi.CMLServiceApi,
+    deployment: DeployedWorkflowInstance,
+    artifact: DeploymentArtifact,
+    progress_callback: Optional[UploadProgressCallback] = None,
 ) -> str:
     """
     Create a deployment directory for this deployment. Note that we store sensitive
@@ -171,16 +252,11 @@ def prepare_deployment_target_dir(
     deployment_target_dir = os.path.join(os.getenv("APP_DATA_DIR"), consts.DEPLOYABLE_WORKFLOWS_LOCATION, deployment.id)
     deployment_target_project_dir = os.path.relpath(deployment_target_dir, "/home/cdsw")
 
-    # Upload the model artifact to the project.
-    upload_file_to_project(
-        cml,
-        os.getenv("CDSW_PROJECT_ID"),
-        os.path.join(deployment_target_project_dir, os.path.basename(artifact.artifact_path)),
-        artifact.artifact_path,
-    )
+    # Upload the model artifact to the project, or only its changes.
+    upload_workflow_artifact(cml, deployment_target_project_dir, artifact, progress_callback)
 
     # Upload the workbench driver file to the project.
-    upload_file_to_project(
+    upload_file_to_project_if_changed(
         cml,
         os.getenv("CDSW_PROJECT_ID"),
         os.path.join(deployment_target_project_dir, "workbench.py"),
@@ -190,7 +266,7 @@ def prepare_deployment_target_dir(
     # Upload the application driver to the workbench. Note: once we are able
     # to drive applications from files that don't exist within the project filesystem, we can
     # simply specify the startup script directly from the APP_DIR.
-    upload_file_to_project(
+    upload_file_to_project_if_changed(
         cml,
         os.getenv("CDSW_PROJECT_ID"),
         os.path.join(deployment_target_project_dir, "run-app.py"),
@@ -205,7 +281,7 @@ def prepare_deployment_target_dir(
     if not is_custom_model_root_dir_feature_enabled() and is_runtime:
         print("Model root dir feature is disabled in runtime mode. Uploading cdsw-build.sh script separately.")
         try:
-            upload_file_to_project(
+            upload_file_to_project_if_changed(
                 cml,
                 os.getenv("CDSW_PROJECT_ID"),
                 os.path.join("cdsw-build.sh"),
@@ -217,46 +293,103 @@ def prepare_deployment_target_dir(
     return deployment_target_project_dir
 
 
+WORKFLOW_ENGINE_PACKAGE_FILENAME = "workflow_engine.tar.gz"
+WORKFLOW_ENGINE_PACKAGE_EXCLUDES = (".venv", ".ruff_cache", "__pycache__")
+
+_workflow_engine_package_lock = threading.Lock()
+
+
+def _ignore_workflow_engine_build_files(directory: str, names: Set[str]) -> Set[str]:
+    return {name for name in names if any(exclude in name for exclude in WORKFLOW_ENGINE_PACKAGE_EXCLUDES)}
+
+
+def get_workflow_engine_package_cache_dir() -> str:
+    """
+    Where workflow engine packages are cached. Can be overridden with
+    AGENT_STUDIO_WORKFLOW_ENGINE_PACKAGE_CACHE_DIR.
+    """
+    return os.getenv(
+        "AGENT_STUDIO_WORKFLOW_ENGINE_PACKAGE_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "agent_studio_workflow_engine"),
+    )
+
+
+def get_workflow_engine_content_hash(workflow_engine_dir: str) -> str:
+    """
+    sha256 of the relative paths and contents of the workflow engine sources that are packaged.
+    """
+    digest = hashlib.sha256()
+    for path, arcname in iter_files(workflow_engine_dir, ".", ignore=_ignore_workflow_engine_build_files):
+        digest.update(arcname.encode() + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_workflow_engine_package(workflow_engine_dir: str) -> Tuple[str, str]:
+    """
+    Path and sha256 of a tar.gz package of the workflow engine (excluding .venv and caches).
+    Packages are cached by the content hash of the engine sources, so the engine is packaged
+    once per version instead of once per deployment. Superseded packages are removed.
+    """
+    cache_dir = get_workflow_engine_package_cache_dir()
+    content_hash = get_workflow_engine_content_hash(workflow_engine_dir)
+    package_path = os.path.join(cache_dir, f"workflow_engine-{content_hash}.tar.gz")
+    sha256_path = f"{package_path}.sha256"
+
+    with _workflow_engine_package_lock:
+        if os.path.isfile(package_path) and os.path.isfile(sha256_path):
+            with open(sha256_path, "r") as f:
+                return package_path, f.read().strip()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in os.listdir(cache_dir):
+            if name.startswith("workflow_engine-"):
+                os.remove(os.path.join(cache_dir, name))
+
+        # Build next to the cached path and move it into place, so that a failed build
+        # never leaves a partial package behind.
+        partial_path = f"{package_path}.partial"
+        write_artifact_archive(
+            partial_path, iter_files(workflow_engine_dir, ".", ignore=_ignore_workflow_engine_build_files)
+        )
+        package_sha256 = get_file_sha256(partial_path)
+        os.replace(partial_path, package_path)
+        with open(sha256_path, "w") as f:
+            f.write(package_sha256)
+        return package_path, package_sha256
+
+
 def prepare_workflow_engine_package(
     cml: cmlapi.CMLServiceApi, deployment: DeployedWorkflowInstance, deployment_target_project_dir: str
 ) -> None:
     """
-    Create a tar.gz package of the workflow_engine directory (excluding .venv)
-    and upload it to the project along with the cdsw-build.sh script.
+    Upload a tar.gz package of the workflow_engine directory (excluding .venv) to the
+    project along with the cdsw-build.sh script. Files that are already current in the
+    deployment directory are not uploaded again.
     """
-    # Create workflow_engine.tar.gz excluding .venv directory
     workflow_engine_dir = os.path.join(app_dir, "studio", "workflow_engine")
-    tar_filename = "workflow_engine.tar.gz"
-    tar_path = os.path.join("/tmp", tar_filename)
-
-    def tar_filter(tarinfo):
-        # Skip .venv directory and its contents
-        if ".venv" in tarinfo.name or ".ruff_cache" in tarinfo.name or "__pycache__" in tarinfo.name:
-            return None
-        return tarinfo
-
-    with tarfile.open(tar_path, "w:gz") as tar:
-        tar.add(workflow_engine_dir, arcname=".", filter=tar_filter)
+    package_path, package_sha256 = get_workflow_engine_package(workflow_engine_dir)
 
     # Upload workflow_engine.tar.gz to the project
-    upload_file_to_project(
+    upload_file_to_project_if_changed(
         cml,
         os.getenv("CDSW_PROJECT_ID"),
-        os.path.join(deployment_target_project_dir, tar_filename),
-        tar_path,
+        os.path.join(deployment_target_project_dir, WORKFLOW_ENGINE_PACKAGE_FILENAME),
+        package_path,
+        package_sha256,
     )
 
     # Upload the cdsw-build.sh script to the deployment directory separately.
-    upload_file_to_project(
+    upload_file_to_project_if_changed(
         cml,
         os.getenv("CDSW_PROJECT_ID"),
         os.path.join(deployment_target_project_dir, "cdsw-build.sh"),
-        os.path.join(app_dir, "studio", "workflow_engine", "cdsw-build.sh"),
+        os.path.join(workflow_engine_dir, "cdsw-build.sh"),
     )
 
-    # Clean up temporary tar file
-    os.remove(tar_path)
-
 
 def deploy_artifact_to_workbench(
     artifact: DeploymentArtifact,
@@ -279,7 +412,15 @@ def deploy_artifact_to_workbench(
 
         # Prepare the target directory. The returned directory is a RELATIVE path
         # relative to the project filesystem.
-        deployment_target_project_dir = prepare_deployment_target_dir(cml, deployment, artifact)
+        def report_artifact_upload_progress(uploaded_bytes: int, total_bytes: int) -> None:
+            update_deployment_metadata(
+                deployment, {"artifact_upload": {"uploaded_bytes": uploaded_bytes, "total_bytes": total_bytes}}
+            )
+            session.commit()
+
+        deployment_target_project_dir = prepare_deployment_target_dir(
+            cml, deployment, artifact, report_artifact_upload_progress
+        )
 
         # STEP 1: Create CML model (without deployment)
         deployment_metadata = json.loads(deployment.deployment_metadata)
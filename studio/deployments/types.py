@@ -93,6 +93,12 @@ class DeploymentArtifact(BaseModel):
     that is packaged and ready to be deployed to any one of our deployment targets.
     """
 
+    manifest_path: Optional[str] = None
+    """
+    Path of the manifest of the members of the artifact, if it has one. Deployment targets
+    use it to ship only the members that changed since the last deployment.
+    """
+
 
 class DeploymentTargetRequest(BaseModel):
     """
@@ -141,6 +147,13 @@ class DeploymentTargetRequest(BaseModel):
     workflow instance with this ID must be available for a given workflow.
     """
 
+    prebuild_tool_environments: bool = False
+    """
+    Only for workbench model targets. If enabled, the wheels of the requirements of every
+    tool are built at package time and shipped in the artifact with a lockfile, so that
+    model replicas install tool environments from them instead of a package index.
+    """
+
     auto_redeploy_to_type: bool = False
     """
     If enabled, workflow will be deployed to any pre-existing deployment that matches the
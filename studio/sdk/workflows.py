@@ -9,37 +9,20 @@ from cmlapi import CMLServiceApi, default_client
 import requests
 import os
 import json
+import time
 import base64
 
 
-def run_workflow(workflow_name: str = None, workflow_id: str = None, inputs: dict = None) -> str:
+def _get_kickoff_endpoint(workflow_name: str, workflow_id: str, inputs_list: list[dict]) -> str:
     """
-    Run a workflow based on the workflow name, and return the ID of the workflow
-    run which can then be used to query the status of that specific workflow run.
-
-    Params:
-    - workflow_name: the name of the workflow to run. It is currently assumed that every
-    workflow has just one deployed workflow instance, so for now we extract the deployed
-    workflow information from just the workflow name.
-    - workflow_id: if you know the Agent Studio id of the workflow, you can call the
-    workflow directly from the id
-    - inputs: a dictionary of inputs to the workflow. For standard (sequential) workflows,
-    this will be a key-value pair of all input fields created during task creation steps.
-    If this is a conversational workflow, then there are exactly two input keys expected:
-    "user_input" and "context". "user_input" is the most recent chat message and "context"
-    is the entire context of the previous conversation, formatted however you want.
-
-    Returns:
-    - a workflow run ID that can be used with get_workflow_events() to track workflow run.
+    Endpoint of the deployed workflow of a workflow, after checking that every inputs
+    dictionary has exactly the inputs of the workflow.
     """
-
     if not workflow_name and not workflow_id:
         raise ValueError("Either a 'workflow_name' or 'workflow_id' must be provided.")
     if workflow_name and workflow_id:
         raise ValueError("Only 'workflow_name' or 'workflow_id' can be used.")
 
-    CDSW_APIV2_KEY = os.environ.get("CDSW_APIV2_KEY")
-
     # We assume this SDK is ran in the same project as Agent Studio, which means
     # our client can be automatically configured with env variables that represent
     # studio's gRPC IP/port.
@@ -70,12 +53,15 @@ def run_workflow(workflow_name: str = None, workflow_id: str = None, inputs: dic
     for task_id in task_ids:
         task: CrewAITaskMetadata = studio.stub.GetTask(GetTaskRequest(task_id=task_id)).task
         workflow_input_fields.extend(task.inputs)
-    for input in inputs.keys():
-        if input not in workflow_input_fields:
-            raise ValueError(f"Input '{input}' is not one of the workflow's inputs: {workflow_input_fields}")
-    for workflow_input_field in workflow_input_fields:
-        if workflow_input_field not in inputs.keys():
-            raise ValueError(f"Input field '{workflow_input_field}' is required but not provided in workflow inputs.")
+    for inputs in inputs_list:
+        for input in inputs.keys():
+            if input not in workflow_input_fields:
+                raise ValueError(f"Input '{input}' is not one of the workflow's inputs: {workflow_input_fields}")
+        for workflow_input_field in workflow_input_fields:
+            if workflow_input_field not in inputs.keys():
+                raise ValueError(
+                    f"Input field '{workflow_input_field}' is required but not provided in workflow inputs."
+                )
 
     # Now that we've confirmed the workflow exists, we can see if there is a deployed workflow
     # that matches this workflow.
@@ -87,7 +73,32 @@ def run_workflow(workflow_name: str = None, workflow_id: str = None, inputs: dic
         raise ValueError(f"Workflow '{workflow_name}' has not been deployed yet!")
 
     # Let's get the deployed workflow endpoint to send requests
-    deployed_workflow_endpoint = get_deployed_workflow_endpoint(deployed_workflow)
+    return get_deployed_workflow_endpoint(deployed_workflow)
+
+
+def run_workflow(workflow_name: str = None, workflow_id: str = None, inputs: dict = None) -> str:
+    """
+    Run a workflow based on the workflow name, and return the ID of the workflow
+    run which can then be used to query the status of that specific workflow run.
+
+    Params:
+    - workflow_name: the name of the workflow to run. It is currently assumed that every
+    workflow has just one deployed workflow instance, so for now we extract the deployed
+    workflow information from just the workflow name.
+    - workflow_id: if you know the Agent Studio id of the workflow, you can call the
+    workflow directly from the id
+    - inputs: a dictionary of inputs to the workflow. For standard (sequential) workflows,
+    this will be a key-value pair of all input fields created during task creation steps.
+    If this is a conversational workflow, then there are exactly two input keys expected:
+    "user_input" and "context". "user_input" is the most recent chat message and "context"
+    is the entire context of the previous conversation, formatted however you want.
+
+    Returns:
+    - a workflow run ID that can be used with get_workflow_events() to track workflow run.
+    """
+
+    CDSW_APIV2_KEY = os.environ.get("CDSW_APIV2_KEY")
+    deployed_workflow_endpoint = _get_kickoff_endpoint(workflow_name, workflow_id, [inputs])
 
     # Now we can send requests to this endpoint.
     out = requests.post(
@@ -101,14 +112,97 @@ def run_workflow(workflow_name: str = None, workflow_id: str = None, inputs: dic
         headers={"authorization": f"Bearer {CDSW_APIV2_KEY}", "Content-Type": "application/json"},
     )
 
+    if out.status_code == 503:
+        # No replica of the deployed workflow is ready to serve requests, e.g. while it restarts.
+        raise ValueError("Deployed workflow is unavailable, try again later.", out.text)
+
     # Return the run ID.
     response = out.json()
     if not response["success"]:
         raise ValueError("Workflow was unable to kick off successfully.", response)
+    if "error" in response["response"]:
+        # The deployed workflow is at its limit of concurrent and queued runs.
+        raise ValueError(response["response"]["error"], response["response"].get("queue_status"))
 
     return response["response"]["trace_id"]
 
 
+def run_workflow_batch(
+    workflow_name: str = None,
+    workflow_id: str = None,
+    inputs_list: list[dict] = None,
+    batch_size: int = 100,
+    retry_interval_seconds: float = 5.0,
+    timeout_seconds: float = 3600.0,
+) -> list[str]:
+    """
+    Run a workflow once per inputs dictionary, and return the workflow run IDs in the
+    order of the inputs. Inputs are sent to the deployed workflow in batches of
+    `batch_size` with the batch-kickoff action, instead of one request per run.
+
+    The deployed workflow runs a bounded number of runs at once and queues a bounded
+    number more. Runs it rejects because its queue is full, or whole batches it can't
+    serve at all (HTTP 503), are sent again after `retry_interval_seconds`, until all
+    runs are scheduled or `timeout_seconds` pass.
+
+    Params:
+    - workflow_name, workflow_id: the workflow to run, see run_workflow().
+    - inputs_list: the inputs of each run, see the inputs of run_workflow().
+    - batch_size: the number of runs sent per request.
+    - retry_interval_seconds: the wait before sending runs the deployed workflow rejected.
+    - timeout_seconds: how long to keep sending rejected runs before giving up.
+
+    Returns:
+    - the workflow run IDs, which can be used with get_workflow_status().
+    """
+    inputs_list = inputs_list or []
+    CDSW_APIV2_KEY = os.environ.get("CDSW_APIV2_KEY")
+    deployed_workflow_endpoint = _get_kickoff_endpoint(workflow_name, workflow_id, inputs_list)
+
+    trace_ids: list[str] = [None] * len(inputs_list)
+    pending = list(range(len(inputs_list)))
+    deadline = time.monotonic() + timeout_seconds
+    while pending:
+        batch, pending = pending[:batch_size], pending[batch_size:]
+        out = requests.post(
+            deployed_workflow_endpoint,
+            json={
+                "request": {
+                    "action_type": "batch-kickoff",
+                    "batch_kickoff_inputs": base64.b64encode(
+                        json.dumps([inputs_list[i] for i in batch]).encode("utf-8")
+                    ).decode("utf-8"),
+                },
+            },
+            headers={"authorization": f"Bearer {CDSW_APIV2_KEY}", "Content-Type": "application/json"},
+        )
+        if out.status_code == 503:
+            # No replica of the deployed workflow is ready, send the whole batch again.
+            rejected = batch
+        else:
+            response = out.json()
+            if not response["success"]:
+                raise ValueError("Workflow was unable to kick off successfully.", response)
+
+            rejected = []
+            for i, run in zip(batch, response["response"]["runs"]):
+                if "error" in run:
+                    rejected.append(i)
+                else:
+                    trace_ids[i] = run["trace_id"]
+        if rejected:
+            if time.monotonic() >= deadline:
+                raise ValueError(
+                    f"{len(rejected) + len(pending)} runs could not be scheduled within {timeout_seconds} seconds.",
+                    trace_ids,
+                )
+            # The deployed workflow is busy: wait for runs to finish before sending more.
+            pending = rejected + pending
+            time.sleep(retry_interval_seconds)
+
+    return trace_ids
+
+
 def get_workflow_status(run_id: str) -> dict:
     """
     Get the events and status of the
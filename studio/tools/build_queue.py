@@ -0,0 +1,223 @@
+"""
+Scheduler for tool instance virtual environment builds.
+
+Every request to prepare a tool instance goes through a single queue, which:
+- dedupes requests by tool instance: a tool is queued or building at most once. A
+  request for a tool that is already building is remembered and the tool is built
+  once more after the current build finishes, so that no update is lost.
+- caps the number of concurrent builds (and with it the number of concurrent `uv`
+  resolvers and installs). Can be overridden with AGENT_STUDIO_MAX_CONCURRENT_TOOL_BUILDS.
+- builds tools of workflows the user is actively testing first.
+- exposes the queue position and progress of every tool.
+"""
+
+import os
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Executor
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from studio.cross_cutting.global_thread_pool import get_thread_pool
+
+DEFAULT_MAX_CONCURRENT_TOOL_BUILDS = 4
+
+# How long a workflow counts as actively tested after the last test request.
+ACTIVE_WORKFLOW_TTL_SECONDS = 600
+
+
+class ToolBuildPriority(IntEnum):
+    TESTING = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+class _ToolBuild:
+    def __init__(self, tool_instance_id: str, workflow_id: Optional[str], priority: ToolBuildPriority, seq: int):
+        self.tool_instance_id = tool_instance_id
+        self.workflow_id = workflow_id
+        self.priority = priority
+        self.seq = seq
+        self.queued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.rerun_requested = False
+
+
+class ToolBuildQueue:
+    def __init__(
+        self,
+        build: Callable[[str], None],
+        max_concurrent_builds: int = DEFAULT_MAX_CONCURRENT_TOOL_BUILDS,
+        get_executor: Callable[[], Executor] = get_thread_pool,
+    ):
+        self._build = build
+        self._max_concurrent_builds = max(1, max_concurrent_builds)
+        self._get_executor = get_executor
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._heap: List[Tuple[int, int, str]] = []
+        self._queued: Dict[str, _ToolBuild] = {}
+        self._building: Dict[str, _ToolBuild] = {}
+        self._active_workflows: Dict[str, float] = {}
+        self._workers = 0
+
+    def submit(
+        self,
+        tool_instance_id: str,
+        workflow_id: Optional[str] = None,
+        priority: ToolBuildPriority = ToolBuildPriority.BACKGROUND,
+    ) -> None:
+        """
+        Request a build of a tool instance's virtual environment.
+        """
+        with self._lock:
+            if self._is_workflow_active(workflow_id):
+                priority = ToolBuildPriority.TESTING
+            self._enqueue(tool_instance_id, workflow_id, priority)
+            workers_to_start = self._claim_workers()
+        self._start_workers(workers_to_start)
+
+    def prioritize_workflow(self, workflow_id: str) -> None:
+        """
+        Mark a workflow as being actively tested: its queued tools move to the front
+        of the queue, and so do tools of the workflow requested from now on.
+        """
+        with self._lock:
+            self._active_workflows[workflow_id] = time.monotonic() + ACTIVE_WORKFLOW_TTL_SECONDS
+            for build in list(self._queued.values()):
+                if build.workflow_id == workflow_id:
+                    self._enqueue(build.tool_instance_id, workflow_id, ToolBuildPriority.TESTING)
+            for build in self._building.values():
+                if build.workflow_id == workflow_id and build.rerun_requested:
+                    build.priority = ToolBuildPriority.TESTING
+
+    def get_build_status(self, tool_instance_id: str) -> Optional[Dict]:
+        """
+        Queue position or build progress of a tool instance, or None if no build is
+        queued or running for it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            build = self._building.get(tool_instance_id)
+            if build is not None:
+                return {
+                    "state": "building",
+                    "priority": build.priority.name.lower(),
+                    "elapsed_seconds": round(now - build.started_at, 3),
+                    "rebuild_pending": build.rerun_requested,
+                }
+            build = self._queued.get(tool_instance_id)
+            if build is None:
+                return None
+            position = 1 + sum(
+                1 for other in self._queued.values() if (other.priority, other.seq) < (build.priority, build.seq)
+            )
+            return {
+                "state": "queued",
+                "priority": build.priority.name.lower(),
+                "position": position,
+                "waiting_seconds": round(now - build.queued_at, 3),
+            }
+
+    def get_queue_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queued": len(self._queued),
+                "building": len(self._building),
+                "max_concurrent_builds": self._max_concurrent_builds,
+            }
+
+    def _is_workflow_active(self, workflow_id: Optional[str]) -> bool:
+        if not workflow_id or workflow_id not in self._active_workflows:
+            return False
+        if self._active_workflows[workflow_id] < time.monotonic():
+            del self._active_workflows[workflow_id]
+            return False
+        return True
+
+    def _enqueue(self, tool_instance_id: str, workflow_id: Optional[str], priority: ToolBuildPriority) -> None:
+        # Called with the lock held.
+        building = self._building.get(tool_instance_id)
+        if building is not None:
+            if not building.rerun_requested or priority < building.priority:
+                building.priority = priority
+            building.rerun_requested = True
+            return
+
+        queued = self._queued.get(tool_instance_id)
+        if queued is not None:
+            if priority >= queued.priority:
+                return
+            # Entries for the old priority stay in the heap and are skipped when popped.
+            queued.priority = priority
+            queued.seq = next(self._seq)
+        else:
+            queued = _ToolBuild(tool_instance_id, workflow_id, priority, next(self._seq))
+            self._queued[tool_instance_id] = queued
+        heapq.heappush(self._heap, (queued.priority, queued.seq, tool_instance_id))
+
+    def _pop_next(self) -> Optional[_ToolBuild]:
+        # Called with the lock held.
+        while self._heap:
+            _, seq, tool_instance_id = heapq.heappop(self._heap)
+            build = self._queued.get(tool_instance_id)
+            if build is not None and build.seq == seq:
+                del self._queued[tool_instance_id]
+                return build
+        return None
+
+    def _claim_workers(self) -> int:
+        # Called with the lock held.
+        workers_to_start = min(len(self._queued), self._max_concurrent_builds - self._workers)
+        workers_to_start = max(0, workers_to_start)
+        self._workers += workers_to_start
+        return workers_to_start
+
+    def _start_workers(self, count: int) -> None:
+        for _ in range(count):
+            try:
+                self._get_executor().submit(self._run_worker)
+            except Exception as e:
+                print(f"Failed to start tool build worker: {e}")
+                with self._lock:
+                    self._workers -= 1
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._lock:
+                build = self._pop_next()
+                if build is None:
+                    self._workers -= 1
+                    return
+                build.started_at = time.monotonic()
+                self._building[build.tool_instance_id] = build
+
+            try:
+                self._build(build.tool_instance_id)
+            except Exception as e:
+                print(f"Error building tool instance {build.tool_instance_id}: {e}")
+
+            with self._lock:
+                del self._building[build.tool_instance_id]
+                if build.rerun_requested:
+                    self._enqueue(build.tool_instance_id, build.workflow_id, build.priority)
+
+
+_tool_build_queue: Optional[ToolBuildQueue] = None
+_tool_build_queue_lock = threading.Lock()
+
+
+def get_tool_build_queue() -> ToolBuildQueue:
+    global _tool_build_queue
+    with _tool_build_queue_lock:
+        if _tool_build_queue is None:
+            # Imported here to avoid a circular import with studio.tools.utils.
+            from studio.tools.utils import prepare_tool_instance
+
+            max_concurrent_builds = int(
+                os.getenv("AGENT_STUDIO_MAX_CONCURRENT_TOOL_BUILDS", DEFAULT_MAX_CONCURRENT_TOOL_BUILDS)
+            )
+            _tool_build_queue = ToolBuildQueue(prepare_tool_instance, max_concurrent_builds)
+        return _tool_build_queue
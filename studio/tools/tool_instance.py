@@ -8,9 +8,9 @@ from studio.api.types import ToolInstanceStatus
 from cmlapi import CMLServiceApi
 import json
 import os
-import ast
 import studio.tools.utils as tool_utils
 from studio.cross_cutting.global_thread_pool import get_thread_pool
+from studio.tools.build_queue import get_tool_build_queue, ToolBuildPriority
 from studio.workflow.utils import set_workflow_deployment_stale_status
 import studio.consts as consts
 import studio.cross_cutting.utils as cc_utils
@@ -107,10 +107,7 @@ def _create_tool_instance_impl(request: CreateToolInstanceRequest, session: DbSe
         session.add(tool_instance)
     session.commit()
 
-    get_thread_pool().submit(
-        tool_utils.prepare_tool_instance,
-        instance_uuid,
-    )
+    get_tool_build_queue().submit(instance_uuid, request.workflow_id, ToolBuildPriority.INTERACTIVE)
 
     get_thread_pool().submit(set_workflow_deployment_stale_status, request.workflow_id, True)
 
@@ -150,14 +147,6 @@ def _update_tool_instance_impl(request: UpdateToolInstanceRequest, session: DbSe
     if not tool_instance:
         raise ValueError(f"Tool Instance with id '{request.tool_instance_id}' not found")
 
-    # Check tool status before deciding whether to prepare venv
-    current_status = tool_instance.status
-    should_prepare_venv = current_status in [
-        ToolInstanceStatus.CREATED.value,
-        ToolInstanceStatus.READY.value,
-        ToolInstanceStatus.FAILED.value,
-    ]
-
     if request.name:
         tool_instance.name = request.name
     if request.tmp_tool_image_path:
@@ -174,14 +163,8 @@ def _update_tool_instance_impl(request: UpdateToolInstanceRequest, session: DbSe
         tool_instance.tool_image_path = tool_image_path
         os.remove(request.tmp_tool_image_path)
 
-    # Only submit venv preparation if tool is not already preparing
-    if should_prepare_venv:
-        get_thread_pool().submit(
-            tool_utils.prepare_tool_instance,
-            request.tool_instance_id,
-        )
-    else:
-        print(f"Skipping venv preparation for tool instance {request.tool_instance_id} - status is {current_status}")
+    # The build queue dedupes: a tool that is already being prepared is prepared once more afterwards.
+    get_tool_build_queue().submit(request.tool_instance_id, tool_instance.workflow_id, ToolBuildPriority.INTERACTIVE)
 
     get_thread_pool().submit(set_workflow_deployment_stale_status, tool_instance.workflow_id, True)
 
@@ -247,7 +230,7 @@ def _get_tool_instance_impl(request: GetToolInstanceRequest, session: DbSession)
         tool_image_uri = os.path.relpath(tool_instance.tool_image_path, consts.DYNAMIC_ASSETS_LOCATION)
 
     try:
-        tool_description = ast.get_docstring(ast.parse(tool_code)) if tool_code else ""
+        tool_description = tool_utils.extract_tool_description_from_code(tool_code) if tool_code else ""
     except Exception:
         tool_description = "Unable to read tool description"
 
@@ -265,6 +248,7 @@ def _get_tool_instance_impl(request: GetToolInstanceRequest, session: DbSession)
                     "user_params_metadata": user_params_dict,
                     "tool_params_metadata": tool_params_dict,
                     "status": status_message,
+                    "build": get_tool_build_queue().get_build_status(tool_instance.id),
                 }
             ),
             is_valid=is_valid,
@@ -305,6 +289,7 @@ def _list_tool_instances_impl(request: ListToolInstancesRequest, session: DbSess
 
     tool_instances = session.query(db_model.ToolInstance).filter_by(workflow_id=request.workflow_id).all()
 
+    build_queue = get_tool_build_queue()
     tool_instances_response = []
     for tool_instance in tool_instances:
         tool_code = ""
@@ -337,7 +322,7 @@ def _list_tool_instances_impl(request: ListToolInstancesRequest, session: DbSess
             tool_image_uri = os.path.relpath(tool_instance.tool_image_path, consts.DYNAMIC_ASSETS_LOCATION)
 
         try:
-            tool_description = ast.get_docstring(ast.parse(tool_code)) if tool_code else ""
+            tool_description = tool_utils.extract_tool_description_from_code(tool_code) if tool_code else ""
         except Exception:
             tool_description = "Unable to read tool description"
 
@@ -355,6 +340,7 @@ def _list_tool_instances_impl(request: ListToolInstancesRequest, session: DbSess
                         "user_params_metadata": user_params_dict,
                         "tool_params_metadata": tool_params_dict,
                         "status": status_message,
+                        "build": build_queue.get_build_status(tool_instance.id),
                     }
                 ),
                 is_valid=is_valid,
@@ -372,6 +358,7 @@ def _delete_tool_instance_directory(source_folder_path: str):
         if os.path.exists(source_folder_path):
             shutil.rmtree(source_folder_path)
             print(f"Deleted tool instance directory: {source_folder_path}")
+            tool_utils.collect_unused_tool_venvs()
         else:
             print(f"Tool instance directory not found: {source_folder_path}")
     except Exception as e:
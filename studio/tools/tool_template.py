@@ -13,7 +13,6 @@ from studio.proto.utils import is_field_set
 from cmlapi import CMLServiceApi
 import json
 import shutil
-import ast
 
 
 def list_tool_templates(
@@ -71,7 +70,7 @@ def list_tool_templates(
                     tool_image_uri = os.path.relpath(template.tool_image_path, consts.DYNAMIC_ASSETS_LOCATION)
 
                 try:
-                    tool_description = ast.get_docstring(ast.parse(python_code)) if python_code else ""
+                    tool_description = tool_utils.extract_tool_description_from_code(python_code) if python_code else ""
                 except Exception:
                     tool_description = "Unable to read tool description"
 
@@ -161,7 +160,7 @@ def get_tool_template(
                 tool_image_uri = os.path.relpath(template.tool_image_path, consts.DYNAMIC_ASSETS_LOCATION)
 
             try:
-                tool_description = ast.get_docstring(ast.parse(python_code)) if python_code else ""
+                tool_description = tool_utils.extract_tool_description_from_code(python_code) if python_code else ""
             except Exception:
                 tool_description = "Unable to read tool description"
 
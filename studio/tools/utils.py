@@ -1,4 +1,4 @@
-import ast
+import copy
 import os
 import shutil
 from typing import Optional, Dict
@@ -10,7 +10,7 @@ from studio.db.model import ToolInstance
 from studio.db import model as db_model, DbSession
 import studio.cross_cutting.utils as cc_utils
 import studio.consts as consts
-from studio.cross_cutting.global_thread_pool import get_thread_pool
+from studio.tools.build_queue import get_tool_build_queue, ToolBuildPriority
 
 # Import engine code manually. Eventually when this code becomes
 # a separate git repo, or a custom runtime image, this path call
@@ -23,6 +23,8 @@ if app_dir is None:
 sys.path.append(os.path.join(app_dir, "studio", "workflow_engine", "src"))
 
 from engine.crewai.tools import prepare_virtual_env_for_tool
+from engine.tool.source_metadata import ToolSourceMetadata, get_tool_source_metadata_for_code
+import engine.tool.venv_store as venv_store
 
 
 def read_tool_instance_code(tool_instance: ToolInstance) -> tuple[str, str]:
@@ -38,6 +40,13 @@ def read_tool_instance_code(tool_instance: ToolInstance) -> tuple[str, str]:
     return tool_code, tool_requirements
 
 
+def _get_tool_source_metadata(code: str) -> ToolSourceMetadata:
+    source_metadata = get_tool_source_metadata_for_code(code)
+    if source_metadata.syntax_error is not None:
+        raise ValueError(f"Error parsing Python code: {source_metadata.syntax_error}")
+    return source_metadata
+
+
 def extract_user_params_from_code(code: str) -> Dict[str, Dict[str, bool]]:
     """
     Extract the user parameters from the wrapper function in the Python code.
@@ -50,42 +59,7 @@ def extract_user_params_from_code(code: str) -> Dict[str, Dict[str, bool]]:
             }
         }
     """
-    try:
-        parsed_ast = ast.parse(code)
-        # Search for UserParameters class
-        user_parameter_class_node: Optional[ast.ClassDef] = None
-        for node in ast.walk(parsed_ast):
-            if isinstance(node, ast.ClassDef) and node.name == "UserParameters":
-                user_parameter_class_node = node
-                break
-
-        if user_parameter_class_node is None:
-            return {}
-
-        user_params: Dict[str, Dict[str, bool]] = {}
-
-        for field in user_parameter_class_node.body:
-            if isinstance(field, ast.AnnAssign):
-                param_name = field.target.id
-
-                # Check if type is Optional by looking for Optional[] syntax
-                is_optional = False
-                if isinstance(field.annotation, ast.Subscript):
-                    if isinstance(field.annotation.value, ast.Name):
-                        if field.annotation.value.id == "Optional":
-                            is_optional = True
-
-                # Also check if there's a default value
-                has_default = field.value is not None
-
-                # Parameter is required if it's not Optional and has no default
-                is_required = not (is_optional or has_default)
-
-                user_params[param_name] = {"required": is_required}
-
-        return user_params
-    except SyntaxError as e:
-        raise ValueError(f"Error parsing Python code: {e}")
+    return copy.deepcopy(_get_tool_source_metadata(code).user_params)
 
 
 def extract_tool_params_from_code(code: str) -> Dict[str, Dict[str, bool]]:
@@ -100,42 +74,14 @@ def extract_tool_params_from_code(code: str) -> Dict[str, Dict[str, bool]]:
             }
         }
     """
-    try:
-        parsed_ast = ast.parse(code)
-        # Search for ToolParameters class
-        tool_parameter_class_node: Optional[ast.ClassDef] = None
-        for node in ast.walk(parsed_ast):
-            if isinstance(node, ast.ClassDef) and node.name == "ToolParameters":
-                tool_parameter_class_node = node
-                break
-
-        if tool_parameter_class_node is None:
-            return {}
-
-        tool_params: Dict[str, Dict[str, bool]] = {}
-
-        for field in tool_parameter_class_node.body:
-            if isinstance(field, ast.AnnAssign):
-                param_name = field.target.id
+    return copy.deepcopy(_get_tool_source_metadata(code).tool_params)
 
-                # Check if type is Optional by looking for Optional[] syntax
-                is_optional = False
-                if isinstance(field.annotation, ast.Subscript):
-                    if isinstance(field.annotation.value, ast.Name):
-                        if field.annotation.value.id == "Optional":
-                            is_optional = True
 
-                # Also check if there's a default value
-                has_default = field.value is not None
-
-                # Parameter is required if it's not Optional and has no default
-                is_required = not (is_optional or has_default)
-
-                tool_params[param_name] = {"required": is_required}
-
-        return tool_params
-    except SyntaxError as e:
-        raise ValueError(f"Error parsing Python code: {e}")
+def extract_tool_description_from_code(code: str) -> Optional[str]:
+    """
+    Extract the tool description, which is the docstring of the tool module.
+    """
+    return _get_tool_source_metadata(code).docstring
 
 
 def prepare_tool_instance(tool_instance_id: str):
@@ -151,22 +97,18 @@ def prepare_tool_instance(tool_instance_id: str):
         with dao.get_session() as session:
             tool_instance = session.query(db_model.ToolInstance).filter_by(id=tool_instance_id).one()
 
-            # If tool is in PREPARING state, return
-            if tool_instance.status == ToolInstanceStatus.PREPARING.value:
-                print(f"Tool instance {tool_instance_id} is already being prepared on a separate thread")
-                return
-
             # Get the info we need for venv preparation
             source_folder_path = tool_instance.source_folder_path
             requirements_file_name = tool_instance.python_requirements_file_name
             current_status = tool_instance.status
 
-            # If tool is in FAILED state, remove .venv directory entirely
+            # If tool is in FAILED state, remove .venv directory entirely. For a link into the shared
+            # venv store this only removes the link; an incomplete store environment is rebuilt on link.
             if current_status == ToolInstanceStatus.FAILED.value:
                 venv_dir = os.path.join(source_folder_path, ".venv")
-                if os.path.exists(venv_dir):
+                if os.path.lexists(venv_dir):
                     try:
-                        shutil.rmtree(venv_dir)
+                        venv_store.remove_venv_link(venv_dir)
                         print(f"Removed existing .venv directory for failed tool instance {tool_instance_id}")
                     except Exception as e:
                         print(f"Error removing .venv directory for tool instance {tool_instance_id}: {e}")
@@ -176,11 +118,16 @@ def prepare_tool_instance(tool_instance_id: str):
             session.commit()
 
             # Prepare the virtual environment
-            prepare_virtual_env_for_tool(source_folder_path, requirements_file_name)
+            installed = prepare_virtual_env_for_tool(source_folder_path, requirements_file_name)
+            if not installed:
+                print(f"Requirements unchanged for tool instance {tool_instance_id}, skipped install")
 
             tool_instance.status = ToolInstanceStatus.READY.value
             session.commit()
 
+        # Any shared environment this tool was linked to before may no longer be in use.
+        collect_unused_tool_venvs()
+
     except Exception as e:
         print(f"Error preparing virtual environment for tool instance {tool_instance_id}: {e}")
         # Set status to FAILED
@@ -194,6 +141,18 @@ def prepare_tool_instance(tool_instance_id: str):
             print(f"Error updating tool instance {tool_instance_id} status to FAILED: {commit_error}")
 
 
+def collect_unused_tool_venvs():
+    """
+    Garbage collect shared tool virtual environments that no tool instance links to anymore.
+    """
+    try:
+        removed = venv_store.collect_unused_venvs()
+        if removed:
+            print(f"Removed {len(removed)} unused shared tool virtual environment(s)")
+    except Exception as e:
+        print(f"Error collecting unused shared tool virtual environments: {e}")
+
+
 def clone_tool_instance(tool_instance_id: str, target_workflow_id: str, db_session: DbSession) -> str:
     workflow_obj = db_session.query(db_model.Workflow).filter_by(id=target_workflow_id).first()
     if not workflow_obj:
@@ -213,7 +172,13 @@ def clone_tool_instance(tool_instance_id: str, target_workflow_id: str, db_sessi
     )
     os.makedirs(new_tool_instance_dir, exist_ok=True)
 
-    shutil.copytree(original_tool_instance.source_folder_path, new_tool_instance_dir, dirs_exist_ok=True)
+    # The clone links into the shared venv store once it is prepared, so don't copy the environment.
+    shutil.copytree(
+        original_tool_instance.source_folder_path,
+        new_tool_instance_dir,
+        dirs_exist_ok=True,
+        ignore=shutil.ignore_patterns(".venv"),
+    )
 
     new_tool_image_path = ""
     if original_tool_instance.tool_image_path:
@@ -236,8 +201,5 @@ def clone_tool_instance(tool_instance_id: str, target_workflow_id: str, db_sessi
     db_session.add(tool_instance)
     db_session.commit()
 
-    get_thread_pool().submit(
-        prepare_tool_instance,
-        new_tool_instance_id,
-    )
+    get_tool_build_queue().submit(new_tool_instance_id, target_workflow_id, ToolBuildPriority.BACKGROUND)
     return new_tool_instance_id
@@ -21,6 +21,11 @@ from studio.deployments.applications import (
     get_application_name_for_deployed_workflow,
 )
 from studio.deployments.entry import resume_workflow_deployment
+from studio.deployments.status_watcher import (
+    get_cml_model_status,
+    get_deployment_metadata,
+    get_deployment_status_watcher,
+)
 
 
 def undeploy_workflow(
@@ -129,33 +134,21 @@ def list_deployed_workflows(
                 application_status = "stopped"
                 application_deep_link = ""
 
-                # First check CML model status
+                # First check CML model status. The deployment status watcher keeps it in the
+                # deployment metadata, CML is only called if it hasn't been recorded.
                 model_status = "stopped"
+                watched_model_status = (
+                    get_deployment_metadata(deployed_workflow).get("model_status")
+                    if get_deployment_status_watcher()
+                    else None
+                )
                 try:
                     if not deployed_workflow.cml_deployed_model_id:
                         model_status = "stopped"
+                    elif watched_model_status:
+                        model_status = watched_model_status
                     else:
-                        # Fetch model builds
-                        model_builds = cml.list_model_builds(
-                            project_id=os.getenv("CDSW_PROJECT_ID"), model_id=deployed_workflow.cml_deployed_model_id
-                        ).model_builds
-
-                        for build in model_builds:
-                            # Fetch model deployments for each build
-                            model_deployments = cml.list_model_deployments(
-                                project_id=os.getenv("CDSW_PROJECT_ID"),
-                                model_id=deployed_workflow.cml_deployed_model_id,
-                                build_id=build.id,
-                            ).model_deployments
-
-                            # Check each deployment's status
-                            for deployment in model_deployments:
-                                deployment_status = deployment.status.lower()
-                                if deployment_status not in ["stopped", "failed"]:
-                                    model_status = deployment_status
-                                    break
-                            if model_status != "stopped":
-                                break
+                        model_status = get_cml_model_status(cml, deployed_workflow.cml_deployed_model_id)
 
                 except Exception as e:
                     print(f"Failed to get model status for workflow {deployed_workflow.id}: {str(e)}")
@@ -347,4 +340,9 @@ def resume_deployed_workflow(
 
         get_thread_pool().submit(resume_workflow_deployment, request.deployed_workflow_id)
 
+        # Follow the resumed model closely instead of at the backed off interval.
+        watcher = get_deployment_status_watcher()
+        if watcher:
+            watcher.wake(request.deployed_workflow_id)
+
         return ResumeDeployedWorkflowResponse()
@@ -9,6 +9,7 @@ import json
 from cmlapi import CMLServiceApi
 
 from studio.cross_cutting.global_thread_pool import get_thread_pool
+from studio.tools.build_queue import get_tool_build_queue
 from studio.proto.utils import is_field_set
 from studio.db.dao import AgentStudioDao
 from studio.api import *
@@ -56,6 +57,8 @@ def test_workflow(
             workflow: db_model.Workflow = session.query(db_model.Workflow).filter_by(id=request.workflow_id).one()
 
             if not is_workflow_ready(workflow.id, session):
+                # The user is waiting on this workflow, build its tools first.
+                get_tool_build_queue().prioritize_workflow(workflow.id)
                 raise RuntimeError(f"Workflow '{workflow.name}' is not ready for testing!")
 
             collated_input: input_types.CollatedInput = create_collated_input(
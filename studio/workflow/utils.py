@@ -9,7 +9,6 @@ from cmlapi import CMLServiceApi
 from studio.cross_cutting import utils as cc_utils
 from studio import consts
 from studio.db.dao import AgentStudioDao
-from studio.cross_cutting.global_thread_pool import get_thread_pool
 from studio.db.model import Workflow, Model, Agent, ToolInstance, DeployedWorkflowInstance
 from studio.api.types import ToolInstanceStatus
 from sqlalchemy.orm.session import Session
@@ -19,7 +18,7 @@ from studio.models.utils import (
     get_model_extra_headers_from_env,
     get_model_aws_credentials_from_env,
 )
-from studio.tools.utils import prepare_tool_instance
+from studio.tools.build_queue import get_tool_build_queue, ToolBuildPriority
 
 
 def get_llm_config_for_workflow(workflow: Workflow, session: Session, cml: CMLServiceApi) -> dict:
@@ -226,10 +225,7 @@ def prepare_tools_for_workflow(workflow_id: str, session: Session) -> None:
     """
     tool_instances: List[ToolInstance] = get_all_tools_for_workflow(workflow_id, session)
     for tool_instance in tool_instances:
-        get_thread_pool().submit(
-            prepare_tool_instance,
-            tool_instance.id,
-        )
+        get_tool_build_queue().submit(tool_instance.id, workflow_id, ToolBuildPriority.BACKGROUND)
 
 
 def set_workflow_deployment_stale_status(parent_workflow_id: Optional[str], is_stale: bool) -> None:
@@ -425,8 +425,11 @@ def export_workflow_template(
 
                 # Copy tool templates
                 for tool_template in tool_templates:
+                    # Tool .venv dirs link into the shared venv store, don't export the environment.
                     shutil.copytree(
-                        tool_template.source_folder_path, os.path.join(temp_dir, tool_template.source_folder_path)
+                        tool_template.source_folder_path,
+                        os.path.join(temp_dir, tool_template.source_folder_path),
+                        ignore=shutil.ignore_patterns(".venv", ".requirements_hash.txt"),
                     )
                     if tool_template.tool_image_path:
                         shutil.copy(
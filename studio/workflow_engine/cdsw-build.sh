@@ -18,6 +18,32 @@ if [ $AGENT_STUDIO_DEPLOY_MODE != "runtime" ]; then
     nvm use 22
 fi
 
+# Assemble workflow_engine.tar.gz if it was uploaded in parts. Only the parts listed in
+# parts.json belong to the upload, and the assembled file must match its sha256. This
+# is engine.file_parts.assemble_file_parts, inlined since the engine isn't extracted yet.
+if [ -f workflow_engine.tar.gz.parts/parts.json ]; then
+    python - <<'PYTHON' || exit 1
+import hashlib, json, os, sys
+
+path = "workflow_engine.tar.gz"
+parts_dir = f"{path}.parts"
+with open(os.path.join(parts_dir, "parts.json"), "r") as f:
+    manifest = json.load(f)
+digest = hashlib.sha256()
+with open(f"{path}.partial", "wb") as assembled:
+    for part in manifest["parts"]:
+        with open(os.path.join(parts_dir, part["name"]), "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+                assembled.write(chunk)
+if digest.hexdigest() != manifest["sha256"]:
+    os.remove(f"{path}.partial")
+    sys.exit(f"Parts of {path} don't add up to the uploaded file, redeploy the workflow.")
+os.replace(f"{path}.partial", path)
+print(f"Assembled {path} from {len(manifest['parts'])} parts")
+PYTHON
+fi
+
 # Extract workflow engine from tar.gz if it exists
 echo "Extracting workflow_engine.tar.gz to base directory..."
 tar -xzvf workflow_engine.tar.gz -C .
@@ -1,17 +1,22 @@
 import os
 import tarfile
 
+from engine.artifact_delta import apply_artifact_delta, get_artifact_delta_path
+from engine.file_parts import assemble_file_parts
 from engine.crewai.artifact import is_crewai_workflow, get_crewai_workflow_name
 from engine.langgraph.artifact import is_langgraph_workflow, get_langgraph_workflow_name
 
 
 def extract_artifact_to_location(artifact_location: str, destination_path: str):
     """
-    Extract a packaged workflow artifact to a specified directory.
+    Extract a packaged workflow artifact to a specified directory, and apply its delta
+    if one was deployed next to it (see artifact_delta.py). Artifacts and deltas that
+    were uploaded in parts are assembled first (see file_parts.py).
     """
 
     tarball_path = os.path.join(artifact_location)
     extract_path = os.path.join(destination_path)
+    assemble_file_parts(tarball_path)
 
     # Ensure destination directory exists
     os.makedirs(extract_path, exist_ok=True)
@@ -22,6 +27,14 @@ def extract_artifact_to_location(artifact_location: str, destination_path: str):
 
     print(f"Extracted {os.path.basename(artifact_location)} to {extract_path}")
 
+    delta_path = get_artifact_delta_path(tarball_path)
+    assemble_file_parts(delta_path)
+    if os.path.isfile(delta_path):
+        delta = apply_artifact_delta(delta_path, tarball_path, extract_path)
+        print(
+            f"Applied {os.path.basename(delta_path)}: {len(delta.changed)} changed and {len(delta.removed)} removed files"
+        )
+
 
 def get_workflow_name(workflow_dir: str) -> str:
     """
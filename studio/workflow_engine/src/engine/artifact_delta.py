@@ -0,0 +1,145 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Incremental updates of deployment artifacts.
+
+Every redeploy used to repackage and re-upload the whole artifact, even after a one
+line edit of a task description. Artifacts now carry a manifest of the sha256 and size
+of each member. When a workflow is redeployed, the members that differ from the
+manifest of the artifact already in the deployment directory (the base artifact) are
+shipped in a delta archive next to it, together with the members to remove. The
+deployed model extracts the base artifact and applies the delta on top.
+
+Deltas are always taken against the base artifact, never against a previous delta, so
+a redeploy replaces the delta. Deltas record the sha256 of their base artifact and are
+refused if it doesn't match.
+"""
+
+import os
+import io
+import json
+import hashlib
+import tarfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+ARTIFACT_MANIFEST_FILENAME = "artifact_manifest.json"
+ARTIFACT_DELTA_METADATA_FILENAME = ".artifact_delta.json"
+COLLATED_INPUT_FILENAME = "collated_input.json"
+
+
+def _get_file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_artifact_manifest(members: Iterable[Tuple[str, str]]) -> Dict[str, Dict]:
+    """
+    Manifest of artifact members, given as (path, archive name): the sha256 and size of
+    each member by archive name.
+    """
+    return {
+        os.path.normpath(arcname): {"sha256": _get_file_sha256(path), "size": os.path.getsize(path)}
+        for path, arcname in members
+    }
+
+
+def read_artifact_manifest(manifest_path: str) -> Optional[Dict[str, Dict]]:
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_artifact_delta_path(artifact_path: str) -> str:
+    """
+    Where the delta of an artifact is kept: `artifact.delta.tar.gz` next to `artifact.tar.gz`.
+    """
+    directory, name = os.path.split(artifact_path)
+    stem = name[: -len(".tar.gz")] if name.endswith(".tar.gz") else name
+    return os.path.join(directory, f"{stem}.delta.tar.gz")
+
+
+class ArtifactDelta(BaseModel):
+    changed: List[str] = []
+    """
+    Archive names of the members that are new or differ from the base artifact.
+    """
+    removed: List[str] = []
+    """
+    Archive names of the members of the base artifact that are gone.
+    """
+    changed_bytes: int = 0
+    total_bytes: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changed and not self.removed
+
+    @property
+    def is_collated_input_only(self) -> bool:
+        """
+        Whether only the collated input changed, i.e. no code, tools or data.
+        """
+        return not self.removed and self.changed == [COLLATED_INPUT_FILENAME]
+
+
+def get_artifact_delta(base_manifest: Dict[str, Dict], manifest: Dict[str, Dict]) -> ArtifactDelta:
+    # The manifest member itself always changes with its contents and is shipped with every delta.
+    changed = sorted(
+        name
+        for name, entry in manifest.items()
+        if name != ARTIFACT_MANIFEST_FILENAME and base_manifest.get(name) != entry
+    )
+    removed = sorted(name for name in base_manifest if name not in manifest)
+    return ArtifactDelta(
+        changed=changed,
+        removed=removed,
+        changed_bytes=sum(manifest[name]["size"] for name in changed),
+        total_bytes=sum(entry["size"] for entry in manifest.values()),
+    )
+
+
+def write_artifact_delta(delta_path: str, artifact_path: str, delta: ArtifactDelta, base_artifact_sha256: str) -> None:
+    """
+    Write the changed members of an artifact, and the delta metadata, into a delta archive.
+    """
+    wanted = set(delta.changed) | {ARTIFACT_MANIFEST_FILENAME}
+    with tarfile.open(artifact_path, "r:gz") as artifact, tarfile.open(delta_path, "w:gz") as delta_tar:
+        for member in artifact:
+            if member.isfile() and os.path.normpath(member.name) in wanted:
+                delta_tar.addfile(member, artifact.extractfile(member))
+        metadata = json.dumps({"base_artifact_sha256": base_artifact_sha256, **delta.model_dump()}).encode()
+        info = tarfile.TarInfo(ARTIFACT_DELTA_METADATA_FILENAME)
+        info.size = len(metadata)
+        delta_tar.addfile(info, io.BytesIO(metadata))
+
+
+def apply_artifact_delta(delta_path: str, artifact_path: str, destination_path: str) -> ArtifactDelta:
+    """
+    Apply a delta archive to the extracted base artifact in `destination_path`. Raises a
+    RuntimeError if the delta wasn't taken against this base artifact.
+    """
+    with tarfile.open(delta_path, "r:gz") as delta_tar:
+        metadata_file = delta_tar.extractfile(ARTIFACT_DELTA_METADATA_FILENAME)
+        metadata = json.loads(metadata_file.read())
+        if metadata["base_artifact_sha256"] != _get_file_sha256(artifact_path):
+            raise RuntimeError(
+                f"Artifact delta {os.path.basename(delta_path)} was not taken against "
+                f"{os.path.basename(artifact_path)}, redeploy the workflow."
+            )
+        delta = ArtifactDelta.model_validate(metadata)
+        for name in delta.removed:
+            path = os.path.join(destination_path, name)
+            if os.path.isfile(path):
+                os.remove(path)
+        delta_tar.extractall(
+            path=destination_path,
+            members=[member for member in delta_tar.getmembers() if member.name != ARTIFACT_DELTA_METADATA_FILENAME],
+        )
+    return delta
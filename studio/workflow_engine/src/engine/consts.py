@@ -17,3 +17,22 @@ AGENT_STUDIO_OPS_APPLICATION_NAME = "Agent Studio - Agent Ops & Metrics"
 
 START_TRACE_ID_KEY = "<start_trace_id>"
 END_TRACE_ID_KEY = "<end_trace_id>"
+
+# Shared, content-addressed store of tool virtual environments. Tool .venv
+# directories are symlinks into this store.
+TOOL_VENV_STORE_LOCATION = ".app/tool_venvs"
+
+# Local wheelhouse that tool and MCP server dependency installs are served from
+# before (or, offline, instead of) the package index.
+TOOL_WHEELHOUSE_LOCATION = ".app/wheelhouse"
+
+# On-disk tool result cache, used when AGENT_STUDIO_TOOL_RESULT_CACHE is "disk".
+TOOL_RESULT_CACHE_LOCATION = ".app/tool_result_cache"
+
+# Cache of MCP server tool definitions (list_tools results), shared by the studio and
+# the workflow engine, and the directory of a deployment artifact that ships them.
+MCP_DEFINITIONS_CACHE_LOCATION = ".app/mcp_definitions"
+MCP_DEFINITIONS_ARTIFACT_DIRECTORY = "mcp_definitions"
+
+# Directory of a deployment artifact with prebuilt wheels of the tools' requirements.
+TOOL_WHEELS_ARTIFACT_DIRECTORY = "tool_wheels"
@@ -1,24 +1,62 @@
-from typing import Any
+from typing import Any, Optional
 import os
 import yaml
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from engine.consts import TOOL_WHEELS_ARTIFACT_DIRECTORY
 from engine.types import CollatedInput
 from engine.crewai.tracing import reset_crewai_instrumentation, instrument_crewai_workflow
 from engine.crewai.events import register_global_handlers
 from engine.crewai.tools import prepare_virtual_env_for_tool
+from engine.startup import StartupTimeline
+from engine.tool.wheel_bundles import get_tool_wheel_bundle_dir
+
+
+# Number of tool virtual environments prepared at once when a workflow is loaded.
+# Can be overridden with AGENT_STUDIO_TOOL_VENV_INSTALL_CONCURRENCY.
+DEFAULT_TOOL_VENV_INSTALL_CONCURRENCY = 4
 
 
 # Currently the only artifact type supported for import is directory.
 # the collated input requirements are all relative to the workflow import path.
 def install_tool_virtual_envs(directory, collated_input: CollatedInput):
-    for tool_instance in collated_input.tool_instances:
+    """
+    Prepare the virtual environments of all tools of a workflow, a bounded number at a
+    time. Tools with the same requirements share an environment of the venv store, which
+    is built once. Requirements are installed from the artifact's prebuilt wheels if they
+    match this interpreter. Raises a RuntimeError naming every tool that failed.
+    """
+
+    # Prebuilt wheels shipped in the artifact, see engine.tool.wheel_bundles.
+    bundle_dir = os.path.join(directory, TOOL_WHEELS_ARTIFACT_DIRECTORY)
+    has_bundle = os.path.isdir(bundle_dir)
+
+    def prepare(tool_instance):
         print(f"PREPARING VIRTUAL ENV FOR {tool_instance.name}")
+        source_folder_path = os.path.join(directory, tool_instance.source_folder_path)
+        wheel_bundle_dir = None
+        if has_bundle:
+            wheel_bundle_dir = get_tool_wheel_bundle_dir(
+                bundle_dir, os.path.join(source_folder_path, tool_instance.python_requirements_file_name)
+            )
         prepare_virtual_env_for_tool(
-            os.path.join(directory, tool_instance.source_folder_path),
+            source_folder_path,
             tool_instance.python_requirements_file_name,
+            wheel_bundle_dir,
         )
 
+    max_workers = int(os.getenv("AGENT_STUDIO_TOOL_VENV_INSTALL_CONCURRENCY", DEFAULT_TOOL_VENV_INSTALL_CONCURRENCY))
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(prepare, t_): t_ for t_ in collated_input.tool_instances}
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                errors[futures[future].name] = future.exception()
+    if errors:
+        message = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        raise RuntimeError(f"Failed to prepare tool virtual environments: {message}") from next(iter(errors.values()))
+
 
 def get_artifact_yaml_member(root_dir: str, member: str) -> Any:
     """
@@ -95,10 +133,12 @@ def is_crewai_workflow(directory: str) -> bool:
         return False
 
 
-def load_crewai_workflow(directory: str) -> Any:
+def load_crewai_workflow(directory: str, timeline: Optional[StartupTimeline] = None) -> Any:
+    timeline = timeline or StartupTimeline()
     workflow_data = get_artifact_workflow(directory)
     collated_input = get_collated_input(os.path.join(directory), workflow_data)
-    install_tool_virtual_envs(directory, collated_input)
+    with timeline.phase("tool_virtual_envs"):
+        install_tool_virtual_envs(directory, collated_input)
 
     # Instrument our workflow given a specific workflow name and
     # set up the instrumentation. Also register our handlers.
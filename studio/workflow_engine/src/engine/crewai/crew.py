@@ -1,35 +1,101 @@
 # No top level studio.db imports allowed to support wokrflow model deployment
 
-from typing import Dict
+import os
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
 from crewai import Crew, Agent
 from crewai.tools import BaseTool
 
 import engine.types as input_types
 from engine.crewai.llms import get_crewai_llm
 from engine.crewai.tools import get_crewai_tool
-from engine.crewai.mcp import get_mcp_tools_for_crewai
+from engine.crewai.mcp import get_mcp_tools_for_crewai, release_mcp_objects
 from engine.crewai.agents import get_crewai_agent
 from engine.crewai.wrappers import *
 
 
+# Maximum number of language models, tools and MCP sessions built at once for a crew.
+# Can be overridden with AGENT_STUDIO_CREW_SETUP_CONCURRENCY.
+DEFAULT_CREW_SETUP_CONCURRENCY = 8
+
+
+def _build_timed(build: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    built = build()
+    return built, round((time.perf_counter() - start) * 1000, 3)
+
+
+def build_concurrently(
+    builds: Dict[str, Callable[[], Any]],
+) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, Exception]]:
+    """
+    Run independent builds on a bounded executor. Returns the built objects, the build
+    time (ms) of each and the errors of failed builds, all keyed like `builds`.
+    """
+    built: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    errors: Dict[str, Exception] = {}
+    max_workers = int(os.getenv("AGENT_STUDIO_CREW_SETUP_CONCURRENCY", DEFAULT_CREW_SETUP_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(builds) or 1))) as executor:
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, _build_timed, build) for name, build in builds.items()
+        }
+        for name, future in futures.items():
+            try:
+                built[name], timings[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+    return built, timings, errors
+
+
 def create_crewai_objects(
     workflow_directory: str,
     collated_input: input_types.CollatedInput,
     tool_config: Dict[str, Dict[str, str]],
     mcp_config: Dict[str, Dict[str, str]],
     llm_config: Dict[str, Dict[str, str]],
+    plan: Optional[Any] = None,
 ) -> input_types.CrewAIObjects:
-    language_models: Dict[str, AgentStudioCrewAILLM] = {}
+    """
+    Build the CrewAI objects of a workflow. Language models, tools and MCP sessions don't
+    depend on each other and are built concurrently, see `build_concurrently`. With a
+    compiled `engine.crewai.plan.CrewAIWorkflowPlan` of the workflow, language models and
+    tools are created from the plan's factories.
+    """
+    setup_start = time.perf_counter()
+    builds: Dict[str, Callable[[], Any]] = {}
     for l_ in collated_input.language_models:
-        language_models[l_.model_id] = get_crewai_llm(l_, llm_config.get(l_.model_id, {}))
-
-    tools: Dict[str, BaseTool] = {}
+        if plan is not None:
+            builds[f"llm:{l_.model_id}"] = plan.llm_factories[l_.model_id]
+        else:
+            builds[f"llm:{l_.model_id}"] = lambda l_=l_: get_crewai_llm(l_, llm_config.get(l_.model_id, {}))
     for t_ in collated_input.tool_instances:
-        tools[t_.id] = get_crewai_tool(t_, tool_config.get(t_.id, {}), workflow_directory)
-
-    mcps: Dict[str, input_types.MCPObjects] = {}
+        if plan is not None:
+            builds[f"tool:{t_.id}"] = plan.tool_factories[t_.id]
+        else:
+            builds[f"tool:{t_.id}"] = lambda t_=t_: get_crewai_tool(t_, tool_config.get(t_.id, {}), workflow_directory)
     for m_ in collated_input.mcp_instances:
-        mcps[m_.id] = get_mcp_tools_for_crewai(m_, mcp_config.get(m_.id, {}))
+        builds[f"mcp:{m_.id}"] = lambda m_=m_: get_mcp_tools_for_crewai(m_, mcp_config.get(m_.id, {}))
+
+    built, setup_timings, errors = build_concurrently(builds)
+    if errors:
+        # Don't leak the MCP sessions that were started for a crew that can't be built.
+        for name, mcp_object in built.items():
+            if name.startswith("mcp:"):
+                try:
+                    release_mcp_objects(mcp_object)
+                except Exception as e:
+                    print(f"Error stopping MCP: {e}")
+        message = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        raise RuntimeError(f"Failed to build workflow objects: {message}") from next(iter(errors.values()))
+
+    language_models: Dict[str, AgentStudioCrewAILLM] = {
+        l_.model_id: built[f"llm:{l_.model_id}"] for l_ in collated_input.language_models
+    }
+    tools: Dict[str, BaseTool] = {t_.id: built[f"tool:{t_.id}"] for t_ in collated_input.tool_instances}
+    mcps: Dict[str, input_types.MCPObjects] = {m_.id: built[f"mcp:{m_.id}"] for m_ in collated_input.mcp_instances}
 
     agents: Dict[str, AgentStudioCrewAIAgent] = {}
     for agent in collated_input.agents:
@@ -72,4 +138,5 @@ def create_crewai_objects(
         agents=agents,
         tasks=tasks,
         crews={workflow_input.id: crew},
+        setup_timings={**setup_timings, "total": round((time.perf_counter() - setup_start) * 1000, 3)},
     )
@@ -1,10 +1,13 @@
 import requests
 import os
+from datetime import datetime
+from typing import Dict
 
 from crewai.utilities.events import *
 
 from engine.crewai.trace_context import get_trace_id
 from engine.ops import get_ops_endpoint
+from engine.tool.execution import pop_tool_execution_profile, pop_tool_usage_summary
 
 # Global mapping from (agent_key, tool_name) to tool_instance_id
 _AGENT_TOOL_TO_INSTANCE_ID = {}
@@ -104,6 +107,7 @@ EVENT_PROCESSORS = {
         "started_at": str(x.started_at),
         "finished_at": str(x.finished_at),
         "agent_studio_id": _extract_tool_instance_id(x),
+        "profile": pop_tool_execution_profile(_extract_tool_instance_id(x)),
     },
     ToolUsageErrorEvent: lambda x: {
         "tool_name": x.tool_name,
@@ -113,6 +117,7 @@ EVENT_PROCESSORS = {
         "run_attempts": x.run_attempts,
         "delegations": x.delegations,
         "agent_studio_id": _extract_tool_instance_id(x),
+        "profile": pop_tool_execution_profile(_extract_tool_instance_id(x)),
     },
     ToolUsageStartedEvent: lambda x: {
         "tool_name": x.tool_name,
@@ -179,6 +184,47 @@ def post_event(source, event):
     )
 
 
+def post_tool_usage_summary(trace_id: str) -> None:
+    """
+    Post a per-tool summary (calls, latency, CPU, memory and output size) of all
+    tool calls of a workflow run to the run's events.
+    """
+    tool_usage_summary = pop_tool_usage_summary(trace_id)
+    if not tool_usage_summary:
+        return
+    requests.post(
+        url=f"{get_ops_endpoint()}/events",
+        headers={"Authorization": f"Bearer {os.getenv('CDSW_APIV2_KEY')}"},
+        json={
+            "trace_id": trace_id,
+            "event": {
+                "timestamp": str(datetime.now()),
+                "type": "tool_usage_summary",
+                "tools": tool_usage_summary,
+            },
+        },
+    )
+
+
+def post_crew_setup_timings(trace_id: str, setup_timings: Dict[str, float]) -> None:
+    """
+    Post the build time of each language model, tool and MCP session of a workflow run
+    to the run's events.
+    """
+    requests.post(
+        url=f"{get_ops_endpoint()}/events",
+        headers={"Authorization": f"Bearer {os.getenv('CDSW_APIV2_KEY')}"},
+        json={
+            "trace_id": trace_id,
+            "event": {
+                "timestamp": str(datetime.now()),
+                "type": "crew_setup",
+                "timings_ms": setup_timings,
+            },
+        },
+    )
+
+
 # Globalsafety flag to avoid double registration
 _handlers_registered = False
 
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 import os
 
 # No top level studio.db imports allowed to support wokrflow model deployment
@@ -13,10 +13,24 @@ litellm.ssl_verify = os.environ.get("REQUESTS_CA_BUNDLE")
 
 
 def get_crewai_llm(language_model: Input__LanguageModel, llm_config_dict: Dict[str, Any]) -> CrewAILLM:
+    return AgentStudioCrewAILLM(**_get_crewai_llm_kwargs(language_model, llm_config_dict))
+
+
+def get_crewai_llm_factory(
+    language_model: Input__LanguageModel, llm_config_dict: Dict[str, Any]
+) -> Callable[[], CrewAILLM]:
+    """
+    Resolve the LLM configuration once, and return a function that creates new LLM objects of it.
+    """
+    llm_kwargs = _get_crewai_llm_kwargs(language_model, llm_config_dict)
+    return lambda: AgentStudioCrewAILLM(**llm_kwargs)
+
+
+def _get_crewai_llm_kwargs(language_model: Input__LanguageModel, llm_config_dict: Dict[str, Any]) -> Dict[str, Any]:
     # Either pull model config right from the collated input, or from the input model config dict
     llm_config: Input__LanguageModelConfig = Input__LanguageModelConfig(**llm_config_dict)
     if llm_config.model_type == SupportedModelTypes.OPENAI.value:
-        return AgentStudioCrewAILLM(
+        return dict(
             agent_studio_id=language_model.model_id,
             model="openai/" + llm_config.provider_model,
             api_key=llm_config.api_key,
@@ -26,7 +40,7 @@ def get_crewai_llm(language_model: Input__LanguageModel, llm_config_dict: Dict[s
             extra_headers=llm_config.extra_headers,
         )
     elif llm_config.model_type == SupportedModelTypes.OPENAI_COMPATIBLE.value:
-        return AgentStudioCrewAILLM(
+        return dict(
             agent_studio_id=language_model.model_id,
             model="openai/" + llm_config.provider_model,
             api_key=llm_config.api_key,
@@ -37,7 +51,7 @@ def get_crewai_llm(language_model: Input__LanguageModel, llm_config_dict: Dict[s
             extra_headers=llm_config.extra_headers,
         )
     elif llm_config.model_type == SupportedModelTypes.AZURE_OPENAI.value:
-        return AgentStudioCrewAILLM(
+        return dict(
             agent_studio_id=language_model.model_id,
             model="azure/" + llm_config.provider_model,
             api_key=llm_config.api_key,
@@ -48,7 +62,7 @@ def get_crewai_llm(language_model: Input__LanguageModel, llm_config_dict: Dict[s
             extra_headers=llm_config.extra_headers,
         )
     elif llm_config.model_type == SupportedModelTypes.GEMINI.value:
-        return AgentStudioCrewAILLM(
+        return dict(
             agent_studio_id=language_model.model_id,
             model="gemini/" + llm_config.provider_model,
             api_key=llm_config.api_key,
@@ -57,7 +71,7 @@ def get_crewai_llm(language_model: Input__LanguageModel, llm_config_dict: Dict[s
             extra_headers=llm_config.extra_headers,
         )
     elif llm_config.model_type == SupportedModelTypes.ANTHROPIC.value:
-        return AgentStudioCrewAILLM(
+        return dict(
             agent_studio_id=language_model.model_id,
             model="anthropic/" + llm_config.provider_model,
             api_key=llm_config.api_key,
@@ -66,7 +80,7 @@ def get_crewai_llm(language_model: Input__LanguageModel, llm_config_dict: Dict[s
             extra_headers=llm_config.extra_headers,
         )
     elif llm_config.model_type == "CAII":
-        return AgentStudioCrewAILLM(
+        return dict(
             agent_studio_id=language_model.model_id,
             model="openai/" + llm_config.provider_model,
             api_key=llm_config.api_key,
@@ -77,7 +91,7 @@ def get_crewai_llm(language_model: Input__LanguageModel, llm_config_dict: Dict[s
             extra_headers=llm_config.extra_headers,
         )
     elif llm_config.model_type == SupportedModelTypes.BEDROCK.value:
-        return AgentStudioCrewAILLM(
+        return dict(
             agent_studio_id=language_model.model_id,
             model="bedrock/" + llm_config.provider_model,
             aws_access_key_id=llm_config.aws_access_key_id,
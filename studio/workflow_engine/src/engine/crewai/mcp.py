@@ -1,7 +1,7 @@
 # No top level studio.db imports allowed to support wokrflow model deployment
 
 import asyncio, os
-from typing import Dict
+from typing import Callable, Dict, Optional
 from datetime import timedelta
 
 from mcp import StdioServerParameters, ClientSession, types as mcp_types
@@ -13,6 +13,9 @@ from mcpadapt.crewai_adapter import CrewAIAdapter
 import engine.types as input_types
 from engine.types import *
 from engine.crewai.wrappers import AgentStudioCrewAITool
+import engine.tool.wheelhouse as wheelhouse
+from engine.tool.mcp_definitions import get_mcp_server_spec_key, get_mcp_tool_definitions_cached
+from engine.crewai.mcp_pool import get_mcp_server_pool, is_mcp_pool_enabled
 
 _mcp_type_to_command = {
     "PYTHON": "uvx",
@@ -20,9 +23,12 @@ _mcp_type_to_command = {
 }
 
 
-def _wrap_mcp_tool_with_agent_studio_wrapper(base_tool, mcp_instance_id: str) -> AgentStudioCrewAITool:
+def _wrap_mcp_tool_with_agent_studio_wrapper(
+    base_tool, mcp_instance_id: str, on_error: Optional[Callable[[], None]] = None
+) -> AgentStudioCrewAITool:
     """
     Wrap a BaseTool from MCP with AgentStudioCrewAITool to add agent_studio_mcp_id tracking.
+    `on_error` is called when a call of the tool raises.
     """
 
     class MCPWrappedTool(AgentStudioCrewAITool):
@@ -41,7 +47,12 @@ def _wrap_mcp_tool_with_agent_studio_wrapper(base_tool, mcp_instance_id: str) ->
             self._base_tool = base_tool
 
         def _run(self, *args, **kwargs):
-            return self._base_tool._run(*args, **kwargs)
+            try:
+                return self._base_tool._run(*args, **kwargs)
+            except Exception:
+                if on_error is not None:
+                    on_error()
+                raise
 
         def _arun(self, *args, **kwargs):
             if hasattr(self._base_tool, "_arun"):
@@ -52,13 +63,29 @@ def _wrap_mcp_tool_with_agent_studio_wrapper(base_tool, mcp_instance_id: str) ->
 
 
 def get_mcp_tools_for_crewai(mcp_instance: Input__MCPInstance, env_vars: Dict[str, str]) -> input_types.MCPObjects:
+    """
+    Tools of an MCP instance for one workflow run. The MCP server is leased from the
+    warm server pool, see `engine.crewai.mcp_pool`. Call `release_mcp_objects` after the run.
+    """
     env_to_pass = os.environ.copy()
+    env_to_pass.update(wheelhouse.get_mcp_server_env())
     env_to_pass.update(env_vars)
     server_params = StdioServerParameters(
         command=_mcp_type_to_command[mcp_instance.type],
         args=mcp_instance.args,
         env=env_to_pass,
     )
+    if is_mcp_pool_enabled():
+        server = get_mcp_server_pool().acquire(server_params, {**wheelhouse.get_mcp_server_env(), **env_vars})
+        return input_types.MCPObjects(
+            local_session=server.adapter,
+            tools=[
+                _wrap_mcp_tool_with_agent_studio_wrapper(tool, mcp_instance.id, server.mark_broken)
+                for tool in server.tools
+            ],
+            pooled_server=server,
+        )
+
     adapter = MCPAdapt(server_params, CrewAIAdapter(), connect_timeout=60)
     adapter.__enter__()
     base_tools: list[BaseTool] = adapter.tools()
@@ -72,37 +99,66 @@ def get_mcp_tools_for_crewai(mcp_instance: Input__MCPInstance, env_vars: Dict[st
     )
 
 
-async def get_mcp_tool_definitions(mcp_instance: Input__MCPInstance, env_vars: Dict[str, str]) -> List[mcp_types.Tool]:
+def release_mcp_objects(mcp_objects: input_types.MCPObjects) -> None:
+    """
+    Return the MCP server of a finished run to the pool, or stop it if it isn't pooled.
+    """
+    if mcp_objects.pooled_server is not None:
+        get_mcp_server_pool().release(mcp_objects.pooled_server)
+    else:
+        mcp_objects.local_session.__exit__(None, None, None)
+
+
+async def _list_mcp_tools(server_params: StdioServerParameters) -> List[mcp_types.Tool]:
     timeout = timedelta(seconds=60)  # 60 seconds
+    async with stdio_client(server_params) as (read, write):
+        async with ClientSession(
+            read_stream=read,
+            write_stream=write,
+            read_timeout_seconds=timeout,
+        ) as session:
+            # Initialize the connection
+            await session.initialize()
+            print(f"Initialized session")
+            tools = await session.list_tools()
+            return tools.tools
+
+
+async def get_mcp_tool_definitions(
+    mcp_instance: Input__MCPInstance, env_vars: Dict[str, str], cache_dir: Optional[str] = None
+) -> List[mcp_types.Tool]:
+    """
+    Tool definitions of an MCP instance, from the MCP definitions cache if the server
+    spec is cached (see `engine.tool.mcp_definitions`).
+    """
     env_to_pass = os.environ.copy()
+    env_to_pass.update(wheelhouse.get_mcp_server_env())
     env_to_pass.update(env_vars)
+    command = _mcp_type_to_command[mcp_instance.type]
     server_params = StdioServerParameters(
-        command=_mcp_type_to_command[mcp_instance.type],
+        command=command,
         args=mcp_instance.args,
         env=env_to_pass,
     )
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(
-                read_stream=read,
-                write_stream=write,
-                read_timeout_seconds=timeout,
-            ) as session:
-                # Initialize the connection
-                await session.initialize()
-                print(f"Initialized session")
-                tools = await session.list_tools()
-                return tools.tools
+        tools = await asyncio.to_thread(
+            get_mcp_tool_definitions_cached,
+            get_mcp_server_spec_key(command, mcp_instance.args, mcp_instance.env_names),
+            lambda: [t.model_dump(mode="json") for t in asyncio.run(_list_mcp_tools(server_params))],
+            cache_dir,
+        )
+        return [mcp_types.Tool.model_validate(tool) for tool in tools]
     except Exception as e:
         print(f"Error getting MCP tool definitions for {mcp_instance.id}: {e}")
         return []
 
 
 async def get_mcp_tools_definitions(
-    mcp_instances: List[Input__MCPInstance], env_vars: Dict[str, Dict[str, str]]
+    mcp_instances: List[Input__MCPInstance], env_vars: Dict[str, Dict[str, str]], cache_dir: Optional[str] = None
 ) -> Dict[str, List[mcp_types.Tool]]:
     tasks = [
-        get_mcp_tool_definitions(mcp_instance, env_vars.get(mcp_instance.id, {})) for mcp_instance in mcp_instances
+        get_mcp_tool_definitions(mcp_instance, env_vars.get(mcp_instance.id, {}), cache_dir)
+        for mcp_instance in mcp_instances
     ]
     results = await asyncio.gather(*tasks)
     return {mcp_instance.id: result for (mcp_instance, result) in zip(mcp_instances, results)}
@@ -0,0 +1,236 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Pool of warm MCP servers shared by workflow runs.
+
+Starting an MCP server (`uvx`/`npx` plus the MCP handshake) is often the largest part
+of the time to first token of a run. Instead of starting a server for every run and
+stopping it afterwards, runs lease a server from this pool. Servers are keyed by their
+command, arguments and the hash of their environment, so runs of MCP instances with the
+same configuration share servers.
+
+A server serves one run at a time, since MCP servers can keep state between tool calls;
+more runs start more servers. Set AGENT_STUDIO_MCP_SERVER_CONCURRENCY above 1 to share a
+server between concurrent runs. Idle servers are health checked (MCP ping) before they are leased
+again, closed after AGENT_STUDIO_MCP_IDLE_TIMEOUT_SECONDS without use, and servers whose
+tool calls failed are recycled once their runs are done. AGENT_STUDIO_MCP_POOL=off
+turns pooling off.
+"""
+
+import os
+import json
+import time
+import atexit
+import asyncio
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp import StdioServerParameters
+from mcpadapt.core import MCPAdapt
+from mcpadapt.crewai_adapter import CrewAIAdapter
+
+DEFAULT_MCP_SERVER_CONCURRENCY = 1
+DEFAULT_MCP_IDLE_TIMEOUT_SECONDS = 600
+MCP_CONNECT_TIMEOUT_SECONDS = 60
+MCP_HEALTH_CHECK_TIMEOUT_SECONDS = 5
+
+
+def is_mcp_pool_enabled() -> bool:
+    return os.getenv("AGENT_STUDIO_MCP_POOL", "on").lower() not in ("off", "false", "0")
+
+
+def get_mcp_server_key(server_params: StdioServerParameters, env_vars: Dict[str, str]) -> str:
+    """
+    Key of an MCP server configuration: its command, arguments and the hash of the
+    environment variables it is started with on top of this process' environment.
+    """
+    env_hash = hashlib.sha256(json.dumps(env_vars, sort_keys=True).encode("utf-8")).hexdigest()
+    return hashlib.sha256(json.dumps([server_params.command, server_params.args, env_hash]).encode("utf-8")).hexdigest()
+
+
+def start_mcp_server(server_params: StdioServerParameters) -> MCPAdapt:
+    adapter = MCPAdapt(server_params, CrewAIAdapter(), connect_timeout=MCP_CONNECT_TIMEOUT_SECONDS)
+    try:
+        adapter.start()
+    except Exception:
+        # Stop the event loop thread and the server process of a server that failed to connect.
+        try:
+            adapter.close()
+        except Exception as e:
+            print(f"Error stopping MCP server that failed to start: {e}")
+        raise
+    return adapter
+
+
+def ping_mcp_server(adapter: MCPAdapt) -> bool:
+    if not adapter.thread.is_alive() or adapter.task is None or adapter.task.done():
+        return False
+    try:
+        for session in adapter.sessions:
+            asyncio.run_coroutine_threadsafe(session.send_ping(), adapter.loop).result(
+                timeout=MCP_HEALTH_CHECK_TIMEOUT_SECONDS
+            )
+        return True
+    except Exception as e:
+        print(f"MCP server health check failed: {e}")
+        return False
+
+
+class PooledMCPServer:
+    """
+    A started MCP server and the CrewAI tools of it, leased to up to `concurrency` runs.
+    """
+
+    def __init__(self, key: str, adapter: Any, tools: List[Any]):
+        self.key = key
+        self.adapter = adapter
+        self.tools = tools
+        self.leases = 0
+        self.last_used = time.monotonic()
+        self.broken = False
+
+    def mark_broken(self) -> None:
+        """
+        Recycle the server once its current runs are done.
+        """
+        self.broken = True
+
+
+class MCPServerPool:
+    def __init__(
+        self,
+        start_server: Callable[[StdioServerParameters], Any] = start_mcp_server,
+        check_health: Callable[[Any], bool] = ping_mcp_server,
+        concurrency: int = DEFAULT_MCP_SERVER_CONCURRENCY,
+        idle_timeout_seconds: float = DEFAULT_MCP_IDLE_TIMEOUT_SECONDS,
+    ):
+        self.start_server = start_server
+        self.check_health = check_health
+        self.concurrency = concurrency
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._servers: Dict[str, List[PooledMCPServer]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "reused": 0, "recycled": 0}
+
+    def acquire(self, server_params: StdioServerParameters, env_vars: Dict[str, str]) -> PooledMCPServer:
+        """
+        Lease a healthy server for the configuration, starting one if none has capacity.
+        """
+        key = get_mcp_server_key(server_params, env_vars)
+        self.close_idle_servers()
+        while True:
+            with self._lock:
+                candidates = [
+                    server
+                    for server in self._servers.get(key, [])
+                    if not server.broken and server.leases < self.concurrency
+                ]
+                server = max(candidates, key=lambda server: server.leases, default=None)
+                if server is not None:
+                    server.leases += 1
+            if server is None:
+                break
+            # Servers that are in use by other runs are known to work.
+            if server.leases > 1 or self.check_health(server.adapter):
+                with self._lock:
+                    server.last_used = time.monotonic()
+                    self._stats["reused"] += 1
+                return server
+            server.mark_broken()
+            self.release(server)
+
+        adapter = self.start_server(server_params)
+        try:
+            tools = adapter.tools()
+        except Exception:
+            self._close(adapter)
+            raise
+        server = PooledMCPServer(key, adapter, tools)
+        server.leases = 1
+        with self._lock:
+            self._servers.setdefault(key, []).append(server)
+            self._stats["started"] += 1
+        return server
+
+    def release(self, server: PooledMCPServer) -> None:
+        with self._lock:
+            server.leases -= 1
+            server.last_used = time.monotonic()
+            recycle = server.broken and server.leases == 0
+            if recycle:
+                self._remove(server)
+                self._stats["recycled"] += 1
+        if recycle:
+            self._close(server.adapter)
+
+    def close_idle_servers(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                server
+                for servers in self._servers.values()
+                for server in servers
+                if server.leases == 0 and now - server.last_used > self.idle_timeout_seconds
+            ]
+            for server in idle:
+                self._remove(server)
+        for server in idle:
+            self._close(server.adapter)
+
+    def close_all(self) -> None:
+        with self._lock:
+            servers = [server for servers in self._servers.values() for server in servers]
+            self._servers.clear()
+        for server in servers:
+            self._close(server.adapter)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "servers": sum(len(servers) for servers in self._servers.values()),
+                "leases": sum(server.leases for servers in self._servers.values() for server in servers),
+            }
+
+    def _remove(self, server: PooledMCPServer) -> None:
+        # Called with the pool lock held.
+        servers = self._servers.get(server.key, [])
+        if server in servers:
+            servers.remove(server)
+        if not servers:
+            self._servers.pop(server.key, None)
+
+    def _close(self, adapter: Any) -> None:
+        try:
+            adapter.close()
+        except Exception as e:
+            print(f"Error stopping MCP server: {e}")
+
+
+_mcp_server_pool: Optional[MCPServerPool] = None
+_mcp_server_pool_lock = threading.Lock()
+
+
+def get_mcp_server_pool() -> MCPServerPool:
+    global _mcp_server_pool
+    with _mcp_server_pool_lock:
+        if _mcp_server_pool is None:
+            _mcp_server_pool = MCPServerPool(
+                concurrency=int(os.getenv("AGENT_STUDIO_MCP_SERVER_CONCURRENCY", DEFAULT_MCP_SERVER_CONCURRENCY)),
+                idle_timeout_seconds=float(
+                    os.getenv("AGENT_STUDIO_MCP_IDLE_TIMEOUT_SECONDS", DEFAULT_MCP_IDLE_TIMEOUT_SECONDS)
+                ),
+            )
+            atexit.register(_mcp_server_pool.close_all)
+            threading.Thread(target=_close_idle_servers_periodically, args=(_mcp_server_pool,), daemon=True).start()
+        return _mcp_server_pool
+
+
+def _close_idle_servers_periodically(pool: MCPServerPool) -> None:
+    while True:
+        time.sleep(max(1.0, min(60.0, pool.idle_timeout_seconds / 2)))
+        try:
+            pool.close_idle_servers()
+        except Exception as e:
+            print(f"Error closing idle MCP servers: {e}")
@@ -0,0 +1,76 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Compiled plan of a deployed CrewAI workflow.
+
+Without a plan, every kickoff rebuilds the whole crew: it parses the code of each tool,
+builds the tool classes and their argument schemas and resolves every LLM configuration.
+None of that changes between kickoffs of the same artifact and deployment config, so a
+plan does it once, at model start, and keeps a factory per language model and tool.
+Kickoffs then only create the lightweight per-run objects (LLM, tool, agent, task and
+crew objects) and lease their MCP sessions, see `create_crewai_objects`.
+"""
+
+import time
+from typing import Callable, Dict
+
+from crewai import LLM as CrewAILLM
+from crewai.tools import BaseTool
+from pydantic import BaseModel, ConfigDict
+
+import engine.types as input_types
+from engine.crewai.crew import build_concurrently
+from engine.crewai.llms import get_crewai_llm_factory
+from engine.crewai.tools import get_crewai_tool_factory
+
+
+class CrewAIWorkflowPlan(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    workflow_directory: str
+    collated_input: input_types.CollatedInput
+
+    llm_factories: Dict[str, Callable[[], CrewAILLM]]
+    """
+    Per language model ID, a function creating a new LLM object for a run.
+    """
+
+    tool_factories: Dict[str, Callable[[], BaseTool]]
+    """
+    Per tool instance ID, a function creating a new tool object for a run.
+    """
+
+    compile_ms: float = 0.0
+
+
+def compile_crewai_workflow_plan(
+    workflow_directory: str,
+    collated_input: input_types.CollatedInput,
+    tool_config: Dict[str, Dict[str, str]],
+    llm_config: Dict[str, Dict[str, str]],
+) -> CrewAIWorkflowPlan:
+    """
+    Compile the plan of a workflow. Raises a RuntimeError naming every language model or
+    tool that could not be compiled.
+    """
+    start = time.perf_counter()
+    builds = {}
+    for l_ in collated_input.language_models:
+        builds[f"llm:{l_.model_id}"] = lambda l_=l_: get_crewai_llm_factory(l_, llm_config.get(l_.model_id, {}))
+    for t_ in collated_input.tool_instances:
+        builds[f"tool:{t_.id}"] = lambda t_=t_: get_crewai_tool_factory(
+            t_, tool_config.get(t_.id, {}), workflow_directory
+        )
+
+    built, _, errors = build_concurrently(builds)
+    if errors:
+        message = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        raise RuntimeError(f"Failed to compile workflow plan: {message}") from next(iter(errors.values()))
+
+    return CrewAIWorkflowPlan(
+        workflow_directory=workflow_directory,
+        collated_input=collated_input,
+        llm_factories={l_.model_id: built[f"llm:{l_.model_id}"] for l_ in collated_input.language_models},
+        tool_factories={t_.id: built[f"tool:{t_.id}"] for t_ in collated_input.tool_instances},
+        compile_ms=round((time.perf_counter() - start) * 1000, 3),
+    )
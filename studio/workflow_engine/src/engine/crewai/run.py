@@ -2,11 +2,13 @@
 import asyncio
 from contextvars import Context
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from opentelemetry.context import attach, detach
 
 from engine.crewai.trace_context import set_trace_id
 from engine.crewai.crew import create_crewai_objects
+from engine.crewai.events import post_crew_setup_timings, post_tool_usage_summary
+from engine.crewai.mcp import release_mcp_objects
 
 
 def run_workflow(
@@ -18,12 +20,14 @@ def run_workflow(
     inputs: Dict[str, Any],
     parent_context: Context,
     events_trace_id: str,
-) -> None:
+    plan: Optional[Any] = None,
+) -> Any:
     """
-    Runs a CrewAI workflow inside the given context.
+    Runs a CrewAI workflow inside the given context and returns the output of the crew.
     Intended to be launched either directly or via an executor thread.
     """
     token = attach(parent_context)
+    crewai_objects = None
     try:
         set_trace_id(events_trace_id)
         crewai_objects = create_crewai_objects(
@@ -32,14 +36,23 @@ def run_workflow(
             tool_config,
             mcp_config,
             llm_config,
+            plan,
         )
+        try:
+            post_crew_setup_timings(events_trace_id, crewai_objects.setup_timings)
+        except Exception as e:
+            print(f"Error posting crew setup timings: {e}")
         crew = crewai_objects.crews[collated_input.workflow.id]
-        crew.kickoff(inputs=dict(inputs))
+        return crew.kickoff(inputs=dict(inputs))
     finally:
+        try:
+            post_tool_usage_summary(events_trace_id)
+        except Exception as e:
+            print(f"Error posting tool usage summary: {e}")
         detach(token)
-        for mcp_object in crewai_objects.mcps.values():
+        for mcp_object in crewai_objects.mcps.values() if crewai_objects else []:
             try:
-                mcp_object.local_session.__exit__(None, None, None)
+                release_mcp_objects(mcp_object)
             except Exception as e:
                 print(f"Error stopping MCP: {e}")
 
@@ -53,7 +66,8 @@ async def run_workflow_async(
     inputs: Dict[str, Any],
     parent_context: Any,  # Use the parent context
     events_trace_id,
-) -> None:
+    plan: Optional[Any] = None,
+) -> Any:
     """
     Run the workflow task in the background using the parent context.
 
@@ -61,7 +75,7 @@ async def run_workflow_async(
     cannot be used here
     """
     loop = asyncio.get_event_loop()
-    await loop.run_in_executor(
+    return await loop.run_in_executor(
         None,
         run_workflow,
         workflow_directory,
@@ -72,4 +86,5 @@ async def run_workflow_async(
         inputs,
         parent_context,
         events_trace_id,
+        plan,
     )
@@ -1,6 +1,6 @@
 # No top level studio.db imports allowed to support wokrflow model deployment
 
-from typing import Dict, Optional, Type
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 from pydantic import BaseModel
 import os
 from crewai.tools import BaseTool
@@ -13,27 +13,36 @@ import threading
 import re
 import shutil
 import venv
+import hashlib
+import tempfile
+import time
+import sys
 
 import engine.types as input_types
 from engine.types import *
 from engine.crewai.wrappers import AgentStudioCrewAITool
+import engine.tool.venv_store as venv_store
+import engine.tool.wheelhouse as wheelhouse
+from engine.tool.execution import (
+    ToolProcessResult,
+    ToolResourceLimits,
+    get_max_tool_output_bytes,
+    get_tool_resource_limits,
+    get_truncation_notice,
+    record_tool_execution,
+    run_tool_subprocess,
+)
+from engine.tool.result_cache import call_with_tool_result_cache
+from engine.tool.source_metadata import get_tool_source_metadata, get_tool_source_metadata_for_code
 
 
 def extract_tool_class_name(code: str) -> str:
-    try:
-        parsed_ast = ast.parse(code)
-        tool_class_node: Optional[ast.ClassDef] = None
-        for node in ast.walk(parsed_ast):
-            if isinstance(node, ast.ClassDef):
-                for base in node.bases:
-                    if isinstance(base, ast.Name) and base.id == "StudioBaseTool":
-                        tool_class_node = node
-                        break
-        if tool_class_node is None:
-            raise ValueError("CrewAI tool class not found.")
-        return tool_class_node.name
-    except SyntaxError as e:
-        raise ValueError(f"Error parsing Python code: {e}")
+    source_metadata = get_tool_source_metadata_for_code(code)
+    if source_metadata.syntax_error is not None:
+        raise ValueError(f"Error parsing Python code: {source_metadata.syntax_error}")
+    if source_metadata.tool_class_name is None:
+        raise ValueError("CrewAI tool class not found.")
+    return source_metadata.tool_class_name
 
 
 def _get_skeleton_tool_code(code: str) -> str:
@@ -185,56 +194,171 @@ def run_code_in_thread(code):
     return result
 
 
+# Directory holding the pre-generated runner modules for V1 tool proxies.
+TOOL_PROXY_RUNNER_DIR = os.path.join(tempfile.gettempdir(), "agent_studio_tool_runners")
+
+_TOOL_PROXY_RUNNER_TEMPLATE = """\
+import json, os, sys
+
+# Mirror `python -c` semantics: the working directory, not the runner directory, is importable.
+sys.path[0] = ""
+
+# Results go back over the original stdout pipe; anything the tool prints is discarded.
+_result_stream = os.fdopen(os.dup(1), "w")
+_devnull = os.open(os.devnull, os.O_WRONLY)
+os.dup2(_devnull, 1)
+os.close(_devnull)
+
+with open({tool_file!r}, "r") as _tool_file:
+    exec(compile(_tool_file.read(), {tool_file!r}, "exec"))
+
+_payload = json.load(sys.stdin)
+_tool_obj = {tool_class_name}(user_parameters=_payload["user_kwargs"])
+json.dump(_tool_obj._run(**_payload["tool_kwargs"]), _result_stream)
+_result_stream.flush()
+"""
+
+# tool file path -> (tool file mtime_ns, runner module path)
+_tool_proxy_runners: Dict[str, Tuple[int, str]] = {}
+_tool_proxy_runners_lock = threading.Lock()
+
+
+def get_tool_proxy_runner(tool_file_path: str) -> str:
+    """
+    Get the path of the runner module for a V1 tool, generating it if the tool
+    source changed since the runner was last written.
+    """
+    tool_file_path = os.path.abspath(tool_file_path)
+    mtime_ns = os.stat(tool_file_path).st_mtime_ns
+    with _tool_proxy_runners_lock:
+        cached = _tool_proxy_runners.get(tool_file_path)
+        if cached and cached[0] == mtime_ns and os.path.exists(cached[1]):
+            return cached[1]
+
+        runner_code = _TOOL_PROXY_RUNNER_TEMPLATE.format(
+            tool_file=tool_file_path,
+            tool_class_name=extract_tool_class_name(get_tool_source_metadata(tool_file_path).source),
+        )
+
+        os.makedirs(TOOL_PROXY_RUNNER_DIR, exist_ok=True)
+        runner_name = hashlib.sha256(tool_file_path.encode("utf-8")).hexdigest()[:16]
+        runner_path = os.path.join(TOOL_PROXY_RUNNER_DIR, f"{runner_name}.py")
+        with tempfile.NamedTemporaryFile(mode="w", dir=TOOL_PROXY_RUNNER_DIR, suffix=".tmp", delete=False) as tmp_file:
+            tmp_file.write(runner_code)
+        os.replace(tmp_file.name, runner_path)
+
+        _tool_proxy_runners[tool_file_path] = (mtime_ns, runner_path)
+        return runner_path
+
+
+def run_tool_proxy(
+    tool_file_path: str,
+    python_executable: str,
+    path_to_add: str,
+    user_kwargs: Dict[str, str],
+    tool_kwargs: Dict[str, Any],
+    tool_instance_id: Optional[str] = None,
+    tool_name: Optional[str] = None,
+) -> Any:
+    """
+    Execute one call of a V1 tool in its virtual environment through the tool's
+    runner module. Arguments are sent on stdin and the JSON result is read back
+    from stdout.
+    """
+    source_metadata = get_tool_source_metadata(tool_file_path)
+    tool_name = tool_name or os.path.basename(tool_file_path)
+    return call_with_tool_result_cache(
+        source_metadata.cache_ttl_seconds,
+        tool_instance_id,
+        tool_name,
+        source_metadata.source_hash,
+        user_kwargs,
+        tool_kwargs,
+        lambda: _call_tool_proxy(
+            tool_file_path, python_executable, path_to_add, user_kwargs, tool_kwargs, tool_instance_id, tool_name
+        ),
+    )
+
+
+def _call_tool_proxy(
+    tool_file_path: str,
+    python_executable: str,
+    path_to_add: str,
+    user_kwargs: Dict[str, str],
+    tool_kwargs: Dict[str, Any],
+    tool_instance_id: Optional[str],
+    tool_name: str,
+) -> Tuple[Any, bool]:
+    runner_path = get_tool_proxy_runner(tool_file_path)
+    source_metadata = get_tool_source_metadata(tool_file_path)
+    new_envs = os.environ.copy()
+    new_envs["PATH"] = path_to_add + ":" + new_envs["PATH"]
+    result = run_tool_subprocess(
+        [python_executable, runner_path],
+        input=json.dumps({"user_kwargs": user_kwargs, "tool_kwargs": tool_kwargs}),
+        env=new_envs,
+        max_output_bytes=get_max_tool_output_bytes(source_metadata.max_output_bytes),
+        spill_name=tool_instance_id or "tool_proxy",
+        limits=get_tool_resource_limits(
+            source_metadata.timeout_seconds, source_metadata.max_memory_mb, source_metadata.max_cpu_seconds
+        ),
+    )
+    try:
+        if result.profile.limit_error is not None:
+            raise ValueError(f"Error in executing tool: {result.profile.limit_error.model_dump_json()}")
+        if result.stderr:
+            raise ValueError(f"Error in executing tool: {result.stderr}")
+        if result.returncode != 0 or not result.stdout:
+            raise ValueError(f"Error in executing tool: exited with code {result.returncode} and no output")
+        if result.profile.output_truncated:
+            # The JSON result is incomplete, pass the head of it on as text.
+            return result.stdout + get_truncation_notice(result.profile, len(result.stdout.encode("utf-8"))), False
+        parse_start = time.perf_counter()
+        output = json.loads(result.stdout)
+        result.profile.parse_ms = round((time.perf_counter() - parse_start) * 1000, 3)
+        return output, True
+    finally:
+        record_tool_execution(tool_instance_id, tool_name, result.profile)
+
+
 def get_tool_instance_proxy(
     tool_instance: Input__ToolInstance, user_params_kv: Dict[str, str], workflow_directory: str
 ) -> BaseTool:
     """
     Get the tool instance proxy callable for the tool instance.
     """
+    return get_tool_instance_proxy_factory(tool_instance, user_params_kv, workflow_directory)()
+
+
+def get_tool_instance_proxy_factory(
+    tool_instance: Input__ToolInstance, user_params_kv: Dict[str, str], workflow_directory: str
+) -> Callable[[], BaseTool]:
+    """
+    Build the tool instance proxy class for the tool instance once, and return a
+    function that creates a new tool object of it.
+    """
 
     tool_file_path = os.path.join(
         workflow_directory, tool_instance.source_folder_path, tool_instance.python_code_file_name
     )
-    with open(tool_file_path, "r") as tool_file:
-        tool_code = tool_file.read()
-    tool_class_name = extract_tool_class_name(tool_code)
+    source_metadata = get_tool_source_metadata(tool_file_path)
+    tool_class_name = extract_tool_class_name(source_metadata.source)
     python_executable = os.path.join(workflow_directory, tool_instance.source_folder_path, ".venv", "bin", "python")
     path_to_add = os.path.join(workflow_directory, tool_instance.source_folder_path, ".venv", "bin")
 
-    skeleton_tool_code = _get_skeleton_tool_code(tool_code)
+    skeleton_tool_code = source_metadata.get_derived(
+        "skeleton_tool_code", lambda: _get_skeleton_tool_code(source_metadata.source)
+    )
+
+    # Generate the runner up front so that the first tool call doesn't pay for it.
+    get_tool_proxy_runner(tool_file_path)
 
     replacement_code = f"""
     function_arguments = {{k: v for k, v in locals().items() if k != 'self'}}
-    tool_class_name = self.__class__.__name__
-    tool_file = "{tool_file_path}"
-    python_executable = "{python_executable}"
-    path_to_add = "{path_to_add}"
-    user_kwargs = {user_params_kv}
-
-    with tempfile.NamedTemporaryFile(mode="w+", delete=True, dir="/tmp") as tmp_file:
-        tmp_file_name = tmp_file.name
-        with open(tool_file, "r") as file:
-            tool_code = file.read()
-            augmented_tool_code = (
-                tool_code + "\\n\\n"
-                + "import json\\n\\n"
-                + f"user_kwargs = {{user_kwargs}}\\n"
-                + f"tool_kwargs = {{function_arguments}}\\n"
-                + f"_tool_obj = {{tool_class_name}}(user_parameters=user_kwargs)\\n"
-                + f"with open('{{tmp_file_name}}', 'w') as output_file:\\n"
-                + "    json.dump(_tool_obj._run(**tool_kwargs), output_file)\\n"
-            )
-        new_envs = os.environ.copy()
-        new_envs["PATH"] = path_to_add + ":" + new_envs["PATH"]
-        result = subprocess.run([python_executable, "-c", augmented_tool_code], capture_output=True, text=True, check=False, env=new_envs)
-        if result.stderr:
-            raise ValueError(f"Error in executing tool: {{result.stderr}}")
-        with open(tmp_file_name, "r") as output_file:
-            output = json.load(output_file)
-        return output
+    return run_tool_proxy({tool_file_path!r}, {python_executable!r}, {path_to_add!r}, {user_params_kv!r}, function_arguments, {tool_instance.id!r}, {tool_instance.name!r})
     """
 
-    proxy_code = "import os, json, subprocess, tempfile\n" + skeleton_tool_code.replace(
+    proxy_code = "from engine.crewai.tools import run_tool_proxy\n" + skeleton_tool_code.replace(
         "        pass", indent(dedent(replacement_code), "        ")
     )
 
@@ -248,12 +372,15 @@ def get_tool_instance_proxy(
         def _run(self, *args, **kwargs):
             return _tool._run(*args, **kwargs)
 
-    crewai_tool: BaseTool = EmbeddedCrewAITool(agent_studio_id=tool_instance.id)
+    def create_tool() -> BaseTool:
+        crewai_tool: BaseTool = EmbeddedCrewAITool(agent_studio_id=tool_instance.id)
 
-    crewai_tool.name = tool_instance.name
-    crewai_tool._generate_description()
+        crewai_tool.name = tool_instance.name
+        crewai_tool._generate_description()
 
-    return crewai_tool
+        return crewai_tool
+
+    return create_tool
 
 
 def create_virtual_env(source_folder_path: str, with_: Literal["venv", "uv"]):
@@ -261,23 +388,30 @@ def create_virtual_env(source_folder_path: str, with_: Literal["venv", "uv"]):
     Create a virtual environment in the given source folder path.
     Only runs if the .venv directory doesn't exist.
     """
-    venv_dir = os.path.join(source_folder_path, ".venv")
+    _create_virtual_env_at(os.path.join(source_folder_path, ".venv"), with_, source_folder_path)
+
 
+def _create_virtual_env_at(venv_dir: str, with_: Literal["venv", "uv"], source_folder_path: str):
     # Only create if .venv directory doesn't exist and .venv/bin/python exists
     if os.path.exists(venv_dir) and os.path.exists(os.path.join(venv_dir, "bin", "python")):
         return
 
+    # A .venv link whose shared environment has been garbage collected.
+    if os.path.islink(venv_dir) and not os.path.exists(venv_dir):
+        os.unlink(venv_dir)
+
     # If .venv/ exists but .venv/bin/python doesn't exist, remove .venv/ because
     # it's an invalid venv and has been corrupted.
     if os.path.exists(venv_dir) and not os.path.exists(os.path.join(venv_dir, "bin", "python")):
-        shutil.rmtree(venv_dir)
+        venv_store.remove_venv_link(venv_dir)
 
     uv_bin = shutil.which("uv")
 
     try:
         if with_ == "uv":
-            uv_venv_setup_command = [uv_bin, "venv", venv_dir]
-            result = subprocess.run(
+            # Pin the interpreter so the environment matches the Python version it is keyed by in the venv store.
+            uv_venv_setup_command = [uv_bin, "venv", "--python", sys.executable, venv_dir]
+            subprocess.run(
                 uv_venv_setup_command,
                 check=True,
                 capture_output=True,
@@ -285,40 +419,36 @@ def create_virtual_env(source_folder_path: str, with_: Literal["venv", "uv"]):
             )
         else:
             venv.create(venv_dir, with_pip=True)
-    except Exception as e:
+    except subprocess.CalledProcessError as e:
         error_msg = f"Error creating virtual environment for tool directory {source_folder_path}:\n"
-        error_msg += f"Command: {' '.join(uv_venv_setup_command)}\n"
-        error_msg += f"Return code: {result.returncode}\n"
-        if result.stdout:
-            error_msg += f"STDOUT:\n{result.stdout}\n"
-        if result.stderr:
-            error_msg += f"STDERR:\n{result.stderr}\n"
+        error_msg += f"Command: {' '.join(e.cmd)}\n"
+        error_msg += f"Return code: {e.returncode}\n"
+        if e.stdout:
+            error_msg += f"STDOUT:\n{e.stdout}\n"
+        if e.stderr:
+            error_msg += f"STDERR:\n{e.stderr}\n"
         raise RuntimeError(f"COULD NOT CREATE VENV: {error_msg}")
+    except Exception as e:
+        raise RuntimeError(
+            f"COULD NOT CREATE VENV: Error creating virtual environment for tool directory {source_folder_path}: {e}"
+        )
 
 
-def _prepare_virtual_env_for_tool_impl(
-    source_folder_path: str, requirements_file_name: str, with_: Literal["venv", "uv"]
+def _install_requirements(
+    venv_dir: str,
+    requirements_file_path: str,
+    with_: Literal["venv", "uv"],
+    source_folder_path: str,
+    wheel_bundle_dir: Optional[str] = None,
 ):
-    # Create virtual environment if it doesn't exist
-    create_virtual_env(source_folder_path, with_)
-
-    venv_dir = os.path.join(source_folder_path, ".venv")
     uv_bin = shutil.which("uv")
-    requirements_file_path = os.path.join(source_folder_path, requirements_file_name)
-
-    # Always install requirements (fast if already up to date)
     try:
         if with_ == "uv":
             pip_install_command = [uv_bin, "pip", "install", "-r", requirements_file_path]
-            # Honor PyPI mirror if provided
-            default_index = os.environ.get("UV_DEFAULT_INDEX")
-            insecure_host = os.environ.get("UV_INSECURE_HOST")
-            print(f"default_index: {default_index}")
-            print(f"insecure_host: {insecure_host}")
-            if default_index:
-                pip_install_command.extend(["--index-url", default_index])
-            if insecure_host:
-                pip_install_command.extend(["--trusted-host", insecure_host])
+            # PyPI mirror settings (UV_DEFAULT_INDEX, UV_INSECURE_HOST) and the local
+            # wheelhouse are applied by the wheelhouse install commands.
+            print(f"default_index: {os.environ.get('UV_DEFAULT_INDEX')}")
+            print(f"insecure_host: {os.environ.get('UV_INSECURE_HOST')}")
             https_proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("https_proxy")
             print(f"https_proxy: {https_proxy}")
             http_proxy = os.environ.get("HTTP_PROXY") or os.environ.get("http_proxy")
@@ -343,13 +473,17 @@ def _prepare_virtual_env_for_tool_impl(
             if http_proxy:
                 subprocess_env["HTTP_PROXY"] = http_proxy
                 subprocess_env["http_proxy"] = http_proxy
-        result = subprocess.run(
-            pip_install_command,
-            check=True,
-            text=True,
-            capture_output=True,  # Capture stdout/stderr
-            env=subprocess_env,
-        )
+            result = wheelhouse.run_install_commands(pip_install_command, subprocess_env, wheel_bundle_dir)
+            pip_install_command = result.args
+            result.check_returncode()
+        else:
+            result = subprocess.run(
+                pip_install_command,
+                check=True,
+                text=True,
+                capture_output=True,  # Capture stdout/stderr
+                env=subprocess_env,
+            )
     except subprocess.CalledProcessError as e:
         # We're not raising error as this will bring down the whole studio, as it's running in a thread
         error_msg = f"Error installing venv requirements for tool directory {source_folder_path}:\n"
@@ -362,8 +496,53 @@ def _prepare_virtual_env_for_tool_impl(
         raise RuntimeError(f"COULD NOT INSTALL REQUIREMENTS: {error_msg}")
 
 
-def prepare_virtual_env_for_tool(source_folder_path: str, requirements_file_name: str):
-    return _prepare_virtual_env_for_tool_impl(source_folder_path, requirements_file_name, "uv")
+def _prepare_virtual_env_for_tool_impl(
+    source_folder_path: str,
+    requirements_file_name: str,
+    with_: Literal["venv", "uv"],
+    wheel_bundle_dir: Optional[str] = None,
+) -> bool:
+    """
+    Prepare the virtual environment of a tool. Shareable requirements are only installed
+    when the install fingerprint (requirements, interpreter and index settings) changed
+    since the last successful install. Requirements that reference other files or local
+    paths are always installed, since the fingerprint can't see changes to those. Returns
+    whether requirements were installed.
+    """
+    venv_dir = os.path.join(source_folder_path, ".venv")
+    requirements_file_path = os.path.join(source_folder_path, requirements_file_name)
+    fingerprint = venv_store.get_install_fingerprint(requirements_file_path, with_)
+    installed = False
+
+    def build(target_venv_dir: str):
+        nonlocal installed
+        _create_virtual_env_at(target_venv_dir, with_, source_folder_path)
+        _install_requirements(target_venv_dir, requirements_file_path, with_, source_folder_path, wheel_bundle_dir)
+        installed = True
+
+    if venv_store.is_shareable_requirements(requirements_file_path):
+        # Tools with identical requirements share one environment from the venv store.
+        venv_store.link_shared_venv(venv_dir, requirements_file_path, build, fingerprint)
+    else:
+        # Requirements that reference other files or local paths get a private environment,
+        # installed every time.
+        if os.path.islink(venv_dir):
+            os.unlink(venv_dir)
+        venv_store.record_install_fingerprint(venv_dir, None)
+        build(venv_dir)
+
+    venv_store.record_install_outcome(skipped=not installed)
+    return installed
+
+
+def prepare_virtual_env_for_tool(
+    source_folder_path: str, requirements_file_name: str, wheel_bundle_dir: Optional[str] = None
+) -> bool:
+    """
+    Prepare the virtual environment of a tool with uv. Requirements are installed from
+    `wheel_bundle_dir` (prebuilt wheels of a deployment artifact) first, if given.
+    """
+    return _prepare_virtual_env_for_tool_impl(source_folder_path, requirements_file_name, "uv", wheel_bundle_dir)
 
 
 def get_venv_tool_output_key(code: str) -> Optional[str]:
@@ -372,20 +551,10 @@ def get_venv_tool_output_key(code: str) -> Optional[str]:
         OUTPUT_KEY = 'some_string'
     Return the string if found, else None.
     """
-    try:
-        tree = ast.parse(code)
-    except SyntaxError as e:
-        raise ValueError(f"Error parsing Python code: {e}")
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            # node.targets can be a list of targets (e.g. multiple assignment)
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id == "OUTPUT_KEY":
-                    # Make sure it's assigned a string literal
-                    if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
-                        return node.value.value
-    return None
+    source_metadata = get_tool_source_metadata_for_code(code)
+    if source_metadata.syntax_error is not None:
+        raise ValueError(f"Error parsing Python code: {source_metadata.syntax_error}")
+    return source_metadata.output_key
 
 
 def get_venv_tool_python_executable(workflow_directory: str, tool_instance: input_types.Input__ToolInstance) -> str:
@@ -394,85 +563,29 @@ def get_venv_tool_python_executable(workflow_directory: str, tool_instance: inpu
 
 def get_venv_tool_tool_parameters_type(code: str) -> Type[BaseModel]:
     """
-    1. Parse the given Python source code into an AST.
-    2. Locate the class named 'ToolParameters'.
-    3. Create a new ClassDef that keeps only certain nodes (e.g., AnnAssign fields).
-    4. Insert that ClassDef into a minimal AST Module with an import of BaseModel.
-    5. Compile & exec that new module in the current Python environment.
-    6. Return the resulting class object from namespace.
+    The ToolParameters model of a venv tool, compiled from only its field definitions
+    so that the tool's own dependencies don't need to be importable here.
     """
-    # Parse the entire file into an AST
-    tree = ast.parse(code)
-
-    # Find the ToolParameters class node
-    tool_params_node: Optional[ast.ClassDef] = None
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef) and node.name == "ToolParameters":
-            tool_params_node = node
-            break
-
-    if tool_params_node is None:
-        raise ValueError("ToolParameters class not found in the code.")
-
-    # Make a new ClassDef that keeps only certain statements (e.g. AnnAssign)
-    # or anything else you'd like to preserve.
-    stripped_body = [
-        stmt
-        for stmt in tool_params_node.body
-        if isinstance(stmt, ast.AnnAssign)
-        # You could also allow ast.Assign if you want un-annotated assignments, etc.
-    ]
-
-    modified_tool_parameters = ast.ClassDef(
-        name=tool_params_node.name,  # "ToolParameters"
-        bases=tool_params_node.bases,  # e.g. [ast.Name(id="BaseModel", ...)]
-        keywords=tool_params_node.keywords,  # e.g. if there's a metaclass or something
-        body=stripped_body,  # keep only field definitions
-        decorator_list=tool_params_node.decorator_list,
-        lineno=tool_params_node.lineno,
-        col_offset=tool_params_node.col_offset,
-        end_lineno=getattr(tool_params_node, "end_lineno", None),
-        end_col_offset=getattr(tool_params_node, "end_col_offset", None),
-    )
-
-    # Build a new AST module with:
-    #   from pydantic import BaseModel
-    #   <modified classdef>
-    module_body = [
-        ast.ImportFrom(module="typing", names=[ast.alias(name="*", asname=None)], level=0),
-        ast.ImportFrom(module="pydantic", names=[ast.alias(name="*", asname=None)], level=0),
-        modified_tool_parameters,
-    ]
-
-    new_module = ast.Module(
-        body=module_body,
-        type_ignores=[],  # For Python 3.8+; on older versions, you may omit or use `[]`
-    )
-
-    # Fix any missing line/column info in the AST so Python can compile it
-    ast.fix_missing_locations(new_module)
-
-    # Compile and execute this brand-new module in a scratch namespace
-    ns = {}
-    compiled = compile(new_module, filename="<ast>", mode="exec")
-    exec(compiled, ns)
-
-    # Retrieve the newly-defined "ToolParameters" class
-    dynamic_cls = ns["ToolParameters"]
-
-    # Confirm it’s a subclass of BaseModel (optional sanity check)
-    if not issubclass(dynamic_cls, BaseModel):
-        raise ValueError("Extracted ToolParameters is not a subclass of BaseModel.")
-
-    return dynamic_cls
+    return get_tool_source_metadata_for_code(code).get_tool_parameters_type()
 
 
 def get_venv_tool(
     tool_instance: input_types.Input__ToolInstance, user_params_kv: Dict[str, str], workflow_directory: str
 ) -> BaseTool:
+    return get_venv_tool_factory(tool_instance, user_params_kv, workflow_directory)()
+
+
+def get_venv_tool_factory(
+    tool_instance: input_types.Input__ToolInstance, user_params_kv: Dict[str, str], workflow_directory: str
+) -> Callable[[], BaseTool]:
+    """
+    Build the venv tool class for the tool instance once, and return a function that
+    creates a new tool object of it.
+    """
     relative_module_dir = os.path.abspath(os.path.join(workflow_directory, tool_instance.source_folder_path))
     with open(os.path.join(relative_module_dir, tool_instance.python_code_file_name), "r") as code_file:
         tool_code = code_file.read()
+    source_metadata = get_tool_source_metadata_for_code(tool_code)
     user_params = user_params_kv
 
     class AgentStudioCrewAIVenvTool(AgentStudioCrewAITool):
@@ -482,11 +595,26 @@ def get_venv_tool(
             workflow_directory, tool_instance.source_folder_path, tool_instance.python_code_file_name
         )
         name: str = tool_instance.name
-        description: str = ast.get_docstring(ast.parse(tool_code))
-        args_schema: Type[BaseModel] = get_venv_tool_tool_parameters_type(tool_code)
+        description: str = source_metadata.docstring
+        args_schema: Type[BaseModel] = source_metadata.get_tool_parameters_type()
         venv_dir: str = os.path.join(workflow_directory, tool_instance.source_folder_path, ".venv")
+        max_output_bytes: int = get_max_tool_output_bytes(source_metadata.max_output_bytes)
+        limits: ToolResourceLimits = get_tool_resource_limits(
+            source_metadata.timeout_seconds, source_metadata.max_memory_mb, source_metadata.max_cpu_seconds
+        )
 
         def _run(self, *args, **kwargs):
+            return call_with_tool_result_cache(
+                source_metadata.cache_ttl_seconds,
+                self.agent_studio_id,
+                self.name,
+                source_metadata.source_hash,
+                dict(user_params),
+                dict(kwargs),
+                lambda: self._call(kwargs),
+            )
+
+        def _call(self, kwargs: Dict[str, Any]) -> Tuple[str, bool]:
             try:
                 cmd = [
                     self.python_executable,
@@ -500,16 +628,32 @@ def get_venv_tool(
                 env = os.environ.copy()
                 env.update({"VIRTUAL_ENV": self.venv_dir})
 
-                result = subprocess.run(
+                result = run_tool_subprocess(
                     cmd,
-                    capture_output=True,
-                    text=True,
-                    check=False,
                     cwd=workflow_directory,
                     env=env,
+                    max_output_bytes=self.max_output_bytes,
+                    output_key=self.output_key,
+                    spill_name=self.agent_studio_id or "tool",
+                    limits=self.limits,
                 )
             except Exception as e:
-                return f"Tool call failed: {e}"
+                return f"Tool call failed: {e}", False
+
+            parse_start = time.perf_counter()
+            output = self._get_output(result)
+            cacheable = result.returncode == 0 and bool(result.stdout)
+            if isinstance(result, ToolProcessResult):
+                cacheable = cacheable and result.profile.limit_error is None and not result.profile.output_truncated
+                if result.returncode == 0 and result.profile.output_truncated:
+                    output += get_truncation_notice(result.profile, len(output.encode("utf-8")))
+                result.profile.parse_ms = round((time.perf_counter() - parse_start) * 1000, 3)
+                record_tool_execution(self.agent_studio_id, self.name, result.profile)
+            return output, cacheable
+
+        def _get_output(self, result: subprocess.CompletedProcess) -> str:
+            if isinstance(result, ToolProcessResult) and result.profile.limit_error is not None:
+                return f"Error: {result.profile.limit_error.model_dump_json()}"
             if result.returncode != 0:
                 return f"Error: {result.stderr or 'No error details found'}"
             if result.stdout:
@@ -521,9 +665,7 @@ def get_venv_tool(
                 return f"stderr: {result.stderr or 'No error details found'}\n\n\nstdout: {result.stdout}"
             return f"Error running tool - no output"
 
-    tool = AgentStudioCrewAIVenvTool(agent_studio_id=tool_instance.id)
-
-    return tool
+    return lambda: AgentStudioCrewAIVenvTool(agent_studio_id=tool_instance.id)
 
 
 def is_venv_tool(tool_code: str) -> bool:
@@ -538,13 +680,10 @@ def is_venv_tool(tool_code: str) -> bool:
     introspecting our tool code and revamping validate_tool_code() to handle V2 tools.
     """
 
-    parsed_ast = ast.parse(tool_code)
-
-    # Search for ToolParameters class in the base node
-    for node in parsed_ast.body:
-        if isinstance(node, ast.ClassDef) and node.name == "ToolParameters":
-            return True
-    return False
+    source_metadata = get_tool_source_metadata_for_code(tool_code)
+    if source_metadata.syntax_error is not None:
+        raise source_metadata.syntax_error
+    return source_metadata.is_venv_tool
 
 
 def get_crewai_tool(
@@ -556,10 +695,27 @@ def get_crewai_tool(
     single file tool, etc.). This method determines what tool type is running and then either loads the
     V1 tool or the V2 tool.
     """
-    relative_module_dir = os.path.abspath(os.path.join(workflow_directory, tool_instance.source_folder_path))
-    with open(os.path.join(relative_module_dir, tool_instance.python_code_file_name), "r") as code_file:
-        tool_code = code_file.read()
-    if is_venv_tool(tool_code):
+    if _is_venv_tool_instance(tool_instance, workflow_directory):
         return get_venv_tool(tool_instance, user_params_kv, workflow_directory)
     else:
         return get_tool_instance_proxy(tool_instance, user_params_kv, workflow_directory)
+
+
+def get_crewai_tool_factory(
+    tool_instance: input_types.Input__ToolInstance, user_params_kv: Dict[str, str], workflow_directory: str
+) -> Callable[[], BaseTool]:
+    """
+    Like `get_crewai_tool`, but returns a function that creates new tool objects, so that
+    the tool code is only parsed and the tool class only built once.
+    """
+    if _is_venv_tool_instance(tool_instance, workflow_directory):
+        return get_venv_tool_factory(tool_instance, user_params_kv, workflow_directory)
+    else:
+        return get_tool_instance_proxy_factory(tool_instance, user_params_kv, workflow_directory)
+
+
+def _is_venv_tool_instance(tool_instance: input_types.Input__ToolInstance, workflow_directory: str) -> bool:
+    relative_module_dir = os.path.abspath(os.path.join(workflow_directory, tool_instance.source_folder_path))
+    with open(os.path.join(relative_module_dir, tool_instance.python_code_file_name), "r") as code_file:
+        tool_code = code_file.read()
+    return is_venv_tool(tool_code)
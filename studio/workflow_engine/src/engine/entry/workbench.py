@@ -2,7 +2,7 @@
 
 import os
 import sys
-import subprocess
+import threading
 
 # Set UV_LINK_MODE to copy to avoid hardlinking issues on filesystems with link limits
 os.environ["UV_LINK_MODE"] = "copy"
@@ -47,12 +47,25 @@ if os.getenv("AGENT_STUDIO_DEPLOY_MODE", "amp").lower() == "runtime":
     app_dir = os.getenv("APP_DIR")
     sys.path.append(os.path.join(app_dir, "studio", "workflow_engine", "src"))
 
+# Record how long each phase of the model start takes.
+from engine.startup import StartupTimeline, install_cmlapi
+
+startup_timeline = StartupTimeline()
+
 # Install the cmlapi. This is a required dependency for cross-cutting util modules
-# and ops modules that are used in a workflow.
+# and ops modules that are used in a workflow. It is installed in the background while
+# the artifact is extracted, and skipped if the workspace's cmlapi is installed already.
+# Nothing else may import from site-packages or run pip while it installs, so it is
+# started after the imports below and joined before the workflow is loaded.
 from engine.utils import get_url_scheme
 
 scheme = get_url_scheme()
-subprocess.call(["pip", "install", f"{scheme}://{CDSW_DOMAIN}/api/v2/python.tar.gz"])
+
+
+def _install_cmlapi():
+    with startup_timeline.phase("cmlapi_install"):
+        install_cmlapi(f"{scheme}://{CDSW_DOMAIN}/api/v2/python.tar.gz")
+
 
 # If we are in old workbenches, we cannot modify the model
 # root dir location. To get around this, we specify early what
@@ -77,8 +90,18 @@ import base64
 from pydantic import BaseModel
 
 import engine.types as input_types
+from engine.consts import MCP_DEFINITIONS_ARTIFACT_DIRECTORY
 from engine.crewai.mcp import get_mcp_tools_definitions
 from engine.crewai.run import run_workflow_async
+from engine.crewai.plan import CrewAIWorkflowPlan, compile_crewai_workflow_plan
+from engine.kickoff_queue import (
+    KickoffRejectedError,
+    get_kickoff_queue,
+    get_queue_status,
+    kickoff_batch,
+    submit_kickoff,
+)
+from engine.run_registry import get_run_registry, track_run
 from engine.crewai.artifact import is_crewai_workflow, load_crewai_workflow
 from engine.artifact import extract_artifact_to_location, get_workflow_name
 from engine.langgraph.artifact import is_langgraph_workflow, load_langgraph_workflow
@@ -86,24 +109,49 @@ from engine.langgraph.artifact import is_langgraph_workflow, load_langgraph_work
 import cml.models_v1 as cml_models
 
 
+_cmlapi_install_thread = threading.Thread(target=_install_cmlapi, daemon=True)
+_cmlapi_install_thread.start()
+
 # Extract (or download) our artifact to MODEL_EXECUTION_DIR/workflow/*
-extract_artifact_to_location(WORFKLOW_ARTIFACT, WORKFLOW_DIRECTORY)
+with startup_timeline.phase("artifact_extract"):
+    extract_artifact_to_location(WORFKLOW_ARTIFACT, WORKFLOW_DIRECTORY)
+
+_cmlapi_install_thread.join()
 
 LANGGRAPH_CALLABLES = None
 tracer = None  # keep this for CrewAI workflows
 
-if is_langgraph_workflow(WORKFLOW_DIRECTORY):
-    LANGGRAPH_CALLABLES = load_langgraph_workflow(WORKFLOW_DIRECTORY)
-elif is_crewai_workflow(WORKFLOW_DIRECTORY):
-    collated_input: Optional[BaseModel] = None
-    collated_input, tracer = load_crewai_workflow(WORKFLOW_DIRECTORY)
-else:
-    raise ValueError("Unsupported workflow artifact type.")
+with startup_timeline.phase("workflow_load"):
+    if is_langgraph_workflow(WORKFLOW_DIRECTORY):
+        LANGGRAPH_CALLABLES = load_langgraph_workflow(WORKFLOW_DIRECTORY)
+    elif is_crewai_workflow(WORKFLOW_DIRECTORY):
+        collated_input: Optional[BaseModel] = None
+        collated_input, tracer = load_crewai_workflow(WORKFLOW_DIRECTORY, startup_timeline)
+    else:
+        raise ValueError("Unsupported workflow artifact type.")
 
 
 # Extract the workflow name
 workflow_name = get_workflow_name(workflow_dir=WORKFLOW_DIRECTORY)
 
+# Compile the plan of a CrewAI workflow once, so that kickoffs don't have to parse
+# tools and resolve LLM configurations again. Kickoffs fall back to building the
+# whole crew if the plan can't be compiled.
+_workflow_plan: Optional[CrewAIWorkflowPlan] = None
+if not LANGGRAPH_CALLABLES:
+    try:
+        _plan_deployment_config = input_types.DeploymentConfig.model_validate(json.loads(WORKFLOW_DEPLOYMENT_CONFIG))
+        with startup_timeline.phase("workflow_plan"):
+            _workflow_plan = compile_crewai_workflow_plan(
+                WORKFLOW_DIRECTORY,
+                collated_input,
+                _plan_deployment_config.tool_config,
+                _plan_deployment_config.llm_config,
+            )
+        print(f"Compiled workflow plan in {_workflow_plan.compile_ms} ms")
+    except Exception as e:
+        print(f"Failed to compile workflow plan, kickoffs will build the full crew: {e}")
+
 _mcp_tool_defintions: Optional[Dict[str, List[Dict]]] = None
 
 
@@ -113,19 +161,89 @@ async def _set_mcp_tool_definitions():
         deployment_config: input_types.DeploymentConfig = input_types.DeploymentConfig.model_validate(
             json.loads(WORKFLOW_DEPLOYMENT_CONFIG)
         )
-        result = await get_mcp_tools_definitions(collated_input.mcp_instances, deployment_config.mcp_config)
+        result = await get_mcp_tools_definitions(
+            collated_input.mcp_instances,
+            deployment_config.mcp_config,
+            os.path.join(WORKFLOW_DIRECTORY, MCP_DEFINITIONS_ARTIFACT_DIRECTORY),
+        )
         _mcp_tool_defintions = {mcp_id: [t.model_dump() for t in tool_list] for mcp_id, tool_list in result.items()}
         print(f"MCP tool definitions are set")
 
 
 asyncio.create_task(_set_mcp_tool_definitions())
 
+startup_timeline.print_summary()
+
 
 def base64_decode(encoded_str: str):
     decoded_bytes = base64.b64decode(encoded_str)
     return json.loads(decoded_bytes.decode("utf-8"))
 
 
+def _kickoff(inputs: Dict, deployment_config: input_types.DeploymentConfig) -> Dict:
+    """
+    Start a run of the workflow, or queue it if all run slots are busy. Returns the trace
+    ID and queue admission of the run, or the error and queue status of a rejected kickoff.
+    """
+    # Reject the kickoff before a trace is started for it if it can't run or be queued.
+    kickoff_queue = get_kickoff_queue()
+    try:
+        kickoff_queue.check_admission()
+    except KickoffRejectedError as e:
+        return {"error": str(e), "queue_status": e.status}
+
+    # LangGraph workflow
+    if LANGGRAPH_CALLABLES:
+        graph_callable = LANGGRAPH_CALLABLES.get(workflow_name)
+        if not graph_callable:
+            raise ValueError(f"No graph callable found for workflow name '{workflow_name}'")
+
+        async def run_langgraph_workflow():
+            from engine.langgraph.run import run_workflow_langgraph_instance
+
+            await run_workflow_langgraph_instance(graph_callable, inputs)
+
+        result = submit_kickoff(kickoff_queue, run_langgraph_workflow)
+        return result if "error" in result else {"trace_id": "n/a", **result}
+
+    # CrewAI workflow
+    # The plan shares the collated input between kickoffs, it is not modified by runs.
+    collated_input_copy = _workflow_plan.collated_input if _workflow_plan else collated_input.model_copy(deep=True)
+    current_time = datetime.now()
+    formatted_time = current_time.strftime("%b %d, %H:%M:%S.%f")[:-3]
+    span_name = f"Workflow Run: {formatted_time}"
+
+    with tracer.start_as_current_span(span_name) as parent_span:
+        decimal_trace_id = parent_span.get_span_context().trace_id
+        trace_id = f"{decimal_trace_id:032x}"
+        parent_context = get_current()
+
+        run_registry = get_run_registry()
+        run_registry.register(trace_id)
+        result = submit_kickoff(
+            kickoff_queue,
+            track_run(
+                run_registry,
+                trace_id,
+                lambda: run_workflow_async(
+                    WORKFLOW_DIRECTORY,
+                    collated_input_copy,
+                    deployment_config.tool_config,
+                    deployment_config.mcp_config,
+                    deployment_config.llm_config,
+                    inputs,
+                    parent_context,
+                    trace_id,
+                    _workflow_plan,
+                ),
+            ),
+        )
+        if "error" in result:
+            run_registry.remove(trace_id)
+            return result
+    return {"trace_id": str(trace_id), **result}
+
+
 # TODO: remove dependence on collated_input workflow type
 @cml_models.cml_model
 def api_wrapper(args: Union[dict, str]) -> str:
@@ -133,11 +251,10 @@ def api_wrapper(args: Union[dict, str]) -> str:
     if not isinstance(args, dict):
         dict_args = json.loads(args)
     serve_workflow_parameters = input_types.ServeWorkflowParameters.model_validate(dict_args)
-    if serve_workflow_parameters.action_type == input_types.DeployedWorkflowActions.KICKOFF.value:
-        inputs = (
-            base64_decode(serve_workflow_parameters.kickoff_inputs) if serve_workflow_parameters.kickoff_inputs else {}
-        )
-
+    if serve_workflow_parameters.action_type in (
+        input_types.DeployedWorkflowActions.KICKOFF.value,
+        input_types.DeployedWorkflowActions.BATCH_KICKOFF.value,
+    ):
         # Extract deployment config (API keys, env vars, etc.)
         deployment_config: input_types.DeploymentConfig = input_types.DeploymentConfig.model_validate(
             json.loads(WORKFLOW_DEPLOYMENT_CONFIG)
@@ -147,52 +264,19 @@ def api_wrapper(args: Union[dict, str]) -> str:
         for key, value in deployment_config.environment.items():
             os.environ[key] = str(value)
 
+        if serve_workflow_parameters.action_type == input_types.DeployedWorkflowActions.BATCH_KICKOFF.value:
+            batch_inputs = (
+                base64_decode(serve_workflow_parameters.batch_kickoff_inputs)
+                if serve_workflow_parameters.batch_kickoff_inputs
+                else []
+            )
+            return kickoff_batch(get_kickoff_queue(), batch_inputs, lambda inputs: _kickoff(inputs, deployment_config))
+
         # Extract inputs
         inputs = (
             base64_decode(serve_workflow_parameters.kickoff_inputs) if serve_workflow_parameters.kickoff_inputs else {}
         )
-
-        # LangGraph workflow
-        if LANGGRAPH_CALLABLES:
-            graph_callable = LANGGRAPH_CALLABLES.get(workflow_name)
-            if not graph_callable:
-                raise ValueError(f"No graph callable found for workflow name '{workflow_name}'")
-
-            async def run_langgraph_workflow():
-                from engine.langgraph.run import run_workflow_langgraph_instance
-
-                await run_workflow_langgraph_instance(graph_callable, inputs)
-
-            asyncio.create_task(run_langgraph_workflow())
-            return {"trace_id": "n/a"}
-
-        # CrewAI workflow
-        else:
-            collated_input_copy = collated_input.model_copy(deep=True)
-            current_time = datetime.now()
-            formatted_time = current_time.strftime("%b %d, %H:%M:%S.%f")[:-3]
-            span_name = f"Workflow Run: {formatted_time}"
-
-            with tracer.start_as_current_span(span_name) as parent_span:
-                decimal_trace_id = parent_span.get_span_context().trace_id
-                trace_id = f"{decimal_trace_id:032x}"
-                parent_context = get_current()
-
-                asyncio.create_task(
-                    run_workflow_async(
-                        WORKFLOW_DIRECTORY,
-                        collated_input_copy,
-                        deployment_config.tool_config,
-                        deployment_config.mcp_config,
-                        deployment_config.llm_config,
-                        inputs,
-                        parent_context,
-                        trace_id,
-                    )
-                )
-            return {"trace_id": str(trace_id)}
-
-        return {"trace_id": str(trace_id)}
+        return _kickoff(inputs, deployment_config)
     elif serve_workflow_parameters.action_type == input_types.DeployedWorkflowActions.GET_CONFIGURATION.value:
         return {"configuration": json.loads(collated_input.model_dump_json())}
     elif serve_workflow_parameters.action_type == input_types.DeployedWorkflowActions.GET_ASSET_DATA.value:
@@ -220,5 +304,21 @@ def api_wrapper(args: Union[dict, str]) -> str:
         return {"asset_data": asset_data, "unavailable_assets": unavailable_assets}
     elif serve_workflow_parameters.action_type == input_types.DeployedWorkflowActions.GET_MCP_TOOL_DEFINITIONS.value:
         return {"ready": _mcp_tool_defintions is not None, "mcp_tool_definitions": _mcp_tool_defintions}
+    elif serve_workflow_parameters.action_type == input_types.DeployedWorkflowActions.GET_QUEUE_STATUS.value:
+        return get_queue_status(get_kickoff_queue())
+    elif serve_workflow_parameters.action_type in (
+        input_types.DeployedWorkflowActions.GET_RUN_STATUS.value,
+        input_types.DeployedWorkflowActions.GET_RUN_RESULT.value,
+    ):
+        run = get_run_registry().get(serve_workflow_parameters.trace_id or "")
+        if run is None:
+            return {"error": f"Run '{serve_workflow_parameters.trace_id}' is not known to this deployed workflow."}
+        # Outputs can be large, only the result action returns them.
+        exclude = (
+            {"output"}
+            if serve_workflow_parameters.action_type == input_types.DeployedWorkflowActions.GET_RUN_STATUS.value
+            else None
+        )
+        return {"run": run.model_dump(mode="json", exclude=exclude)}
     else:
         raise ValueError("Invalid action type.")
@@ -0,0 +1,77 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Files uploaded to a project in parts.
+
+The project files API only takes whole files in a single request, so large artifacts
+used to be uploaded at single-stream speed and failed entirely on a transient error.
+Large files are now uploaded in parts, `<file>.parts/part-00000`, ..., in parallel, and
+`<file>.parts/parts.json` is uploaded last with the size and sha256 of the file and of
+each part. Consumers of uploaded files assemble the parts into the file before reading it.
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+
+FILE_PARTS_DIRECTORY_SUFFIX = ".parts"
+FILE_PARTS_MANIFEST_FILENAME = "parts.json"
+
+
+def get_file_part_name(index: int) -> str:
+    return f"part-{index:05d}"
+
+
+def get_file_parts_dir(path: str) -> str:
+    return f"{path}{FILE_PARTS_DIRECTORY_SUFFIX}"
+
+
+def read_file_parts_manifest(path: str) -> Optional[Dict]:
+    """
+    Manifest of the parts of a file: {"size", "sha256", "parts": [{"name", "size", "sha256"}]},
+    or None if the file wasn't uploaded in parts.
+    """
+    try:
+        with open(os.path.join(get_file_parts_dir(path), FILE_PARTS_MANIFEST_FILENAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _get_file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def assemble_file_parts(path: str) -> bool:
+    """
+    Assemble a file uploaded in parts, unless it is assembled already. Returns whether
+    it was assembled. Raises a RuntimeError if the assembled file doesn't match the manifest.
+    """
+    manifest = read_file_parts_manifest(path)
+    if manifest is None:
+        return False
+    if (
+        os.path.isfile(path)
+        and os.path.getsize(path) == manifest["size"]
+        and _get_file_sha256(path) == manifest["sha256"]
+    ):
+        return False
+
+    parts_dir = get_file_parts_dir(path)
+    partial_path = f"{path}.partial"
+    with open(partial_path, "wb") as assembled:
+        for part in manifest["parts"]:
+            with open(os.path.join(parts_dir, part["name"]), "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    assembled.write(chunk)
+    if _get_file_sha256(partial_path) != manifest["sha256"]:
+        os.remove(partial_path)
+        raise RuntimeError(f"Parts of {os.path.basename(path)} don't add up to the uploaded file, upload it again.")
+    os.replace(partial_path, path)
+    print(f"Assembled {os.path.basename(path)} from {len(manifest['parts'])} parts")
+    return True
@@ -0,0 +1,208 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Admission control of the kickoffs of a deployed workflow model.
+
+Every kickoff used to start its run right away, so a burst of requests started dozens
+of crews at once, each in a thread of the default executor, until threads and memory
+ran out and every run timed out. At most AGENT_STUDIO_MAX_CONCURRENT_RUNS runs now run
+at once. Further kickoffs wait in a FIFO queue of AGENT_STUDIO_KICKOFF_QUEUE_SIZE runs
+and start, in order, as running ones finish. Kickoffs beyond that are rejected. With
+AGENT_STUDIO_KICKOFF_QUEUE_POLICY set to "reject" kickoffs are never queued: they are
+rejected as soon as all run slots are busy.
+
+`get_status` reports the run slots, the queue depth and the wait times of queued runs,
+it is served by the `get-queue-status` action of the deployed model. The `batch-kickoff`
+action submits the runs of a batch one by one, see `kickoff_batch`.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+DEFAULT_MAX_CONCURRENT_RUNS = 4
+DEFAULT_KICKOFF_QUEUE_SIZE = 64
+KICKOFF_QUEUE_POLICIES = ("wait", "reject")
+
+
+class KickoffRejectedError(RuntimeError):
+    """
+    Raised when a kickoff can neither run nor be queued.
+    """
+
+    def __init__(self, status: Dict[str, Any]):
+        self.status = status
+        super().__init__(
+            f"Kickoff rejected: {status['running']} of {status['max_concurrent_runs']} runs are running "
+            f"and {status['queued']} of {status['max_queue_size']} queued."
+        )
+
+
+class KickoffAdmission(BaseModel):
+    queued: bool
+    queue_position: int = 0
+    """
+    1-based position of a queued run in the queue, 0 for a run that started right away.
+    """
+
+
+class KickoffQueue:
+    """
+    Bounded concurrency of runs, with a bounded FIFO queue of runs waiting for a slot.
+    Runs are coroutine factories, called on the event loop the run was submitted from
+    when the run starts.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_runs: int = DEFAULT_MAX_CONCURRENT_RUNS,
+        max_queue_size: int = DEFAULT_KICKOFF_QUEUE_SIZE,
+        policy: str = "wait",
+    ):
+        if policy not in KICKOFF_QUEUE_POLICIES:
+            raise ValueError(f"Unknown kickoff queue policy '{policy}', expected one of {KICKOFF_QUEUE_POLICIES}")
+        self.max_concurrent_runs = max(1, max_concurrent_runs)
+        self.max_queue_size = max(0, max_queue_size) if policy == "wait" else 0
+        self.policy = policy
+        self._running = 0
+        self._queue: Deque[Tuple[Callable[[], Awaitable[Any]], asyncio.AbstractEventLoop, float]] = deque()
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+        self._total_queue_wait_ms = 0.0
+        self._max_queue_wait_ms = 0.0
+        self._dequeued = 0
+
+    def check_admission(self) -> None:
+        """
+        Raises a KickoffRejectedError if a run submitted now would be rejected, so that
+        callers can reject a kickoff before doing any work for it.
+        """
+        with self._lock:
+            if self._running < self.max_concurrent_runs or len(self._queue) < self.max_queue_size:
+                return
+            self._rejected += 1
+        raise KickoffRejectedError(self.get_status())
+
+    def submit(self, run: Callable[[], Awaitable[Any]]) -> KickoffAdmission:
+        """
+        Start a run, or queue it if all run slots are busy. Raises a KickoffRejectedError
+        if the queue is full too. Must be called from a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._running < self.max_concurrent_runs:
+                self._running += 1
+                self._admitted += 1
+                admission = KickoffAdmission(queued=False)
+            elif len(self._queue) < self.max_queue_size:
+                self._queue.append((run, loop, time.perf_counter()))
+                self._admitted += 1
+                self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+                return KickoffAdmission(queued=True, queue_position=len(self._queue))
+            else:
+                self._rejected += 1
+                admission = None
+        if admission is None:
+            raise KickoffRejectedError(self.get_status())
+        loop.create_task(self._run(run))
+        return admission
+
+    async def _run(self, run: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await run()
+        except Exception as e:
+            with self._lock:
+                self._failed += 1
+            print(f"Workflow run failed: {e}")
+        finally:
+            self._finish_run()
+
+    def _finish_run(self) -> None:
+        with self._lock:
+            self._completed += 1
+            if not self._queue:
+                self._running -= 1
+                return
+            # The slot of the finished run is handed to the next queued run.
+            run, loop, queued_at = self._queue.popleft()
+            wait_ms = (time.perf_counter() - queued_at) * 1000
+            self._dequeued += 1
+            self._total_queue_wait_ms += wait_ms
+            self._max_queue_wait_ms = max(self._max_queue_wait_ms, wait_ms)
+        loop.call_soon_threadsafe(lambda: loop.create_task(self._run(run)))
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "max_concurrent_runs": self.max_concurrent_runs,
+                "max_queue_size": self.max_queue_size,
+                "running": self._running,
+                "queued": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "completed": self._completed,
+                "failed": self._failed,
+                "mean_queue_wait_ms": round(self._total_queue_wait_ms / self._dequeued, 3) if self._dequeued else 0.0,
+                "max_queue_wait_ms": round(self._max_queue_wait_ms, 3),
+            }
+
+
+_kickoff_queue: Optional[KickoffQueue] = None
+_kickoff_queue_lock = threading.Lock()
+
+
+def get_kickoff_queue() -> KickoffQueue:
+    """
+    Kickoff queue of this process, configured from the environment on first use.
+    """
+    global _kickoff_queue
+    with _kickoff_queue_lock:
+        if _kickoff_queue is None:
+            _kickoff_queue = KickoffQueue(
+                max_concurrent_runs=int(os.getenv("AGENT_STUDIO_MAX_CONCURRENT_RUNS", DEFAULT_MAX_CONCURRENT_RUNS)),
+                max_queue_size=int(os.getenv("AGENT_STUDIO_KICKOFF_QUEUE_SIZE", DEFAULT_KICKOFF_QUEUE_SIZE)),
+                policy=os.getenv("AGENT_STUDIO_KICKOFF_QUEUE_POLICY", "wait").lower(),
+            )
+        return _kickoff_queue
+
+
+def submit_kickoff(queue: KickoffQueue, run: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+    """
+    Submit a run, and return the response of its kickoff: the queue admission of the run,
+    or the error and queue status of a rejected kickoff.
+    """
+    try:
+        admission = queue.submit(run)
+    except KickoffRejectedError as e:
+        return {"error": str(e), "queue_status": e.status}
+    return {"queued": admission.queued, "queue_position": admission.queue_position}
+
+
+def kickoff_batch(
+    queue: KickoffQueue, batch_inputs: List[Dict[str, Any]], kickoff: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Response of a batch kickoff. Every item is kicked off (or rejected) on its own, so that
+    a batch larger than the free run slots and queue space is partially scheduled. The
+    kickoff responses are in the order of the inputs.
+    """
+    runs = [kickoff(inputs) for inputs in batch_inputs]
+    return {"runs": runs, "queue_status": queue.get_status()}
+
+
+def get_queue_status(queue: KickoffQueue) -> Dict[str, Any]:
+    """
+    Response of the get-queue-status action.
+    """
+    return {"queue_status": queue.get_status()}
@@ -0,0 +1,131 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Registry of the runs of a deployed workflow model.
+
+A kickoff only returns the trace ID of its run, and callers used to learn whether the
+run had completed, and its output, by pulling and draining the whole event stream of
+the run from the ops server. The registry keeps the state (queued, running, completed
+or failed), the start and end times, the output and the error of the runs of this
+process by trace ID, served by the `get-run-status` and `get-run-result` actions.
+
+The registry is bounded to AGENT_STUDIO_RUN_REGISTRY_SIZE runs. Beyond that, the oldest
+finished runs are forgotten first.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+from pydantic import BaseModel
+
+DEFAULT_RUN_REGISTRY_SIZE = 1000
+
+
+class RunState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class RunRecord(BaseModel):
+    trace_id: str
+    state: RunState = RunState.QUEUED
+    queued_at: datetime
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    output: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RunRegistry:
+    def __init__(self, max_runs: int = DEFAULT_RUN_REGISTRY_SIZE):
+        self.max_runs = max(1, max_runs)
+        self._runs: "OrderedDict[str, RunRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, trace_id: str) -> RunRecord:
+        with self._lock:
+            record = RunRecord(trace_id=trace_id, queued_at=_now())
+            self._runs[trace_id] = record
+            self._runs.move_to_end(trace_id)
+            while len(self._runs) > self.max_runs:
+                finished = next(
+                    (key for key, run in self._runs.items() if run.state in (RunState.COMPLETED, RunState.FAILED)),
+                    None,
+                )
+                del self._runs[finished if finished is not None else next(iter(self._runs))]
+            return record
+
+    def remove(self, trace_id: str) -> None:
+        with self._lock:
+            self._runs.pop(trace_id, None)
+
+    def _update(self, trace_id: str, **fields: Any) -> None:
+        with self._lock:
+            record = self._runs.get(trace_id)
+            if record is not None:
+                self._runs[trace_id] = record.model_copy(update=fields)
+
+    def mark_running(self, trace_id: str) -> None:
+        self._update(trace_id, state=RunState.RUNNING, started_at=_now())
+
+    def mark_completed(self, trace_id: str, output: Optional[str]) -> None:
+        self._update(trace_id, state=RunState.COMPLETED, ended_at=_now(), output=output)
+
+    def mark_failed(self, trace_id: str, error: str) -> None:
+        self._update(trace_id, state=RunState.FAILED, ended_at=_now(), error=error)
+
+    def get(self, trace_id: str) -> Optional[RunRecord]:
+        with self._lock:
+            return self._runs.get(trace_id)
+
+
+def get_run_output_text(output: Any) -> Optional[str]:
+    """
+    Text of the output of a run: the raw output of a CrewAI crew output, or the output itself.
+    """
+    if output is None:
+        return None
+    return str(getattr(output, "raw", output))
+
+
+def track_run(registry: RunRegistry, trace_id: str, run: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """
+    Wrap a run (a coroutine factory) so that its state and output are kept in the registry.
+    """
+
+    async def tracked_run() -> Any:
+        registry.mark_running(trace_id)
+        try:
+            output = await run()
+        except Exception as e:
+            registry.mark_failed(trace_id, str(e))
+            raise
+        registry.mark_completed(trace_id, get_run_output_text(output))
+        return output
+
+    return tracked_run
+
+
+_run_registry: Optional[RunRegistry] = None
+_run_registry_lock = threading.Lock()
+
+
+def get_run_registry() -> RunRegistry:
+    """
+    Run registry of this process, sized from the environment on first use.
+    """
+    global _run_registry
+    with _run_registry_lock:
+        if _run_registry is None:
+            _run_registry = RunRegistry(int(os.getenv("AGENT_STUDIO_RUN_REGISTRY_SIZE", DEFAULT_RUN_REGISTRY_SIZE)))
+        return _run_registry
@@ -0,0 +1,117 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Cold start of a deployed workflow model.
+
+`StartupTimeline` records how long each phase of the model start (the cmlapi install,
+artifact extraction, tool virtual environments, ...) takes, so slow cold starts can be
+attributed to a phase.
+
+Every model start used to pip install the cmlapi tarball served by the workspace,
+although the installed package is kept between starts. The headers of the tarball
+(ETag, Last-Modified, Content-Length) are now recorded next to the install, and the
+install is skipped while the workspace serves the same tarball and cmlapi is present.
+"""
+
+import os
+import json
+import time
+import subprocess
+import threading
+import urllib.request
+from contextlib import contextmanager
+from importlib import metadata
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_CMLAPI_INSTALL_MARKER = os.path.join("~", ".agent_studio", "cmlapi_install.json")
+
+
+class StartupTimeline:
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            self.phases.append((name, round(duration_ms, 3)))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def get_summary(self) -> Dict:
+        with self._lock:
+            return {
+                "phases_ms": dict(self.phases),
+                "total_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            }
+
+    def print_summary(self) -> None:
+        summary = self.get_summary()
+        phases = ", ".join(f"{name} {duration_ms:.0f} ms" for name, duration_ms in summary["phases_ms"].items())
+        print(f"Startup timeline: {phases} (total {summary['total_ms']:.0f} ms)")
+
+
+def get_cmlapi_install_marker_path() -> str:
+    """
+    Where the tarball headers of the last cmlapi install are recorded. Can be overridden
+    with AGENT_STUDIO_CMLAPI_INSTALL_MARKER.
+    """
+    return os.path.expanduser(os.getenv("AGENT_STUDIO_CMLAPI_INSTALL_MARKER", DEFAULT_CMLAPI_INSTALL_MARKER))
+
+
+def get_cmlapi_tarball_fingerprint(url: str, timeout_seconds: float = 10.0) -> Optional[Dict[str, str]]:
+    """
+    Headers identifying the cmlapi tarball served at `url`, from a HEAD request, or None
+    if they can't be fetched.
+    """
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=timeout_seconds) as response:
+            headers = {name: response.headers.get(name) for name in ("ETag", "Last-Modified", "Content-Length")}
+    except Exception as e:
+        print(f"Could not check the cmlapi tarball at {url}: {e}")
+        return None
+    headers = {name: value for name, value in headers.items() if value}
+    return headers or None
+
+
+def _get_installed_cmlapi_version() -> Optional[str]:
+    try:
+        return metadata.version("cmlapi")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def is_cmlapi_install_current(url: str, fingerprint: Optional[Dict[str, str]]) -> bool:
+    if fingerprint is None or _get_installed_cmlapi_version() is None:
+        return False
+    try:
+        with open(get_cmlapi_install_marker_path(), "r") as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return marker.get("url") == url and marker.get("fingerprint") == fingerprint
+
+
+def install_cmlapi(url: str) -> bool:
+    """
+    Pip install the cmlapi tarball served at `url`, unless the same tarball is installed
+    already. Returns whether it was installed.
+    """
+    fingerprint = get_cmlapi_tarball_fingerprint(url)
+    if is_cmlapi_install_current(url, fingerprint):
+        print(f"cmlapi {_get_installed_cmlapi_version()} is current, skipping its install")
+        return False
+
+    returncode = subprocess.call(["pip", "install", url])
+    if returncode == 0 and fingerprint is not None:
+        marker_path = get_cmlapi_install_marker_path()
+        os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+        with open(marker_path, "w") as f:
+            json.dump({"url": url, "fingerprint": fingerprint, "version": _get_installed_cmlapi_version()}, f)
+    return True
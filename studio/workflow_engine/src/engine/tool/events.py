@@ -43,6 +43,8 @@ class ToolVenvCreationFinishedEvent(BaseModel):
     requirements_file: str = "requirements.txt"
     pip_output: str = ""
     pip_error: str = ""
+    install_skipped: bool = False
+    install_skip_rate: float = 0.0
 
 
 # New event for venv creation failed
@@ -92,6 +94,8 @@ TOOL_EVENT_PROCESSORS = {
         "requirements_file": x.requirements_file,
         "pip_output": x.pip_output,
         "pip_error": x.pip_error,
+        "install_skipped": x.install_skipped,
+        "install_skip_rate": x.install_skip_rate,
     },
     ToolVenvCreationFailedEvent: lambda x: {
         "tool_instance_id": x.tool_instance_id,
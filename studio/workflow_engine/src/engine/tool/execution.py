@@ -0,0 +1,614 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Execution of tool subprocesses, with a profile of every call.
+
+Tool calls (venv tools and the V1 tool proxy) run through `run_tool_subprocess`, which
+records the time to spawn the process, wall-clock time, CPU time and peak RSS of the
+child (from `wait4`), the size of its output and its exit status. Profiles are attached
+to the current OpenTelemetry span, to the next ToolUsageFinishedEvent of the tool, and
+aggregated per tool for the run summary event.
+
+Tool output is read incrementally and only a bounded head of it is kept in memory.
+Output beyond the limit is spilled, in full, to a file that the call's profile refers to.
+The limit defaults to AGENT_STUDIO_TOOL_MAX_OUTPUT_BYTES and can be set per tool with a
+module level `MAX_OUTPUT_BYTES = <bytes>` in the tool's source.
+
+Tool processes are also governed: each call has a wall-clock timeout, optional address
+space (RLIMIT_AS) and CPU time (RLIMIT_CPU) limits and nice level, and the number of
+tool processes running at once in this process is capped. Limits are applied to the tool
+process right after it is spawned (`prlimit`, `setpriority`), not with a `preexec_fn`,
+which can deadlock the child of a multi-threaded process like the engine. Limits default to the
+AGENT_STUDIO_TOOL_* environment variables below and can be set per tool with the
+module level constants `TIMEOUT_SECONDS`, `MAX_MEMORY_MB` and `MAX_CPU_SECONDS`.
+"""
+
+import os
+import time
+import signal
+import resource
+import uuid
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from opentelemetry import trace
+from pydantic import BaseModel
+
+from engine.crewai.trace_context import get_trace_id
+
+# Number of runs (trace IDs) whose per-tool summaries are kept until they are collected.
+MAX_TRACKED_RUNS = 64
+
+# Profiles of calls whose tool usage events weren't emitted (yet) are dropped beyond this.
+MAX_PENDING_PROFILES_PER_TOOL = 16
+
+DEFAULT_MAX_TOOL_OUTPUT_BYTES = 64 * 1024
+
+# Directory holding the full output of tool calls that exceeded their output limit.
+TOOL_OUTPUT_SPILL_DIR = os.path.join(tempfile.gettempdir(), "agent_studio_tool_outputs")
+
+# Spilled outputs older than this are removed. Can be overridden with
+# AGENT_STUDIO_TOOL_OUTPUT_RETENTION_SECONDS.
+DEFAULT_TOOL_OUTPUT_RETENTION_SECONDS = 24 * 60 * 60
+
+# Defaults of the resource limits of tool processes, overridden with
+# AGENT_STUDIO_TOOL_TIMEOUT_SECONDS, AGENT_STUDIO_TOOL_MAX_MEMORY_MB,
+# AGENT_STUDIO_TOOL_MAX_CPU_SECONDS and AGENT_STUDIO_TOOL_NICE. 0 means unlimited.
+DEFAULT_TOOL_TIMEOUT_SECONDS = 600
+DEFAULT_TOOL_MAX_MEMORY_MB = 0
+DEFAULT_TOOL_MAX_CPU_SECONDS = 0
+DEFAULT_TOOL_NICE = 0
+
+# Tool processes running at once, overridden with AGENT_STUDIO_MAX_CONCURRENT_TOOL_PROCESSES.
+DEFAULT_MAX_CONCURRENT_TOOL_PROCESSES = max(4, 2 * (os.cpu_count() or 1))
+
+
+class ToolResourceLimits(BaseModel):
+    """
+    Resource limits of a tool process. 0 means unlimited.
+    """
+
+    timeout_seconds: float = 0
+    max_memory_mb: int = 0
+    max_cpu_seconds: int = 0
+    nice: int = 0
+
+
+class ToolLimitError(BaseModel):
+    """
+    Structured error of a tool call that hit one of its resource limits.
+    """
+
+    error: str = "tool_limit_exceeded"
+    limit: str
+    """
+    "timeout", "memory" or "cpu".
+
+    A memory limit can't be told apart from other failures with certainty: a tool with a
+    memory limit is reported as hitting it when it fails with an allocation error on
+    stderr (Python's MemoryError, ENOMEM, std::bad_alloc) or is killed by SIGSEGV, SIGABRT
+    or SIGBUS, which is how native code usually dies when an allocation fails.
+    """
+    limit_value: float
+    message: str
+
+
+class ToolExecutionProfile(BaseModel):
+    """
+    Resource usage of a single tool call.
+    """
+
+    spawn_ms: float = 0.0
+    """
+    Time to fork and exec the tool process.
+    """
+
+    wall_ms: float = 0.0
+    """
+    Wall-clock time from spawning the process until it exited.
+    """
+
+    cpu_user_ms: float = 0.0
+    cpu_system_ms: float = 0.0
+
+    peak_rss_kb: int = 0
+    """
+    Peak resident set size of the tool process.
+    """
+
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    exit_status: Optional[int] = None
+
+    output_truncated: bool = False
+    """
+    Whether the output returned by the tool call was cut at the output limit.
+    """
+
+    stdout_spill_path: Optional[str] = None
+    stderr_spill_path: Optional[str] = None
+    """
+    Files holding the full stdout/stderr of the call, if it exceeded the output limit.
+    """
+
+    parse_ms: float = 0.0
+    """
+    Time spent parsing the tool output after the process exited.
+    """
+
+    queue_ms: float = 0.0
+    """
+    Time spent waiting for a free tool process slot.
+    """
+
+    limit_error: Optional[ToolLimitError] = None
+
+    cache_hit: bool = False
+    """
+    Whether the result of the call came from the tool result cache, without running the tool.
+    """
+
+
+class ToolProcessResult(subprocess.CompletedProcess):
+    """
+    `subprocess.CompletedProcess` of a tool call, with the profile of the call.
+    """
+
+    def __init__(self, args, returncode, stdout, stderr, profile: ToolExecutionProfile):
+        super().__init__(args, returncode, stdout, stderr)
+        self.profile = profile
+
+
+def get_max_tool_output_bytes(tool_max_output_bytes: Optional[int] = None) -> int:
+    """
+    Output limit of a tool: its own `MAX_OUTPUT_BYTES`, or the global default.
+    """
+    if tool_max_output_bytes:
+        return tool_max_output_bytes
+    return int(os.getenv("AGENT_STUDIO_TOOL_MAX_OUTPUT_BYTES", DEFAULT_MAX_TOOL_OUTPUT_BYTES))
+
+
+def _get_env_limit(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def get_tool_resource_limits(
+    timeout_seconds: Optional[int] = None,
+    max_memory_mb: Optional[int] = None,
+    max_cpu_seconds: Optional[int] = None,
+) -> ToolResourceLimits:
+    """
+    Resource limits of a tool: its own limits where set, or the global defaults.
+    """
+    return ToolResourceLimits(
+        timeout_seconds=timeout_seconds
+        or _get_env_limit("AGENT_STUDIO_TOOL_TIMEOUT_SECONDS", DEFAULT_TOOL_TIMEOUT_SECONDS),
+        max_memory_mb=max_memory_mb or _get_env_limit("AGENT_STUDIO_TOOL_MAX_MEMORY_MB", DEFAULT_TOOL_MAX_MEMORY_MB),
+        max_cpu_seconds=max_cpu_seconds
+        or _get_env_limit("AGENT_STUDIO_TOOL_MAX_CPU_SECONDS", DEFAULT_TOOL_MAX_CPU_SECONDS),
+        nice=_get_env_limit("AGENT_STUDIO_TOOL_NICE", DEFAULT_TOOL_NICE),
+    )
+
+
+_tool_process_slots: Optional[threading.BoundedSemaphore] = None
+_tool_process_slots_lock = threading.Lock()
+
+
+def _get_tool_process_slots() -> threading.BoundedSemaphore:
+    global _tool_process_slots
+    with _tool_process_slots_lock:
+        if _tool_process_slots is None:
+            _tool_process_slots = threading.BoundedSemaphore(
+                _get_env_limit("AGENT_STUDIO_MAX_CONCURRENT_TOOL_PROCESSES", DEFAULT_MAX_CONCURRENT_TOOL_PROCESSES)
+            )
+        return _tool_process_slots
+
+
+def _apply_resource_limits(pid: int, limits: ToolResourceLimits) -> None:
+    """
+    Apply the rlimits and nice level of a tool to its process, right after it was spawned.
+    """
+    try:
+        if limits.max_memory_mb:
+            memory_bytes = limits.max_memory_mb * 1024 * 1024
+            resource.prlimit(pid, resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        if limits.max_cpu_seconds:
+            # SIGXCPU at the soft limit, SIGKILL a second later if the tool ignores it.
+            resource.prlimit(pid, resource.RLIMIT_CPU, (limits.max_cpu_seconds, limits.max_cpu_seconds + 1))
+        if limits.nice:
+            os.setpriority(os.PRIO_PROCESS, pid, os.getpriority(os.PRIO_PROCESS, 0) + limits.nice)
+    except ProcessLookupError:
+        # The tool already exited.
+        pass
+
+
+# How tools usually fail when an allocation fails under RLIMIT_AS, see ToolLimitError.
+MEMORY_LIMIT_STDERR_MARKERS = ("MemoryError", "Cannot allocate memory", "out of memory", "std::bad_alloc")
+MEMORY_LIMIT_SIGNAL_RETURNCODES = (-signal.SIGSEGV, -signal.SIGABRT, -signal.SIGBUS)
+
+
+def _get_limit_error(
+    limits: ToolResourceLimits, timed_out: bool, returncode: int, cpu_seconds: float, stderr: str
+) -> Optional[ToolLimitError]:
+    if timed_out:
+        return ToolLimitError(
+            limit="timeout",
+            limit_value=limits.timeout_seconds,
+            message=f"Tool call was stopped after its timeout of {limits.timeout_seconds} seconds.",
+        )
+    if limits.max_cpu_seconds and (
+        returncode == -signal.SIGXCPU or (returncode == -signal.SIGKILL and cpu_seconds >= limits.max_cpu_seconds)
+    ):
+        return ToolLimitError(
+            limit="cpu",
+            limit_value=limits.max_cpu_seconds,
+            message=f"Tool call was stopped after using its CPU time limit of {limits.max_cpu_seconds} seconds.",
+        )
+    if limits.max_memory_mb and (
+        returncode in MEMORY_LIMIT_SIGNAL_RETURNCODES
+        or (returncode != 0 and any(marker in stderr for marker in MEMORY_LIMIT_STDERR_MARKERS))
+    ):
+        return ToolLimitError(
+            limit="memory",
+            limit_value=limits.max_memory_mb,
+            message=f"Tool call ran out of memory with its limit of {limits.max_memory_mb} MB.",
+        )
+    return None
+
+
+_last_spill_prune = 0.0
+_spill_prune_lock = threading.Lock()
+
+
+def _prune_spilled_outputs() -> None:
+    global _last_spill_prune
+    with _spill_prune_lock:
+        now = time.time()
+        if now - _last_spill_prune < 600:
+            return
+        _last_spill_prune = now
+    retention = int(os.getenv("AGENT_STUDIO_TOOL_OUTPUT_RETENTION_SECONDS", DEFAULT_TOOL_OUTPUT_RETENTION_SECONDS))
+    for entry in os.scandir(TOOL_OUTPUT_SPILL_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < now - retention:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class _OutputCollector:
+    """
+    Collects one output stream of a tool process, keeping at most `max_bytes` of it
+    in memory: the head of the stream and, if `output_key` is given, the head of what
+    follows the first occurrence of the key. Once the stream exceeds `max_bytes`, all
+    of it goes to a spill file.
+    """
+
+    def __init__(self, max_bytes: int, spill_name: str, output_key: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.spill_name = spill_name
+        self.key = output_key.encode("utf-8") if output_key else None
+        self.total_bytes = 0
+        self.head = bytearray()
+        self.result_head: Optional[bytearray] = None
+        self.result_start: Optional[int] = None
+        self.spill_path: Optional[str] = None
+        self._spill_file = None
+        self._key_window = b""
+
+    def feed(self, chunk: bytes) -> None:
+        if self._spill_file is None and self.total_bytes + len(chunk) > self.max_bytes:
+            os.makedirs(TOOL_OUTPUT_SPILL_DIR, exist_ok=True)
+            _prune_spilled_outputs()
+            self.spill_path = os.path.join(TOOL_OUTPUT_SPILL_DIR, f"{self.spill_name}_{uuid.uuid4().hex}")
+            self._spill_file = open(self.spill_path, "wb")
+            self._spill_file.write(self.head)
+        if self._spill_file is not None:
+            self._spill_file.write(chunk)
+
+        if len(self.head) < self.max_bytes:
+            self.head += chunk[: self.max_bytes - len(self.head)]
+
+        if self.result_head is not None:
+            if len(self.result_head) < self.max_bytes:
+                self.result_head += chunk[: self.max_bytes - len(self.result_head)]
+        elif self.key:
+            data = self._key_window + chunk
+            index = data.find(self.key)
+            if index >= 0:
+                self.result_start = self.total_bytes - len(self._key_window) + index + len(self.key)
+                self.result_head = bytearray(data[index + len(self.key) :][: self.max_bytes])
+            else:
+                self._key_window = data[len(data) - (len(self.key) - 1) :] if len(self.key) > 1 else b""
+        self.total_bytes += len(chunk)
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+    @property
+    def truncated(self) -> bool:
+        """
+        Whether the text returned by `get_text` is incomplete.
+        """
+        if self.result_start is not None:
+            return self.total_bytes - self.result_start > self.max_bytes
+        return self.total_bytes > self.max_bytes
+
+    def get_text(self) -> str:
+        """
+        The collected output. For a stream that exceeded the limit this is the head of
+        the result following the output key (with the key in front of it), or otherwise
+        the head of the stream.
+        """
+        if self.total_bytes > self.max_bytes and self.result_head is not None:
+            return (self.key + self.result_head).decode("utf-8", errors="replace")
+        return bytes(self.head).decode("utf-8", errors="replace")
+
+
+def _read_pipe(pipe, collector: _OutputCollector) -> None:
+    try:
+        for chunk in iter(lambda: pipe.read(65536), b""):
+            collector.feed(chunk)
+    finally:
+        collector.close()
+        pipe.close()
+
+
+def run_tool_subprocess(
+    cmd: List[str],
+    input: Optional[str] = None,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    max_output_bytes: Optional[int] = None,
+    output_key: Optional[str] = None,
+    spill_name: str = "tool",
+    limits: Optional[ToolResourceLimits] = None,
+) -> ToolProcessResult:
+    """
+    Run a tool process to completion, capturing its (text) output, like
+    `subprocess.run(cmd, capture_output=True, text=True, check=False)`.
+    At most `max_output_bytes` of each output stream are returned, see `_OutputCollector`.
+    If the process hits one of its `limits`, the profile of the result has a `limit_error`.
+    """
+    max_output_bytes = max_output_bytes or get_max_tool_output_bytes()
+    limits = limits or get_tool_resource_limits()
+    slots = _get_tool_process_slots()
+    queue_start = time.perf_counter()
+    slots.acquire()
+    try:
+        return _run_tool_process(
+            cmd, input, cwd, env, max_output_bytes, output_key, spill_name, limits, time.perf_counter() - queue_start
+        )
+    finally:
+        slots.release()
+
+
+def _run_tool_process(
+    cmd: List[str],
+    input: Optional[str],
+    cwd: Optional[str],
+    env: Optional[Dict[str, str]],
+    max_output_bytes: int,
+    output_key: Optional[str],
+    spill_name: str,
+    limits: ToolResourceLimits,
+    queue_seconds: float,
+) -> ToolProcessResult:
+    start = time.perf_counter()
+    # The tool gets its own process group, so that a timeout also stops processes it started.
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+        start_new_session=True,
+    )
+    _apply_resource_limits(process.pid, limits)
+    spawn_ms = (time.perf_counter() - start) * 1000
+
+    timed_out = threading.Event()
+
+    def stop():
+        timed_out.set()
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+    timer = threading.Timer(limits.timeout_seconds, stop) if limits.timeout_seconds else None
+    if timer is not None:
+        timer.daemon = True
+        timer.start()
+
+    stdout = _OutputCollector(max_output_bytes, f"{spill_name}.stdout", output_key)
+    stderr = _OutputCollector(max_output_bytes, f"{spill_name}.stderr")
+    readers = [
+        threading.Thread(target=_read_pipe, args=(process.stdout, stdout), daemon=True),
+        threading.Thread(target=_read_pipe, args=(process.stderr, stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    if input is not None:
+        try:
+            process.stdin.write(input.encode("utf-8"))
+        except BrokenPipeError:
+            pass
+        finally:
+            process.stdin.close()
+    try:
+        for reader in readers:
+            reader.join()
+
+        # Reap the process ourselves to get the resource usage of exactly this child.
+        _, status, rusage = os.wait4(process.pid, 0)
+    finally:
+        if timer is not None:
+            timer.cancel()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall_ms = (time.perf_counter() - start) * 1000
+    stderr_text = stderr.get_text()
+
+    profile = ToolExecutionProfile(
+        spawn_ms=round(spawn_ms, 3),
+        wall_ms=round(wall_ms, 3),
+        cpu_user_ms=round(rusage.ru_utime * 1000, 3),
+        cpu_system_ms=round(rusage.ru_stime * 1000, 3),
+        peak_rss_kb=rusage.ru_maxrss,
+        stdout_bytes=stdout.total_bytes,
+        stderr_bytes=stderr.total_bytes,
+        exit_status=process.returncode,
+        output_truncated=stdout.truncated,
+        stdout_spill_path=stdout.spill_path,
+        stderr_spill_path=stderr.spill_path,
+        queue_ms=round(queue_seconds * 1000, 3),
+        limit_error=_get_limit_error(
+            limits, timed_out.is_set(), process.returncode, rusage.ru_utime + rusage.ru_stime, stderr_text
+        ),
+    )
+    return ToolProcessResult(cmd, process.returncode, stdout.get_text(), stderr_text, profile)
+
+
+def get_truncation_notice(profile: ToolExecutionProfile, returned_bytes: int) -> str:
+    """
+    Note appended to a truncated tool output, telling the agent what it is missing.
+    """
+    return (
+        f"\n\n[Tool output truncated: showing the first {returned_bytes} bytes of a {profile.stdout_bytes} "
+        f"byte output. The full output was saved to {profile.stdout_spill_path}]"
+    )
+
+
+# (trace ID, tool instance ID) -> profiles of calls not yet attached to a tool usage event
+_pending_profiles: Dict[Tuple[str, str], Deque[ToolExecutionProfile]] = {}
+# trace ID -> tool instance ID -> summary of all calls of the tool in the run
+_run_summaries: "OrderedDict[str, Dict[str, Dict]]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _set_span_attributes(tool_instance_id: Optional[str], tool_name: str, profile: ToolExecutionProfile) -> None:
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return
+    attributes = {
+        f"agent_studio.tool.{key}": value
+        for key, value in profile.model_dump(exclude={"limit_error"}).items()
+        if value is not None
+    }
+    attributes["agent_studio.tool.name"] = tool_name
+    if profile.limit_error is not None:
+        attributes["agent_studio.tool.limit_exceeded"] = profile.limit_error.limit
+    if tool_instance_id:
+        attributes["agent_studio.tool.instance_id"] = tool_instance_id
+    span.set_attributes(attributes)
+
+
+def _get_summary(trace_id: str, tool_instance_id: str, tool_name: str) -> Dict:
+    # Called with the profiles lock held.
+    run_summary = _run_summaries.setdefault(trace_id, {})
+    _run_summaries.move_to_end(trace_id)
+    while len(_run_summaries) > MAX_TRACKED_RUNS:
+        stale_trace_id, _ = _run_summaries.popitem(last=False)
+        for key in [key for key in _pending_profiles if key[0] == stale_trace_id]:
+            del _pending_profiles[key]
+
+    return run_summary.setdefault(
+        tool_instance_id,
+        {
+            "tool_name": tool_name,
+            "calls": 0,
+            "failed_calls": 0,
+            "total_wall_ms": 0.0,
+            "max_wall_ms": 0.0,
+            "total_spawn_ms": 0.0,
+            "total_cpu_ms": 0.0,
+            "max_peak_rss_kb": 0,
+            "total_stdout_bytes": 0,
+            "truncated_calls": 0,
+            "limit_exceeded_calls": 0,
+            "total_queue_ms": 0.0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        },
+    )
+
+
+def record_tool_execution(tool_instance_id: Optional[str], tool_name: str, profile: ToolExecutionProfile) -> None:
+    """
+    Record the profile of a tool call made by the workflow run of the current context.
+    """
+    try:
+        _set_span_attributes(tool_instance_id, tool_name, profile)
+    except Exception as e:
+        print(f"Failed to add tool profile to span: {e}")
+    if not tool_instance_id:
+        return
+
+    trace_id = get_trace_id()
+    with _profiles_lock:
+        pending = _pending_profiles.setdefault(
+            (trace_id, tool_instance_id), deque(maxlen=MAX_PENDING_PROFILES_PER_TOOL)
+        )
+        pending.append(profile)
+
+        summary = _get_summary(trace_id, tool_instance_id, tool_name)
+        if profile.cache_hit:
+            summary["cache_hits"] += 1
+            return
+        summary["calls"] += 1
+        summary["failed_calls"] += int(profile.exit_status != 0)
+        summary["total_wall_ms"] += profile.wall_ms
+        summary["max_wall_ms"] = max(summary["max_wall_ms"], profile.wall_ms)
+        summary["total_spawn_ms"] += profile.spawn_ms
+        summary["total_cpu_ms"] += profile.cpu_user_ms + profile.cpu_system_ms
+        summary["max_peak_rss_kb"] = max(summary["max_peak_rss_kb"], profile.peak_rss_kb)
+        summary["total_stdout_bytes"] += profile.stdout_bytes
+        summary["truncated_calls"] += int(profile.output_truncated)
+        summary["limit_exceeded_calls"] += int(profile.limit_error is not None)
+        summary["total_queue_ms"] += profile.queue_ms
+
+
+def record_tool_cache_miss(tool_instance_id: Optional[str], tool_name: str) -> None:
+    """
+    Record that a call of a cached tool in the current run wasn't found in the result cache.
+    """
+    if not tool_instance_id:
+        return
+    with _profiles_lock:
+        _get_summary(get_trace_id(), tool_instance_id, tool_name)["cache_misses"] += 1
+
+
+def pop_tool_execution_profile(tool_instance_id: Optional[str]) -> Optional[Dict]:
+    """
+    Profile of the oldest call of a tool in the current run that wasn't reported yet.
+    """
+    if not tool_instance_id:
+        return None
+    with _profiles_lock:
+        pending = _pending_profiles.get((get_trace_id(), tool_instance_id))
+        if not pending:
+            return None
+        return pending.popleft().model_dump()
+
+
+def pop_tool_usage_summary(trace_id: str) -> Dict[str, Dict]:
+    """
+    Per-tool summary of all tool calls of a run, keyed by tool instance ID.
+    Forgets the run afterwards.
+    """
+    with _profiles_lock:
+        run_summary = _run_summaries.pop(trace_id, {})
+        for key in [key for key in _pending_profiles if key[0] == trace_id]:
+            del _pending_profiles[key]
+    for summary in run_summary.values():
+        summary["mean_wall_ms"] = round(summary["total_wall_ms"] / summary["calls"], 3) if summary["calls"] else 0.0
+        cache_lookups = summary["cache_hits"] + summary["cache_misses"]
+        summary["cache_hit_rate"] = round(summary["cache_hits"] / cache_lookups, 3) if cache_lookups else None
+        for key in ("total_wall_ms", "max_wall_ms", "total_spawn_ms", "total_cpu_ms", "total_queue_ms"):
+            summary[key] = round(summary[key], 3)
+    return run_summary
@@ -0,0 +1,145 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Persistent cache of MCP server tool definitions.
+
+Listing the tools of an MCP server means starting the server (`uvx`/`npx`, often with a
+package download) just to call `list_tools`. The studio does this when MCP templates
+and instances are added or updated, and every deployed workflow model does it on start.
+Definitions are cached on disk keyed by the server spec: command, args, the names of
+the environment variables it takes and the package version (as pinned in the args, or
+"latest"). Cached definitions are returned right away. Entries older than
+AGENT_STUDIO_MCP_DEFINITIONS_TTL_SECONDS are refreshed in the background.
+
+The studio and the engine share the cache directory, and deployment artifacts ship the
+entries of their workflow's MCP servers (see MCP_DEFINITIONS_ARTIFACT_DIRECTORY).
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from engine.consts import MCP_DEFINITIONS_CACHE_LOCATION
+
+DEFAULT_MCP_DEFINITIONS_TTL_SECONDS = 24 * 60 * 60
+
+_refreshing: Set[Tuple[str, str]] = set()
+_refreshing_lock = threading.Lock()
+
+
+def get_mcp_definitions_cache_dir() -> str:
+    """
+    Root directory of the definitions cache. Can be overridden with AGENT_STUDIO_MCP_DEFINITIONS_CACHE.
+    """
+    return os.path.abspath(os.getenv("AGENT_STUDIO_MCP_DEFINITIONS_CACHE", MCP_DEFINITIONS_CACHE_LOCATION))
+
+
+def get_mcp_package_version(args: List[str]) -> str:
+    """
+    Version of the MCP server package as pinned in the `uvx`/`npx` args
+    (`pkg==1.2.0`, `pkg@1.2.0`, `@scope/pkg@1.2.0`), or "latest".
+    """
+    package = next((arg for arg in args if not arg.startswith("-")), None)
+    if package is None:
+        return "latest"
+    if "==" in package:
+        return package.split("==", 1)[1]
+    name_start = 1 if package.startswith("@") else 0
+    if "@" in package[name_start:]:
+        return package[name_start:].split("@", 1)[1]
+    return "latest"
+
+
+def get_mcp_server_spec_key(command: str, args: List[str], env_names: List[str]) -> str:
+    spec = [command, list(args), sorted(env_names), get_mcp_package_version(args)]
+    return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()
+
+
+def _get_entry_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def read_mcp_tool_definitions(key: str, cache_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Cached entry of a server spec, `{"tools": [...], "fetched_at": <epoch seconds>}`, if any.
+    """
+    try:
+        with open(_get_entry_path(cache_dir or get_mcp_definitions_cache_dir(), key), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_mcp_tool_definitions(key: str, tools: List[Dict], cache_dir: Optional[str] = None) -> None:
+    cache_dir = cache_dir or get_mcp_definitions_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(mode="w", dir=cache_dir, suffix=".tmp", delete=False) as tmp_file:
+        json.dump({"tools": tools, "fetched_at": time.time()}, tmp_file)
+    os.replace(tmp_file.name, _get_entry_path(cache_dir, key))
+
+
+def copy_mcp_tool_definitions(keys: List[str], target_dir: str) -> List[str]:
+    """
+    Copy the cached entries of the given server specs to another cache directory (of a
+    deployment artifact). Returns the keys that were cached.
+    """
+    copied = []
+    for key in keys:
+        entry = read_mcp_tool_definitions(key)
+        if entry is None:
+            continue
+        os.makedirs(target_dir, exist_ok=True)
+        with open(_get_entry_path(target_dir, key), "w") as f:
+            json.dump(entry, f)
+        copied.append(key)
+    return copied
+
+
+def _refresh(
+    key: str,
+    cache_dir: str,
+    fetch: Callable[[], List[Dict]],
+    on_refresh: Optional[Callable[[List[Dict]], None]],
+) -> None:
+    try:
+        tools = fetch()
+        write_mcp_tool_definitions(key, tools, cache_dir)
+        if on_refresh is not None:
+            on_refresh(tools)
+    except Exception as e:
+        print(f"Error refreshing MCP tool definitions: {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard((cache_dir, key))
+
+
+def get_mcp_tool_definitions_cached(
+    key: str,
+    fetch: Callable[[], List[Dict]],
+    cache_dir: Optional[str] = None,
+    on_refresh: Optional[Callable[[List[Dict]], None]] = None,
+) -> List[Dict]:
+    """
+    Tool definitions of an MCP server spec. Fetched with `fetch()` (which starts the
+    server) only if the spec isn't cached; stale entries are returned and refreshed in a
+    background thread, which calls `on_refresh` with the new definitions.
+    """
+    cache_dir = cache_dir or get_mcp_definitions_cache_dir()
+    entry = read_mcp_tool_definitions(key, cache_dir)
+    if entry is None:
+        tools = fetch()
+        write_mcp_tool_definitions(key, tools, cache_dir)
+        return tools
+
+    ttl = float(os.getenv("AGENT_STUDIO_MCP_DEFINITIONS_TTL_SECONDS", DEFAULT_MCP_DEFINITIONS_TTL_SECONDS))
+    if time.time() - entry["fetched_at"] > ttl:
+        with _refreshing_lock:
+            start_refresh = (cache_dir, key) not in _refreshing
+            _refreshing.add((cache_dir, key))
+        if start_refresh:
+            threading.Thread(target=_refresh, args=(key, cache_dir, fetch, on_refresh), daemon=True).start()
+    return entry["tools"]
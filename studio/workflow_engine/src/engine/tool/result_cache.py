@@ -0,0 +1,221 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Cross-run cache of tool results.
+
+CrewAI's own cache (`crew_ai_cache`) only lives as long as one Crew object, so every
+test run and every kickoff of a deployed workflow calls its tools again. Tools that opt
+in with a module level `CACHE_TTL_SECONDS = <seconds>` have their successful results
+cached across runs, keyed by the tool instance, the hash of the tool's code, its user
+parameters and the tool arguments of the call.
+
+The backend is selected with AGENT_STUDIO_TOOL_RESULT_CACHE: "memory" (the default,
+shared by the runs of this process), "disk" (shared by all processes using the same
+AGENT_STUDIO_TOOL_RESULT_CACHE_DIR) or "off". Both backends evict the least recently
+used entries beyond AGENT_STUDIO_TOOL_RESULT_CACHE_SIZE entries.
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from engine.consts import TOOL_RESULT_CACHE_LOCATION
+from engine.tool.execution import ToolExecutionProfile, record_tool_cache_miss, record_tool_execution
+
+DEFAULT_TOOL_RESULT_CACHE_SIZE = 1024
+
+
+def get_tool_result_cache_key(
+    tool_instance_id: Optional[str], source_hash: str, user_params: Dict[str, Any], tool_args: Dict[str, Any]
+) -> str:
+    key = json.dumps([tool_instance_id, source_hash, user_params, tool_args], sort_keys=True, default=str)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class MemoryToolResultCache:
+    """
+    Tool results kept in the memory of this process.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TOOL_RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskToolResultCache:
+    """
+    Tool results kept as one JSON file per entry. The mtime of an entry is its last use,
+    which is what eviction goes by.
+
+    Writes don't scan the cache directory. The number of entries is counted once and then
+    kept up to date in memory. When it goes over `max_entries`, one scan evicts down to
+    90% of it, which also recounts the entries written by other processes.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_TOOL_RESULT_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entry_count: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        path = self._get_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+        if entry["expires_at"] <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            else:
+                with self._lock:
+                    if self._entry_count:
+                        self._entry_count -= 1
+            return False, None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True, entry["value"]
+
+    def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._get_path(key)
+        is_new = not os.path.exists(path)
+        with tempfile.NamedTemporaryFile(mode="w", dir=self.cache_dir, suffix=".tmp", delete=False) as tmp_file:
+            json.dump({"expires_at": time.time() + ttl_seconds, "value": value}, tmp_file)
+        os.replace(tmp_file.name, path)
+        with self._lock:
+            if self._entry_count is None:
+                self._entry_count = sum(1 for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json"))
+            elif is_new:
+                self._entry_count += 1
+            if self._entry_count > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Called with the lock held.
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        entries.sort()
+        target = self.max_entries - self.max_entries // 10
+        evicted = entries[: max(0, len(entries) - target)]
+        for _, path in evicted:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._entry_count = len(entries) - len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry_count = None
+        if not os.path.isdir(self.cache_dir):
+            return
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
+
+
+_tool_result_cache = None
+_tool_result_cache_lock = threading.Lock()
+
+
+def get_tool_result_cache():
+    """
+    The configured tool result cache backend, or None if caching is turned off.
+    """
+    global _tool_result_cache
+    with _tool_result_cache_lock:
+        if _tool_result_cache is None:
+            backend = os.getenv("AGENT_STUDIO_TOOL_RESULT_CACHE", "memory").lower()
+            max_entries = int(os.getenv("AGENT_STUDIO_TOOL_RESULT_CACHE_SIZE", DEFAULT_TOOL_RESULT_CACHE_SIZE))
+            if backend == "off":
+                return None
+            elif backend == "disk":
+                cache_dir = os.path.abspath(os.getenv("AGENT_STUDIO_TOOL_RESULT_CACHE_DIR", TOOL_RESULT_CACHE_LOCATION))
+                _tool_result_cache = DiskToolResultCache(cache_dir, max_entries)
+            elif backend == "memory":
+                _tool_result_cache = MemoryToolResultCache(max_entries)
+            else:
+                raise ValueError(f"Unknown tool result cache backend: {backend}")
+        return _tool_result_cache
+
+
+def call_with_tool_result_cache(
+    ttl_seconds: Optional[int],
+    tool_instance_id: Optional[str],
+    tool_name: str,
+    source_hash: str,
+    user_params: Dict[str, Any],
+    tool_args: Dict[str, Any],
+    call: Callable[[], Tuple[Any, bool]],
+) -> Any:
+    """
+    Result of a tool call, from the cache if the tool opted in and the same call was made
+    within its TTL. `call` runs the tool and returns its result and whether the result may
+    be cached (only successful results should be).
+    """
+    cache = get_tool_result_cache() if ttl_seconds else None
+    if cache is None:
+        return call()[0]
+
+    lookup_start = time.perf_counter()
+    key = get_tool_result_cache_key(tool_instance_id, source_hash, user_params, tool_args)
+    try:
+        hit, value = cache.get(key)
+    except Exception as e:
+        print(f"Failed to read tool result cache: {e}")
+        hit, value = False, None
+    if hit:
+        lookup_ms = round((time.perf_counter() - lookup_start) * 1000, 3)
+        record_tool_execution(tool_instance_id, tool_name, ToolExecutionProfile(wall_ms=lookup_ms, cache_hit=True))
+        return value
+
+    record_tool_cache_miss(tool_instance_id, tool_name)
+    value, cacheable = call()
+    if cacheable:
+        try:
+            cache.put(key, value, ttl_seconds)
+        except Exception as e:
+            print(f"Failed to write tool result cache: {e}")
+    return value
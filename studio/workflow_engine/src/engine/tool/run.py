@@ -15,7 +15,10 @@ from engine.ops import get_ops_endpoint
 import requests
 import shutil
 import traceback
-from engine.crewai.tools import create_virtual_env, get_venv_tool_output_key
+from engine.crewai.tools import create_virtual_env, get_venv_tool_output_key, prepare_virtual_env_for_tool
+import engine.tool.venv_store as venv_store
+import engine.tool.wheelhouse as wheelhouse
+from engine.tool.source_metadata import get_tool_source_metadata
 import ast
 
 # Utility to post tool events
@@ -68,23 +71,61 @@ def ensure_venv_and_requirements(
                 requirements_file=requirements_file,
             ),
         )
+    requirements_path = os.path.join(tool_dir, requirements_file)
+
+    # Tools whose requirements can be shared link into the venv store, which only installs
+    # requirements when the install fingerprint of the shared environment changed.
+    if os.path.exists(requirements_path) and venv_store.is_shareable_requirements(requirements_path):
+        try:
+            installed = prepare_virtual_env_for_tool(tool_dir, requirements_file)
+        except Exception as e:
+            if trace_id and tool_instance_id:
+                post_tool_event(
+                    trace_id,
+                    ToolVenvCreationFailedEvent(
+                        timestamp=datetime.utcnow(),
+                        tool_instance_id=tool_instance_id,
+                        tool_dir=tool_dir,
+                        requirements_file=requirements_file,
+                        error=str(e),
+                        pip_output="",
+                        pip_error="",
+                    ),
+                )
+            raise
+        if trace_id and tool_instance_id and not silent:
+            post_tool_event(
+                trace_id,
+                ToolVenvCreationFinishedEvent(
+                    timestamp=datetime.utcnow(),
+                    tool_instance_id=tool_instance_id,
+                    tool_dir=tool_dir,
+                    requirements_file=requirements_file,
+                    pip_output="",
+                    pip_error="",
+                    install_skipped=not installed,
+                    install_skip_rate=venv_store.get_install_stats()["skip_rate"],
+                ),
+            )
+        return
+
     # Create virtual environment if it doesn't exist (using the same logic as crewai/tools.py)
+    if os.path.islink(venv_dir):
+        os.unlink(venv_dir)
     create_virtual_env(tool_dir, "uv")
 
-    requirements_path = os.path.join(tool_dir, requirements_file)
+    # Requirements that reference other files or local paths are always installed, the
+    # install fingerprint only covers the lines of the requirements file itself.
+    venv_store.record_install_fingerprint(venv_dir, None)
+
     pip_output = ""
     pip_error = ""
     pip_install_command = [uv_bin, "pip", "install", "-r", requirements_path]
 
-    # Honor PyPI mirror if provided
-    default_index = os.environ.get("UV_DEFAULT_INDEX")
-    insecure_host = os.environ.get("UV_INSECURE_HOST")
-    print(f"default_index: {default_index}")
-    print(f"insecure_host: {insecure_host}")
-    if default_index:
-        pip_install_command.extend(["--index-url", default_index])
-    if insecure_host:
-        pip_install_command.extend(["--trusted-host", insecure_host])
+    # PyPI mirror settings (UV_DEFAULT_INDEX, UV_INSECURE_HOST) and the local
+    # wheelhouse are applied by the wheelhouse install commands.
+    print(f"default_index: {os.environ.get('UV_DEFAULT_INDEX')}")
+    print(f"insecure_host: {os.environ.get('UV_INSECURE_HOST')}")
     https_proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("https_proxy")
     http_proxy = os.environ.get("HTTP_PROXY") or os.environ.get("http_proxy")
     print(f"https_proxy: {https_proxy}")
@@ -99,14 +140,11 @@ def ensure_venv_and_requirements(
             if http_proxy:
                 subprocess_env["HTTP_PROXY"] = http_proxy
                 subprocess_env["http_proxy"] = http_proxy
-            proc = subprocess.run(
-                pip_install_command,
-                capture_output=True,
-                text=True,
-                env=subprocess_env,
-            )
+            proc = wheelhouse.run_install_commands(pip_install_command, subprocess_env)
             pip_output = proc.stdout
             pip_error = proc.stderr
+            if proc.returncode == 0:
+                venv_store.record_install_outcome(skipped=False)
             # Always post finished event
             if trace_id and tool_instance_id and not silent:
                 post_tool_event(
@@ -118,6 +156,7 @@ def ensure_venv_and_requirements(
                         requirements_file=requirements_file,
                         pip_output=pip_output,
                         pip_error=pip_error,
+                        install_skip_rate=venv_store.get_install_stats()["skip_rate"],
                     ),
                 )
             if proc.returncode != 0:
@@ -337,9 +376,7 @@ def run_tool_test(tool_instance_id, tool_dir, user_params, tool_params, trace_id
         error = proc.stderr.strip()
         if proc.returncode == 0:
             try:
-                with open(tool_py, "r") as f:
-                    tool_code = f.read()
-                output_key = get_venv_tool_output_key(tool_code)
+                output_key = get_venv_tool_output_key(get_tool_source_metadata(tool_py).source)
 
                 if output_key and output_key in output:
                     output = output.split(output_key, 1)[-1].strip()
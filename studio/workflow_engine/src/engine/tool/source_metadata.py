@@ -0,0 +1,310 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Cache of metadata parsed from tool source code.
+
+Listing tool instances, testing tools and building crews all need the same facts about
+a tool's entrypoint module (user and tool parameters, docstring, tool class, output key,
+the ToolParameters model). Each source is parsed once: metadata is cached by the hash of
+the source code, and tool files are additionally looked up by path, so that an unchanged
+file (same mtime and size) is not even read again.
+"""
+
+import ast
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+# Maximum number of distinct tool sources kept in the cache.
+TOOL_SOURCE_METADATA_CACHE_SIZE = 512
+# Maximum number of tool file paths whose source hash is remembered. Tool directories
+# are created per tool instance and cloned, so paths keep coming in a long running studio.
+TOOL_SOURCE_PATH_CACHE_SIZE = 2048
+
+
+class ToolSourceMetadata(BaseModel):
+    """
+    Everything Agent Studio reads from the source code of a tool's entrypoint module.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    source: str
+    source_hash: str
+
+    syntax_error: Optional[SyntaxError] = None
+    """
+    Set if the source could not be parsed, in which case no other metadata is available.
+    """
+
+    docstring: Optional[str] = None
+    class_names: List[str] = []
+
+    tool_class_name: Optional[str] = None
+    """
+    Name of the StudioBaseTool subclass of a V1 tool.
+    """
+
+    is_venv_tool: bool = False
+    """
+    Whether ToolParameters is defined at the root of the module (V2 "venv" tool).
+    """
+
+    user_params: Dict[str, Dict[str, bool]] = {}
+    tool_params: Dict[str, Dict[str, bool]] = {}
+    output_key: Optional[str] = None
+
+    max_output_bytes: Optional[int] = None
+    timeout_seconds: Optional[int] = None
+    max_memory_mb: Optional[int] = None
+    max_cpu_seconds: Optional[int] = None
+    """
+    Execution limits of the tool, from module level constants (`MAX_OUTPUT_BYTES = <int>`,
+    `TIMEOUT_SECONDS`, `MAX_MEMORY_MB`, `MAX_CPU_SECONDS`).
+    """
+
+    cache_ttl_seconds: Optional[int] = None
+    """
+    How long results of the tool are cached, from a module level `CACHE_TTL_SECONDS = <int>`.
+    Only tools that set it are cached.
+    """
+
+    _derived: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _derived_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def get_derived(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Value derived from this source, built once with `build()` and kept with the metadata.
+        Failed builds are not cached.
+        """
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build()
+            return self._derived[name]
+
+    def get_tool_parameters_type(self) -> Type[BaseModel]:
+        """
+        The compiled ToolParameters model of the tool.
+        """
+        if self.syntax_error is not None:
+            raise self.syntax_error
+        return self.get_derived("tool_parameters_type", lambda: _compile_tool_parameters_type(self.source))
+
+
+def _get_params_from_class(class_node: Optional[ast.ClassDef]) -> Dict[str, Dict[str, bool]]:
+    if class_node is None:
+        return {}
+    params: Dict[str, Dict[str, bool]] = {}
+    for field in class_node.body:
+        if isinstance(field, ast.AnnAssign) and isinstance(field.target, ast.Name):
+            # Check if type is Optional by looking for Optional[] syntax
+            is_optional = (
+                isinstance(field.annotation, ast.Subscript)
+                and isinstance(field.annotation.value, ast.Name)
+                and field.annotation.value.id == "Optional"
+            )
+            # Parameter is required if it's not Optional and has no default
+            params[field.target.id] = {"required": not (is_optional or field.value is not None)}
+    return params
+
+
+# Module level constants that configure the execution of a tool, and their metadata fields.
+_EXECUTION_CONSTANTS = {
+    "MAX_OUTPUT_BYTES": "max_output_bytes",
+    "TIMEOUT_SECONDS": "timeout_seconds",
+    "MAX_MEMORY_MB": "max_memory_mb",
+    "MAX_CPU_SECONDS": "max_cpu_seconds",
+    "CACHE_TTL_SECONDS": "cache_ttl_seconds",
+}
+
+
+def _get_execution_constants(tree: ast.Module) -> Dict[str, int]:
+    constants: Dict[str, int] = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Constant)
+            and type(node.value.value) is int
+            and node.value.value > 0
+        ):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id in _EXECUTION_CONSTANTS:
+                    constants[_EXECUTION_CONSTANTS[target.id]] = node.value.value
+    return constants
+
+
+def _find_class(tree: ast.AST, name: str) -> Optional[ast.ClassDef]:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name == name:
+            return node
+    return None
+
+
+def parse_tool_source(source: str, source_hash: Optional[str] = None) -> ToolSourceMetadata:
+    """
+    Parse tool source code into its metadata, without caching.
+    """
+    source_hash = source_hash or hashlib.sha256(source.encode("utf-8")).hexdigest()
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        return ToolSourceMetadata(source=source, source_hash=source_hash, syntax_error=e)
+
+    class_names: List[str] = []
+    tool_class_name: Optional[str] = None
+    output_key: Optional[str] = None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            class_names.append(node.name)
+            if any(isinstance(base, ast.Name) and base.id == "StudioBaseTool" for base in node.bases):
+                tool_class_name = node.name
+        elif isinstance(node, ast.Assign) and output_key is None:
+            for target in node.targets:
+                if (
+                    isinstance(target, ast.Name)
+                    and target.id == "OUTPUT_KEY"
+                    and isinstance(node.value, ast.Constant)
+                    and isinstance(node.value.value, str)
+                ):
+                    output_key = node.value.value
+                    break
+
+    return ToolSourceMetadata(
+        source=source,
+        source_hash=source_hash,
+        docstring=ast.get_docstring(tree),
+        class_names=class_names,
+        tool_class_name=tool_class_name,
+        is_venv_tool=any(isinstance(node, ast.ClassDef) and node.name == "ToolParameters" for node in tree.body),
+        user_params=_get_params_from_class(_find_class(tree, "UserParameters")),
+        tool_params=_get_params_from_class(_find_class(tree, "ToolParameters")),
+        output_key=output_key,
+        **_get_execution_constants(tree),
+    )
+
+
+def _compile_tool_parameters_type(source: str) -> Type[BaseModel]:
+    """
+    1. Parse the given Python source code into an AST.
+    2. Locate the class named 'ToolParameters'.
+    3. Create a new ClassDef that keeps only the annotated fields.
+    4. Insert that ClassDef into a minimal AST Module with the typing and pydantic imports.
+    5. Compile & exec that new module in the current Python environment.
+    6. Return the resulting class object from namespace.
+    """
+    tool_params_node = _find_class(ast.parse(source), "ToolParameters")
+    if tool_params_node is None:
+        raise ValueError("ToolParameters class not found in the code.")
+
+    modified_tool_parameters = ast.ClassDef(
+        name=tool_params_node.name,
+        bases=tool_params_node.bases,
+        keywords=tool_params_node.keywords,
+        body=[stmt for stmt in tool_params_node.body if isinstance(stmt, ast.AnnAssign)],
+        decorator_list=tool_params_node.decorator_list,
+        lineno=tool_params_node.lineno,
+        col_offset=tool_params_node.col_offset,
+        end_lineno=getattr(tool_params_node, "end_lineno", None),
+        end_col_offset=getattr(tool_params_node, "end_col_offset", None),
+    )
+    new_module = ast.Module(
+        body=[
+            ast.ImportFrom(module="typing", names=[ast.alias(name="*", asname=None)], level=0),
+            ast.ImportFrom(module="pydantic", names=[ast.alias(name="*", asname=None)], level=0),
+            modified_tool_parameters,
+        ],
+        type_ignores=[],
+    )
+    ast.fix_missing_locations(new_module)
+
+    ns = {}
+    exec(compile(new_module, filename="<ast>", mode="exec"), ns)
+    dynamic_cls = ns["ToolParameters"]
+    if not issubclass(dynamic_cls, BaseModel):
+        raise ValueError("Extracted ToolParameters is not a subclass of BaseModel.")
+    return dynamic_cls
+
+
+# source hash -> metadata, least recently used first
+_metadata_by_hash: "OrderedDict[str, ToolSourceMetadata]" = OrderedDict()
+# tool file path -> ((mtime_ns, size), source hash), least recently used first
+_hash_by_path: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+_cache_lock = threading.Lock()
+
+
+def _get_cached(source_hash: str) -> Optional[ToolSourceMetadata]:
+    # Called with the cache lock held.
+    metadata = _metadata_by_hash.get(source_hash)
+    if metadata is not None:
+        _metadata_by_hash.move_to_end(source_hash)
+    return metadata
+
+
+def _put_cached(metadata: ToolSourceMetadata) -> ToolSourceMetadata:
+    # Called with the cache lock held. Another thread may have parsed the same source meanwhile.
+    existing = _get_cached(metadata.source_hash)
+    if existing is not None:
+        return existing
+    _metadata_by_hash[metadata.source_hash] = metadata
+    while len(_metadata_by_hash) > TOOL_SOURCE_METADATA_CACHE_SIZE:
+        _metadata_by_hash.popitem(last=False)
+    return metadata
+
+
+def get_tool_source_metadata_for_code(source: str) -> ToolSourceMetadata:
+    """
+    Metadata of tool source code, parsed once per distinct source.
+    """
+    source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    with _cache_lock:
+        metadata = _get_cached(source_hash)
+        _cache_stats["hits" if metadata is not None else "misses"] += 1
+    if metadata is not None:
+        return metadata
+    metadata = parse_tool_source(source, source_hash)
+    with _cache_lock:
+        return _put_cached(metadata)
+
+
+def get_tool_source_metadata(tool_file_path: str) -> ToolSourceMetadata:
+    """
+    Metadata of a tool file. The file is only read again when its mtime or size changed,
+    and only parsed again when its content changed.
+    """
+    tool_file_path = os.path.abspath(tool_file_path)
+    stat = os.stat(tool_file_path)
+    file_key = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached_path = _hash_by_path.get(tool_file_path)
+        if cached_path is not None and cached_path[0] == file_key:
+            _hash_by_path.move_to_end(tool_file_path)
+            metadata = _get_cached(cached_path[1])
+            if metadata is not None:
+                _cache_stats["hits"] += 1
+                return metadata
+
+    with open(tool_file_path, "r") as tool_file:
+        source = tool_file.read()
+    metadata = get_tool_source_metadata_for_code(source)
+    with _cache_lock:
+        _hash_by_path[tool_file_path] = (file_key, metadata.source_hash)
+        _hash_by_path.move_to_end(tool_file_path)
+        while len(_hash_by_path) > TOOL_SOURCE_PATH_CACHE_SIZE:
+            _hash_by_path.popitem(last=False)
+    return metadata
+
+
+def get_tool_source_metadata_cache_stats() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_cache_stats, "entries": len(_metadata_by_hash), "paths": len(_hash_by_path)}
+
+
+def clear_tool_source_metadata_cache() -> None:
+    with _cache_lock:
+        _metadata_by_hash.clear()
+        _hash_by_path.clear()
@@ -0,0 +1,261 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Content-addressed store of tool virtual environments.
+
+Tool instances that share the same requirements (and Python version) share one
+virtual environment. Each environment lives in the store under a key derived from
+its requirements, and a tool's `.venv` is a symlink into the store. Every entry
+keeps track of the tool `.venv` links that reference it, so that entries which are
+no longer referenced by any tool can be garbage collected.
+"""
+
+import os
+import sys
+import json
+import fcntl
+import shutil
+import hashlib
+import platform
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from engine.consts import TOOL_VENV_STORE_LOCATION
+
+# Fingerprint of the requirements install, written into an environment after a
+# successful install. Its presence also marks a store environment as complete.
+REQUIREMENTS_HASH_FILE = ".requirements_hash.txt"
+
+# Environment variables that change where requirements are installed from.
+_INDEX_SETTINGS_ENV_VARS = ("UV_DEFAULT_INDEX", "UV_INSECURE_HOST")
+
+_install_stats = {"skipped": 0, "installed": 0}
+_install_stats_lock = threading.Lock()
+
+# Requirement lines pointing at local paths can't be content-addressed
+# by the requirements file alone.
+_LOCAL_REQUIREMENT_PREFIXES = ("-e", "--editable", ".", "/", "file:", "-r", "--requirement", "-c", "--constraint")
+
+
+def get_venv_store_dir() -> str:
+    """
+    Root directory of the shared venv store. Can be overridden with
+    AGENT_STUDIO_TOOL_VENV_STORE.
+    """
+    return os.path.abspath(os.getenv("AGENT_STUDIO_TOOL_VENV_STORE", TOOL_VENV_STORE_LOCATION))
+
+
+def _read_requirement_lines(requirements_file_path: str) -> List[str]:
+    if not os.path.exists(requirements_file_path):
+        return []
+    with open(requirements_file_path, "r") as f:
+        lines = [line.split(" #", 1)[0].strip() for line in f.read().splitlines()]
+    return sorted(line for line in lines if line and not line.startswith("#"))
+
+
+def is_shareable_requirements(requirements_file_path: str) -> bool:
+    """
+    Whether the environment for this requirements file can be shared across tools.
+    """
+    return not any(
+        line.startswith(_LOCAL_REQUIREMENT_PREFIXES) for line in _read_requirement_lines(requirements_file_path)
+    )
+
+
+def get_requirements_key(requirements_file_path: str) -> str:
+    """
+    Hash of the normalized requirements alone, independent of the interpreter.
+    """
+    digest = hashlib.sha256()
+    for line in _read_requirement_lines(requirements_file_path):
+        digest.update(f"{line}\n".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def get_venv_key(requirements_file_path: str) -> str:
+    """
+    Content-address of the environment for a requirements file: a hash of the
+    normalized requirements and the Python version the environment is built with.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"python={platform.python_version()}\n".encode("utf-8"))
+    for line in _read_requirement_lines(requirements_file_path):
+        digest.update(f"{line}\n".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def get_install_fingerprint(requirements_file_path: str, with_: str = "uv") -> str:
+    """
+    Fingerprint of everything a requirements install depends on: the requirements
+    file itself, the interpreter and the package index settings. Files and local paths
+    the requirements reference aren't covered, see is_shareable_requirements.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"python={sys.version}\ninstaller={with_}\n".encode("utf-8"))
+    for env_var in _INDEX_SETTINGS_ENV_VARS:
+        digest.update(f"{env_var}={os.environ.get(env_var, '')}\n".encode("utf-8"))
+    for line in _read_requirement_lines(requirements_file_path):
+        digest.update(f"{line}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_install_current(venv_dir: str, fingerprint: str) -> bool:
+    """
+    Whether the environment was last installed with the given fingerprint and still has an interpreter.
+    """
+    if not os.path.exists(os.path.join(venv_dir, "bin", "python")):
+        return False
+    try:
+        with open(os.path.join(venv_dir, REQUIREMENTS_HASH_FILE), "r") as f:
+            return f.read().strip() == fingerprint
+    except FileNotFoundError:
+        return False
+
+
+def record_install_fingerprint(venv_dir: str, fingerprint: Optional[str]) -> None:
+    """
+    Record (or, with None, clear) the install fingerprint of an environment.
+    """
+    hash_file = os.path.join(venv_dir, REQUIREMENTS_HASH_FILE)
+    if fingerprint is None:
+        if os.path.exists(hash_file):
+            os.remove(hash_file)
+        return
+    with open(hash_file, "w") as f:
+        f.write(fingerprint)
+
+
+def record_install_outcome(skipped: bool) -> None:
+    with _install_stats_lock:
+        _install_stats["skipped" if skipped else "installed"] += 1
+
+
+def get_install_stats() -> Dict[str, float]:
+    """
+    Number of requirement installs skipped and run by this process, and the skip rate.
+    """
+    with _install_stats_lock:
+        skipped, installed = _install_stats["skipped"], _install_stats["installed"]
+    total = skipped + installed
+    return {"skipped": skipped, "installed": installed, "skip_rate": skipped / total if total else 0.0}
+
+
+@contextmanager
+def _entry_lock(store_dir: str, key: str):
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, f"{key}.lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _refs_path(store_dir: str, key: str) -> str:
+    return os.path.join(store_dir, f"{key}.refs.json")
+
+
+def _read_refs(store_dir: str, key: str) -> List[str]:
+    try:
+        with open(_refs_path(store_dir, key), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def _write_refs(store_dir: str, key: str, refs: List[str]) -> None:
+    tmp_path = _refs_path(store_dir, key) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(sorted(set(refs)), f)
+    os.replace(tmp_path, _refs_path(store_dir, key))
+
+
+def _is_live_ref(link_path: str, entry_dir: str) -> bool:
+    return os.path.islink(link_path) and os.path.realpath(link_path) == os.path.realpath(entry_dir)
+
+
+def remove_venv_link(venv_dir: str) -> None:
+    """
+    Remove a tool's `.venv`, whether it is a link into the store or a private environment.
+    """
+    if os.path.islink(venv_dir):
+        os.unlink(venv_dir)
+    elif os.path.exists(venv_dir):
+        shutil.rmtree(venv_dir)
+
+
+def link_shared_venv(
+    venv_dir: str, requirements_file_path: str, build: Callable[[str], None], fingerprint: Optional[str] = None
+) -> str:
+    """
+    Point `venv_dir` (a tool's `.venv`) at the shared environment for its requirements.
+    `build(entry_dir)` creates the environment and installs the requirements; it is only
+    called when the store has no complete environment installed with `fingerprint`.
+    Returns the store entry directory.
+    """
+    venv_dir = os.path.abspath(venv_dir)
+    store_dir = get_venv_store_dir()
+    key = get_venv_key(requirements_file_path)
+    entry_dir = os.path.join(store_dir, key)
+    fingerprint = fingerprint or get_install_fingerprint(requirements_file_path)
+
+    with _entry_lock(store_dir, key):
+        if not is_install_current(entry_dir, fingerprint):
+            if not os.path.exists(os.path.join(entry_dir, REQUIREMENTS_HASH_FILE)):
+                # Never completed a build, start from scratch.
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            else:
+                # Built with other install settings, re-install on top.
+                record_install_fingerprint(entry_dir, None)
+            build(entry_dir)
+            record_install_fingerprint(entry_dir, fingerprint)
+
+        if not _is_live_ref(venv_dir, entry_dir):
+            remove_venv_link(venv_dir)
+            os.symlink(entry_dir, venv_dir)
+
+        refs = [ref for ref in _read_refs(store_dir, key) if _is_live_ref(ref, entry_dir)]
+        _write_refs(store_dir, key, refs + [venv_dir])
+
+    return entry_dir
+
+
+def get_venv_store_usage() -> Dict[str, int]:
+    """
+    Reference count of every environment in the store, counting only links that still point at it.
+    """
+    store_dir = get_venv_store_dir()
+    if not os.path.isdir(store_dir):
+        return {}
+    usage: Dict[str, int] = {}
+    for name in os.listdir(store_dir):
+        entry_dir = os.path.join(store_dir, name)
+        if os.path.isdir(entry_dir):
+            usage[name] = len([ref for ref in _read_refs(store_dir, name) if _is_live_ref(ref, entry_dir)])
+    return usage
+
+
+def collect_unused_venvs(keep: Optional[List[str]] = None) -> List[str]:
+    """
+    Delete every environment in the store that no tool `.venv` links to anymore.
+    Returns the keys of the removed environments.
+    """
+    store_dir = get_venv_store_dir()
+    if not os.path.isdir(store_dir):
+        return []
+    removed: List[str] = []
+    for name in os.listdir(store_dir):
+        entry_dir = os.path.join(store_dir, name)
+        if not os.path.isdir(entry_dir) or (keep and name in keep):
+            continue
+        with _entry_lock(store_dir, name):
+            refs = [ref for ref in _read_refs(store_dir, name) if _is_live_ref(ref, entry_dir)]
+            if refs:
+                _write_refs(store_dir, name, refs)
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            if os.path.exists(_refs_path(store_dir, name)):
+                os.remove(_refs_path(store_dir, name))
+            removed.append(name)
+    return removed
@@ -0,0 +1,146 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Prebuilt tool wheel bundles of deployment artifacts.
+
+Deployment artifacts don't ship tool `.venv` directories, so every replica of a
+deployed workflow used to resolve and download the requirements of every tool from a
+package index on start. Virtual environments aren't relocatable (their scripts and
+config hold absolute paths), so workbench deployments can instead ship the wheels of
+the tools' requirements, built once at package time, in TOOL_WHEELS_ARTIFACT_DIRECTORY.
+
+The lockfile of the bundle records the interpreter and platform the wheels were built
+for and, per requirements file (by a hash of its requirement lines alone, the
+interpreter is covered by the lockfile target), the wheels it resolved to with their
+sha256. On start, `get_tool_wheel_bundle_dir` verifies the lockfile and the
+wheels of a tool's requirements. Installs from a verified bundle don't reach the
+package index. On any mismatch the tool is installed as before.
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import sysconfig
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+import engine.tool.venv_store as venv_store
+import engine.tool.wheelhouse as wheelhouse
+
+TOOL_WHEEL_BUNDLE_LOCKFILE = "lock.json"
+TOOL_WHEEL_BUNDLE_WHEELS_DIRECTORY = "wheels"
+
+
+def get_wheel_bundle_target() -> Dict[str, str]:
+    """
+    The interpreter and platform wheels are built for, and must be installed on.
+    """
+    return {
+        "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+        "implementation": sys.implementation.name,
+        "platform": sysconfig.get_platform(),
+    }
+
+
+def _get_file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_tool_wheel_bundle(
+    requirements_file_paths: List[str], bundle_dir: str, python_executable: Optional[str] = None
+) -> List[str]:
+    """
+    Build the wheels of every requirements file into a bundle directory and write its
+    lockfile. Requirements that reference local paths can't be bundled and are skipped,
+    as are requirements whose wheels fail to build. Returns the requirements files that
+    were bundled.
+    """
+    uv_bin = shutil.which("uv")
+    if not uv_bin:
+        raise RuntimeError("uv is not installed or not found in PATH.")
+    python_executable = python_executable or sys.executable
+    wheels_dir = os.path.join(bundle_dir, TOOL_WHEEL_BUNDLE_WHEELS_DIRECTORY)
+    os.makedirs(wheels_dir, exist_ok=True)
+    find_links = ["--find-links", wheelhouse.get_wheelhouse_dir()] if wheelhouse.is_wheelhouse_populated() else []
+
+    lock = {**get_wheel_bundle_target(), "requirements": {}}
+    bundled = []
+    # `uv` can't build wheels, so build them with pip from a throwaway seeded environment.
+    with tempfile.TemporaryDirectory(prefix="agent_studio_wheel_bundle_") as builder_dir:
+        builder_venv_dir = os.path.join(builder_dir, "venv")
+        subprocess.run(
+            [uv_bin, "venv", "--seed", "--python", python_executable, builder_venv_dir],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        builder_python = os.path.join(builder_venv_dir, "bin", "python")
+        for requirements_file_path in requirements_file_paths:
+            key = venv_store.get_requirements_key(requirements_file_path)
+            if key in lock["requirements"] or not venv_store.is_shareable_requirements(requirements_file_path):
+                continue
+            requirement_wheels_dir = os.path.join(builder_dir, key)
+            result = subprocess.run(
+                [builder_python, "-m", "pip", "wheel", "--disable-pip-version-check", "-r", requirements_file_path]
+                + ["--wheel-dir", requirement_wheels_dir]
+                + find_links
+                + wheelhouse.get_index_args(),
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                print(f"Failed to build tool wheels for {requirements_file_path}:\n{result.stderr}")
+                continue
+            wheels = {}
+            for wheel_name in sorted(os.listdir(requirement_wheels_dir)):
+                shutil.copy2(os.path.join(requirement_wheels_dir, wheel_name), os.path.join(wheels_dir, wheel_name))
+                wheels[wheel_name] = _get_file_sha256(os.path.join(wheels_dir, wheel_name))
+            lock["requirements"][key] = {"wheels": wheels}
+            bundled.append(requirements_file_path)
+
+    with open(os.path.join(bundle_dir, TOOL_WHEEL_BUNDLE_LOCKFILE), "w") as f:
+        json.dump(lock, f, indent=2, sort_keys=True)
+    return bundled
+
+
+def read_tool_wheel_bundle_lock(bundle_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(bundle_dir, TOOL_WHEEL_BUNDLE_LOCKFILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_tool_wheel_bundle_dir(bundle_dir: str, requirements_file_path: str) -> Optional[str]:
+    """
+    Directory of the bundled wheels of a requirements file, if the bundle was built for
+    this interpreter and platform and has every wheel of the requirements intact. None
+    otherwise.
+    """
+    lock = read_tool_wheel_bundle_lock(bundle_dir)
+    if lock is None:
+        return None
+    if any(lock.get(name) != value for name, value in get_wheel_bundle_target().items()):
+        print(f"Tool wheel bundle was built for {lock.get('python')} on {lock.get('platform')}, not using it")
+        return None
+    if not venv_store.is_shareable_requirements(requirements_file_path):
+        return None
+    entry = lock.get("requirements", {}).get(venv_store.get_requirements_key(requirements_file_path))
+    if entry is None:
+        print(f"Tool wheel bundle has no wheels for {requirements_file_path}, not using it")
+        return None
+
+    wheels_dir = os.path.join(bundle_dir, TOOL_WHEEL_BUNDLE_WHEELS_DIRECTORY)
+    for wheel_name, sha256 in entry["wheels"].items():
+        wheel_path = os.path.join(wheels_dir, wheel_name)
+        if not os.path.isfile(wheel_path) or _get_file_sha256(wheel_path) != sha256:
+            print(f"Bundled tool wheel {wheel_name} is missing or corrupt, not using the bundle")
+            return None
+    return wheels_dir
@@ -0,0 +1,185 @@
+# No top level studio.db imports allowed to support wokrflow model deployment
+
+"""
+Local wheelhouse for tool and MCP server dependency installs.
+
+The wheelhouse is a directory of wheels managed by the studio. It is warmed from
+requirements files (by default the bundled tool templates, see bin/warm-wheelhouse.py)
+while a package index is reachable. Requirement installs then use the wheelhouse as an
+extra source next to the package index (`--find-links`), so warmed wheels are reused
+without pinning unpinned requirements to the warmed versions. With
+AGENT_STUDIO_WHEELHOUSE_OFFLINE=true installs are served from the wheelhouse alone
+(`--no-index`) and never reach a package index.
+"""
+
+import os
+import sys
+import json
+import glob
+import fcntl
+import shutil
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+from engine.consts import TOOL_WHEELHOUSE_LOCATION
+import engine.tool.venv_store as venv_store
+
+_WARMED_MANIFEST_FILE = ".warmed.json"
+
+
+def get_wheelhouse_dir() -> str:
+    """
+    Root directory of the wheelhouse. Can be overridden with AGENT_STUDIO_WHEELHOUSE.
+    """
+    return os.path.abspath(os.getenv("AGENT_STUDIO_WHEELHOUSE", TOOL_WHEELHOUSE_LOCATION))
+
+
+def is_offline_only() -> bool:
+    return os.getenv("AGENT_STUDIO_WHEELHOUSE_OFFLINE", "false").lower() == "true"
+
+
+def is_wheelhouse_populated() -> bool:
+    return bool(glob.glob(os.path.join(get_wheelhouse_dir(), "*.whl")))
+
+
+def get_index_args() -> List[str]:
+    """
+    `uv pip install` arguments for the configured package index mirror, if any.
+    """
+    index_args = []
+    default_index = os.environ.get("UV_DEFAULT_INDEX")
+    insecure_host = os.environ.get("UV_INSECURE_HOST")
+    if default_index:
+        index_args.extend(["--index-url", default_index])
+    if insecure_host:
+        index_args.extend(["--trusted-host", insecure_host])
+    return index_args
+
+
+def get_install_commands(pip_install_command: List[str], wheel_bundle_dir: Optional[str] = None) -> List[List[str]]:
+    """
+    The `uv pip install` commands to try, in order, for a base install command:
+    a verified wheel bundle of a deployment artifact alone (if any), then the package
+    index with the wheelhouse as an extra source, or the wheelhouse alone when offline.
+    """
+    commands = []
+    if wheel_bundle_dir:
+        commands.append(pip_install_command + ["--no-index", "--find-links", wheel_bundle_dir])
+    if not is_wheelhouse_populated():
+        return commands + [pip_install_command + get_index_args()]
+    find_links = ["--find-links", get_wheelhouse_dir()]
+    if is_offline_only():
+        commands.append(pip_install_command + ["--no-index"] + find_links)
+    else:
+        commands.append(pip_install_command + find_links + get_index_args())
+    return commands
+
+
+def run_install_commands(
+    pip_install_command: List[str], env: Dict[str, str], wheel_bundle_dir: Optional[str] = None
+) -> subprocess.CompletedProcess:
+    """
+    Run the install commands from `get_install_commands` until one succeeds. Returns the
+    result of the successful command, or of the last one if all of them fail.
+    """
+    result = None
+    for command in get_install_commands(pip_install_command, wheel_bundle_dir):
+        result = subprocess.run(command, capture_output=True, text=True, env=env)
+        if result.returncode == 0:
+            break
+    return result
+
+
+def get_mcp_server_env() -> Dict[str, str]:
+    """
+    Environment variables that point `uvx` and `npx` MCP servers at local packages.
+    `npx` servers prefer the npm cache over the registry only with
+    AGENT_STUDIO_NPM_PREFER_OFFLINE=true, since that keeps serving stale package versions.
+    """
+    env = {}
+    if os.getenv("AGENT_STUDIO_NPM_PREFER_OFFLINE", "false").lower() == "true":
+        env["npm_config_prefer_offline"] = "true"
+    if is_wheelhouse_populated():
+        env["UV_FIND_LINKS"] = get_wheelhouse_dir()
+    if is_offline_only():
+        env["UV_OFFLINE"] = "true"
+        env["npm_config_offline"] = "true"
+    return env
+
+
+def _read_warmed_manifest(wheelhouse_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(wheelhouse_dir, _WARMED_MANIFEST_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_warmed_manifest(wheelhouse_dir: str, manifest: Dict[str, str]) -> None:
+    tmp_path = os.path.join(wheelhouse_dir, _WARMED_MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(wheelhouse_dir, _WARMED_MANIFEST_FILE))
+
+
+def warm_wheelhouse(requirements_file_paths: List[str], python_executable: Optional[str] = None) -> List[str]:
+    """
+    Build wheels for every requirements file into the wheelhouse, for the interpreter tool
+    virtual environments are created with. Requirements files whose install fingerprint
+    was already warmed are skipped. Returns the requirements files that were warmed.
+
+    Wheels are built into a staging directory and renamed into the wheelhouse once
+    complete, so concurrent installs never see a partially written wheel.
+    """
+    uv_bin = shutil.which("uv")
+    if not uv_bin:
+        raise RuntimeError("uv is not installed or not found in PATH.")
+    python_executable = python_executable or sys.executable
+    wheelhouse_dir = get_wheelhouse_dir()
+    os.makedirs(wheelhouse_dir, exist_ok=True)
+
+    with open(os.path.join(wheelhouse_dir, ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        manifest = _read_warmed_manifest(wheelhouse_dir)
+        pending = []
+        for requirements_file_path in requirements_file_paths:
+            requirements_file_path = os.path.abspath(requirements_file_path)
+            fingerprint = venv_store.get_install_fingerprint(requirements_file_path, with_="wheelhouse")
+            if manifest.get(requirements_file_path) != fingerprint and venv_store.is_shareable_requirements(
+                requirements_file_path
+            ):
+                pending.append((requirements_file_path, fingerprint))
+        if not pending:
+            return []
+
+        # `uv` can't build a wheelhouse, so build it with pip from a throwaway seeded environment.
+        with tempfile.TemporaryDirectory(prefix="agent_studio_wheelhouse_") as builder_dir:
+            subprocess.run(
+                [uv_bin, "venv", "--seed", "--python", python_executable, builder_dir],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            builder_python = os.path.join(builder_dir, "bin", "python")
+            warmed = []
+            for requirements_file_path, fingerprint in pending:
+                # The staging directory is inside the wheelhouse so that wheels are renamed,
+                # not copied, into place. Installs only look at the top level.
+                with tempfile.TemporaryDirectory(prefix=".staging_", dir=wheelhouse_dir) as staging_dir:
+                    result = subprocess.run(
+                        [builder_python, "-m", "pip", "wheel", "--disable-pip-version-check"]
+                        + ["-r", requirements_file_path, "--wheel-dir", staging_dir, "--find-links", wheelhouse_dir]
+                        + get_index_args(),
+                        capture_output=True,
+                        text=True,
+                    )
+                    if result.returncode != 0:
+                        print(f"Failed to warm wheelhouse for {requirements_file_path}:\n{result.stderr}")
+                        continue
+                    for wheel_path in glob.glob(os.path.join(staging_dir, "*.whl")):
+                        os.replace(wheel_path, os.path.join(wheelhouse_dir, os.path.basename(wheel_path)))
+                manifest[requirements_file_path] = fingerprint
+                warmed.append(requirements_file_path)
+        _write_warmed_manifest(wheelhouse_dir, manifest)
+        return warmed
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional, List, Literal, Dict
+from typing import Any, Optional, List, Literal, Dict
 from enum import Enum
 from crewai import Agent, Crew, Task, Process
 from crewai.tools import BaseTool
@@ -140,6 +140,9 @@ class MCPObjects(BaseModel):
     local_session: MCPAdapt
     tools: List[BaseTool]
 
+    # Lease of the server from the MCP server pool, if the server is pooled.
+    pooled_server: Optional[Any] = None
+
 
 class CrewAIObjects(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -151,15 +154,31 @@ class CrewAIObjects(BaseModel):
     tasks: Dict[str, Task]
     crews: Dict[str, Crew]
 
+    # Build time (ms) of each language model ("llm:<model id>"), tool ("tool:<id>") and
+    # MCP session ("mcp:<id>"), and of the whole setup ("total").
+    setup_timings: Dict[str, float] = {}
+
 
 class DeployedWorkflowActions(str, Enum):
     KICKOFF = "kickoff"
+    BATCH_KICKOFF = "batch-kickoff"
     GET_CONFIGURATION = "get-configuration"
     GET_ASSET_DATA = "get-asset-data"
     GET_MCP_TOOL_DEFINITIONS = "get-mcp-tool-definitions"
+    GET_QUEUE_STATUS = "get-queue-status"
+    GET_RUN_STATUS = "get-run-status"
+    GET_RUN_RESULT = "get-run-result"
 
 
 class ServeWorkflowParameters(BaseModel):
     action_type: DeployedWorkflowActions
     kickoff_inputs: Optional[str] = None
+    batch_kickoff_inputs: Optional[str] = None
+    """
+    Base64 encoded JSON list of the inputs of each run of a batch-kickoff action.
+    """
     get_asset_data_inputs: List[str] = list()
+    trace_id: Optional[str] = None
+    """
+    Trace ID of the run for the get-run-status and get-run-result actions.
+    """
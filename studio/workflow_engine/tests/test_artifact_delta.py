@@ -0,0 +1,91 @@
+import json
+import hashlib
+import tarfile
+import pytest
+
+from engine.artifact import extract_artifact_to_location
+from engine.artifact_delta import (
+    ARTIFACT_MANIFEST_FILENAME,
+    build_artifact_manifest,
+    get_artifact_delta,
+    get_artifact_delta_path,
+    write_artifact_delta,
+)
+
+
+def _package(tmp_path, name, files):
+    source = tmp_path / name
+    source.mkdir()
+    members = []
+    for arcname, content in files.items():
+        (source / arcname).parent.mkdir(parents=True, exist_ok=True)
+        (source / arcname).write_text(content)
+        members.append((str(source / arcname), arcname))
+    manifest = build_artifact_manifest(members)
+    (source / ARTIFACT_MANIFEST_FILENAME).write_text(json.dumps(manifest))
+    artifact_path = tmp_path / f"{name}.tar.gz"
+    with tarfile.open(artifact_path, "w:gz") as tar:
+        for path, arcname in members + [(str(source / ARTIFACT_MANIFEST_FILENAME), ARTIFACT_MANIFEST_FILENAME)]:
+            tar.add(path, arcname=arcname)
+    return str(artifact_path), manifest
+
+
+def _sha256(path):
+    return hashlib.sha256(open(path, "rb").read()).hexdigest()
+
+
+def test_get_artifact_delta():
+    base = {"a": {"sha256": "1", "size": 1}, "b": {"sha256": "2", "size": 2}, "c": {"sha256": "3", "size": 3}}
+    new = {"a": {"sha256": "1", "size": 1}, "b": {"sha256": "9", "size": 4}, "d": {"sha256": "4", "size": 5}}
+    delta = get_artifact_delta(base, new)
+    assert delta.changed == ["b", "d"]
+    assert delta.removed == ["c"]
+    assert delta.changed_bytes == 9
+    assert delta.total_bytes == 10
+    assert not delta.is_empty
+    assert get_artifact_delta(base, base).is_empty
+
+
+def test_collated_input_only_delta():
+    base = {"collated_input.json": {"sha256": "1", "size": 1}, "tool.py": {"sha256": "2", "size": 2}}
+    new = {**base, "collated_input.json": {"sha256": "3", "size": 1}}
+    assert get_artifact_delta(base, new).is_collated_input_only
+    new["tool.py"] = {"sha256": "4", "size": 2}
+    assert not get_artifact_delta(base, new).is_collated_input_only
+
+
+def test_delta_is_applied_on_extract(tmp_path):
+    base_path, base_manifest = _package(
+        tmp_path,
+        "artifact",
+        {"collated_input.json": "v1", "studio-data/tool.py": "tool", "studio-data/old.py": "old"},
+    )
+    new_path, manifest = _package(
+        tmp_path, "new", {"collated_input.json": "v2", "studio-data/tool.py": "tool", "studio-data/new.py": "new"}
+    )
+    delta = get_artifact_delta(base_manifest, manifest)
+    delta_path = get_artifact_delta_path(base_path)
+    assert delta_path == str(tmp_path / "artifact.delta.tar.gz")
+    write_artifact_delta(delta_path, new_path, delta, _sha256(base_path))
+
+    with tarfile.open(delta_path, "r:gz") as tar:
+        assert "studio-data/tool.py" not in tar.getnames()
+
+    destination = tmp_path / "workflow"
+    extract_artifact_to_location(base_path, str(destination))
+    assert (destination / "collated_input.json").read_text() == "v2"
+    assert (destination / "studio-data" / "new.py").read_text() == "new"
+    assert (destination / "studio-data" / "tool.py").read_text() == "tool"
+    assert not (destination / "studio-data" / "old.py").exists()
+    assert json.loads((destination / ARTIFACT_MANIFEST_FILENAME).read_text()) == manifest
+    assert not (destination / ".artifact_delta.json").exists()
+
+
+def test_delta_of_another_base_is_refused(tmp_path):
+    base_path, base_manifest = _package(tmp_path, "artifact", {"collated_input.json": "v1"})
+    new_path, manifest = _package(tmp_path, "new", {"collated_input.json": "v2"})
+    write_artifact_delta(
+        get_artifact_delta_path(base_path), new_path, get_artifact_delta(base_manifest, manifest), "not-the-base"
+    )
+    with pytest.raises(RuntimeError, match="redeploy"):
+        extract_artifact_to_location(base_path, str(tmp_path / "workflow"))
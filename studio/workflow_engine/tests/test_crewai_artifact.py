@@ -3,8 +3,11 @@ import sys
 __import__("pysqlite3")
 sys.modules["sqlite3"] = sys.modules.pop("pysqlite3")
 
+import time
+import pytest
+from types import SimpleNamespace
 from unittest.mock import mock_open, patch
-from engine.crewai.artifact import is_crewai_workflow
+from engine.crewai.artifact import install_tool_virtual_envs, is_crewai_workflow
 
 
 @patch("engine.crewai.artifact.os.path.isfile")
@@ -31,3 +34,35 @@ def test_is_crewai_workflow_missing_file(mock_isfile):
 def test_is_crewai_workflow_yaml_parse_failure(mock_isfile):
     mock_isfile.return_value = True
     assert is_crewai_workflow("/fake/path") is False
+
+
+@patch("engine.crewai.artifact.prepare_virtual_env_for_tool")
+def test_tool_virtual_envs_are_prepared_concurrently(mock_prepare, monkeypatch):
+    monkeypatch.setenv("AGENT_STUDIO_TOOL_VENV_INSTALL_CONCURRENCY", "4")
+    mock_prepare.side_effect = lambda *args: time.sleep(0.2)
+    collated_input = SimpleNamespace(
+        tool_instances=[
+            SimpleNamespace(name=f"tool {i}", source_folder_path=f"tools/t{i}", python_requirements_file_name="r.txt")
+            for i in range(4)
+        ]
+    )
+
+    start = time.perf_counter()
+    install_tool_virtual_envs("/workflow", collated_input)
+
+    assert time.perf_counter() - start < 0.2 * 2
+    assert mock_prepare.call_count == 4
+
+
+@patch("engine.crewai.artifact.prepare_virtual_env_for_tool")
+def test_tool_virtual_env_failures_are_named(mock_prepare):
+    mock_prepare.side_effect = [None, ValueError("no matching distribution")]
+    collated_input = SimpleNamespace(
+        tool_instances=[
+            SimpleNamespace(name=f"tool {i}", source_folder_path=f"tools/t{i}", python_requirements_file_name="r.txt")
+            for i in range(2)
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match="no matching distribution"):
+        install_tool_virtual_envs("/workflow", collated_input)
@@ -0,0 +1,51 @@
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from engine.crewai.crew import build_concurrently, create_crewai_objects
+
+
+def _slow(value, seconds=0.2):
+    def build():
+        time.sleep(seconds)
+        return value
+
+    return build
+
+
+def test_builds_run_concurrently_and_are_timed():
+    start = time.perf_counter()
+    built, timings, errors = build_concurrently({f"tool:{i}": _slow(i) for i in range(6)})
+
+    assert time.perf_counter() - start < 0.2 * 3
+    assert built == {f"tool:{i}": i for i in range(6)}
+    assert all(timing >= 200 for timing in timings.values())
+    assert errors == {}
+
+
+def test_failed_builds_are_reported_per_object():
+    def fail():
+        raise ValueError("bad tool code")
+
+    built, _, errors = build_concurrently({"tool:ok": _slow("ok", 0), "tool:bad": fail})
+
+    assert built == {"tool:ok": "ok"}
+    assert list(errors) == ["tool:bad"]
+
+
+@patch("engine.crewai.crew.release_mcp_objects")
+@patch("engine.crewai.crew.get_mcp_tools_for_crewai")
+@patch("engine.crewai.crew.get_crewai_tool")
+def test_mcp_sessions_are_released_when_setup_fails(mock_get_tool, mock_get_mcp, mock_release):
+    mock_get_tool.side_effect = ValueError("bad tool code")
+    mock_get_mcp.return_value = "mcp session"
+    collated_input = SimpleNamespace(
+        language_models=[],
+        tool_instances=[SimpleNamespace(id="t1")],
+        mcp_instances=[SimpleNamespace(id="m1")],
+    )
+
+    with pytest.raises(RuntimeError, match="tool:t1: bad tool code"):
+        create_crewai_objects("/workflow", collated_input, {}, {}, {})
+    mock_release.assert_called_once_with("mcp session")
@@ -0,0 +1,66 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import engine.types as input_types
+from engine.crewai.crew import create_crewai_objects
+from engine.crewai.plan import compile_crewai_workflow_plan
+
+
+def _collated_input():
+    collated_input = MagicMock(spec=input_types.CollatedInput)
+    collated_input.language_models = [SimpleNamespace(model_id="m1")]
+    collated_input.tool_instances = [SimpleNamespace(id="t1")]
+    collated_input.mcp_instances = []
+    return collated_input
+
+
+@patch("engine.crewai.plan.get_crewai_tool_factory")
+@patch("engine.crewai.plan.get_crewai_llm_factory")
+def test_plan_keeps_a_factory_per_llm_and_tool(mock_llm_factory, mock_tool_factory):
+    llm_factory, tool_factory = MagicMock(), MagicMock()
+    mock_llm_factory.return_value = llm_factory
+    mock_tool_factory.return_value = tool_factory
+    collated_input = _collated_input()
+
+    plan = compile_crewai_workflow_plan("/workflow", collated_input, {"t1": {"k": "v"}}, {"m1": {"api_key": "x"}})
+
+    assert plan.llm_factories == {"m1": llm_factory}
+    assert plan.tool_factories == {"t1": tool_factory}
+    mock_tool_factory.assert_called_once_with(collated_input.tool_instances[0], {"k": "v"}, "/workflow")
+
+
+@patch("engine.crewai.plan.get_crewai_tool_factory")
+@patch("engine.crewai.plan.get_crewai_llm_factory")
+def test_plan_compile_errors_name_the_failed_objects(mock_llm_factory, mock_tool_factory):
+    mock_tool_factory.side_effect = ValueError("bad tool code")
+
+    with pytest.raises(RuntimeError, match="tool:t1: bad tool code"):
+        compile_crewai_workflow_plan("/workflow", _collated_input(), {}, {})
+
+
+@patch("engine.crewai.crew.get_crewai_tool")
+@patch("engine.crewai.crew.get_crewai_llm")
+def test_kickoffs_with_a_plan_only_call_its_factories(mock_get_llm, mock_get_tool):
+    tool_factory = MagicMock(side_effect=lambda: object())
+    plan = SimpleNamespace(llm_factories={"m1": MagicMock()}, tool_factories={"t1": tool_factory})
+    collated_input = _collated_input()
+    collated_input.agents = []
+    collated_input.tasks = []
+    collated_input.workflow = SimpleNamespace(
+        id="w1",
+        name="Workflow",
+        crew_ai_process="sequential",
+        agent_ids=[],
+        task_ids=[],
+        manager_agent_id=None,
+        llm_provider_model_id=None,
+    )
+
+    with patch("engine.crewai.crew.Crew"), patch.object(input_types, "CrewAIObjects"):
+        create_crewai_objects("/workflow", collated_input, {}, {}, {}, plan)
+        create_crewai_objects("/workflow", collated_input, {}, {}, {}, plan)
+
+    mock_get_llm.assert_not_called()
+    mock_get_tool.assert_not_called()
+    assert tool_factory.call_count == 2
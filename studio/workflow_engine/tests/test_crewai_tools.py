@@ -159,7 +159,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     @patch.dict("os.environ", {"PATH": "/usr/bin", "HOME": "/home/user", "EXISTING_VAR": "existing_value"})
     def test_run_method_environment_copying(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
@@ -197,7 +197,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_successful_execution(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -239,7 +239,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_no_output_key(self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance):
         # Tool code without OUTPUT_KEY
         tool_code_no_key = '''"""
@@ -273,7 +273,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_error_handling(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -298,7 +298,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_exception_handling(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -319,7 +319,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_stderr_only(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -345,7 +345,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_no_output(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -370,7 +370,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_output_key_processing(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance
     ):
@@ -408,7 +408,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_empty_user_params(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -441,7 +441,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_complex_tool_params(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -483,7 +483,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_app_data_directory(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -511,7 +511,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     def test_run_method_error_no_details(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
     ):
@@ -536,7 +536,7 @@ class ToolParameters(BaseModel):
     @patch("builtins.open", new_callable=mock_open)
     @patch("engine.crewai.tools.os.path.join")
     @patch("engine.crewai.tools.os.path.abspath")
-    @patch("engine.crewai.tools.subprocess.run")
+    @patch("engine.crewai.tools.run_tool_subprocess")
     @patch.dict("os.environ", {}, clear=True)  # Clear environment to test empty environment
     def test_run_method_empty_environment(
         self, mock_subprocess, mock_abspath, mock_join, mock_file, mock_tool_instance, sample_tool_code
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+
+from engine.kickoff_queue import (
+    KickoffQueue,
+    KickoffRejectedError,
+    get_queue_status,
+    kickoff_batch,
+    submit_kickoff,
+)
+
+
+def _run(order, name, release: asyncio.Event):
+    async def run():
+        order.append(name)
+        await release.wait()
+
+    return run
+
+
+def test_runs_beyond_the_limit_are_queued_in_order():
+    async def main():
+        queue = KickoffQueue(max_concurrent_runs=2, max_queue_size=2)
+        release = asyncio.Event()
+        order = []
+
+        admissions = [queue.submit(_run(order, i, release)) for i in range(4)]
+        await asyncio.sleep(0)
+
+        assert [a.queued for a in admissions] == [False, False, True, True]
+        assert [a.queue_position for a in admissions[2:]] == [1, 2]
+        assert order == [0, 1]
+        assert queue.get_status()["queued"] == 2
+
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        return order, queue.get_status()
+
+    order, status = asyncio.run(main())
+    assert order == [0, 1, 2, 3]
+    assert status["running"] == 0
+    assert status["completed"] == 4
+    assert status["max_queue_depth"] == 2
+
+
+def test_kickoffs_are_rejected_when_the_queue_is_full():
+    async def main():
+        queue = KickoffQueue(max_concurrent_runs=1, max_queue_size=1)
+        release = asyncio.Event()
+        queue.submit(_run([], 0, release))
+        queue.submit(_run([], 1, release))
+
+        with pytest.raises(KickoffRejectedError):
+            queue.check_admission()
+        with pytest.raises(KickoffRejectedError) as e:
+            queue.submit(_run([], 2, release))
+        release.set()
+        return e.value.status
+
+    status = asyncio.run(main())
+    assert status["rejected"] == 2
+    assert status["admitted"] == 2
+
+
+def test_reject_policy_never_queues():
+    async def main():
+        queue = KickoffQueue(max_concurrent_runs=1, max_queue_size=10, policy="reject")
+        release = asyncio.Event()
+        queue.submit(_run([], 0, release))
+        with pytest.raises(KickoffRejectedError):
+            queue.submit(_run([], 1, release))
+        release.set()
+
+    asyncio.run(main())
+
+
+def test_failed_runs_free_their_slot():
+    async def fail():
+        raise ValueError("crew failed")
+
+    async def main():
+        queue = KickoffQueue(max_concurrent_runs=1, max_queue_size=0)
+        queue.submit(fail)
+        for _ in range(3):
+            await asyncio.sleep(0)
+        queue.check_admission()
+        return queue.get_status()
+
+    status = asyncio.run(main())
+    assert status["failed"] == 1
+    assert status["running"] == 0
+
+
+def test_batch_kickoff_is_partially_scheduled_in_order():
+    async def main():
+        queue = KickoffQueue(max_concurrent_runs=1, max_queue_size=2)
+        release = asyncio.Event()
+        order = []
+
+        def kickoff(inputs):
+            result = submit_kickoff(queue, _run(order, inputs["n"], release))
+            return result if "error" in result else {"trace_id": f"trace-{inputs['n']}", **result}
+
+        response = kickoff_batch(queue, [{"n": i} for i in range(5)], kickoff)
+        await asyncio.sleep(0)
+        queue_status = get_queue_status(queue)["queue_status"]
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        return response, queue_status, order, get_queue_status(queue)["queue_status"]
+
+    response, queue_status, order, final_status = asyncio.run(main())
+    runs = response["runs"]
+    assert [run.get("trace_id") for run in runs] == ["trace-0", "trace-1", "trace-2", None, None]
+    assert [(run["queued"], run["queue_position"]) for run in runs[:3]] == [(False, 0), (True, 1), (True, 2)]
+    assert all(run["error"].startswith("Kickoff rejected") for run in runs[3:])
+    assert runs[4]["queue_status"]["rejected"] == 2
+    assert response["queue_status"]["admitted"] == 3
+    assert response["queue_status"]["rejected"] == 2
+
+    assert queue_status["running"] == 1
+    assert queue_status["queued"] == 2
+    assert order == [0, 1, 2]
+    assert final_status["running"] == 0
+    assert final_status["completed"] == 3
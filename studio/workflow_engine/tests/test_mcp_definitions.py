@@ -0,0 +1,79 @@
+import time
+import pytest
+
+from engine.tool.mcp_definitions import (
+    copy_mcp_tool_definitions,
+    get_mcp_package_version,
+    get_mcp_server_spec_key,
+    get_mcp_tool_definitions_cached,
+    read_mcp_tool_definitions,
+)
+
+TOOLS = [{"name": "fetch", "description": "Fetch a URL", "inputSchema": {"type": "object"}}]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENT_STUDIO_MCP_DEFINITIONS_CACHE", str(tmp_path / "mcp_definitions"))
+    monkeypatch.delenv("AGENT_STUDIO_MCP_DEFINITIONS_TTL_SECONDS", raising=False)
+    return tmp_path / "mcp_definitions"
+
+
+def test_package_version_is_read_from_args():
+    assert get_mcp_package_version(["mcp-server-fetch==2025.1.17"]) == "2025.1.17"
+    assert get_mcp_package_version(["-y", "@modelcontextprotocol/server-filesystem@0.6.2", "/data"]) == "0.6.2"
+    assert get_mcp_package_version(["-y", "@modelcontextprotocol/server-filesystem"]) == "latest"
+    assert get_mcp_package_version([]) == "latest"
+
+
+def test_spec_key_ignores_env_values_and_order_of_names():
+    key = get_mcp_server_spec_key("uvx", ["mcp-server-fetch"], ["B", "A"])
+
+    assert key == get_mcp_server_spec_key("uvx", ["mcp-server-fetch"], ["A", "B"])
+    assert key != get_mcp_server_spec_key("npx", ["mcp-server-fetch"], ["A", "B"])
+    assert key != get_mcp_server_spec_key("uvx", ["mcp-server-fetch==1.0"], ["A", "B"])
+
+
+def test_server_is_only_started_on_a_cache_miss():
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return TOOLS
+
+    assert get_mcp_tool_definitions_cached("key", fetch) == TOOLS
+    assert get_mcp_tool_definitions_cached("key", fetch) == TOOLS
+    assert len(fetches) == 1
+
+
+def test_stale_definitions_are_refreshed_in_background(monkeypatch):
+    get_mcp_tool_definitions_cached("key", lambda: TOOLS)
+    monkeypatch.setenv("AGENT_STUDIO_MCP_DEFINITIONS_TTL_SECONDS", "0")
+    refreshed = []
+    new_tools = [{**TOOLS[0], "description": "Fetch a URL as markdown"}]
+
+    assert get_mcp_tool_definitions_cached("key", lambda: new_tools, on_refresh=refreshed.append) == TOOLS
+    for _ in range(100):
+        if refreshed:
+            break
+        time.sleep(0.01)
+
+    assert refreshed == [new_tools]
+    assert read_mcp_tool_definitions("key")["tools"] == new_tools
+
+
+def test_failed_fetch_is_not_cached():
+    def fetch():
+        raise RuntimeError("server did not start")
+
+    with pytest.raises(RuntimeError):
+        get_mcp_tool_definitions_cached("key", fetch)
+    assert read_mcp_tool_definitions("key") is None
+
+
+def test_definitions_are_copied_into_artifacts(tmp_path):
+    get_mcp_tool_definitions_cached("cached", lambda: TOOLS)
+    target_dir = str(tmp_path / "artifact" / "mcp_definitions")
+
+    assert copy_mcp_tool_definitions(["cached", "missing"], target_dir) == ["cached"]
+    assert get_mcp_tool_definitions_cached("cached", lambda: [], cache_dir=target_dir) == TOOLS
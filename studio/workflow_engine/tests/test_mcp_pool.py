@@ -0,0 +1,134 @@
+import time
+
+import pytest
+from mcp import StdioServerParameters
+
+import engine.crewai.mcp_pool as mcp_pool
+from engine.crewai.mcp_pool import MCPServerPool, get_mcp_server_key
+
+
+class FakeServer:
+    def __init__(self, server_params):
+        self.server_params = server_params
+        self.healthy = True
+        self.closed = False
+
+    def tools(self):
+        return [f"tool of {self.server_params.args[0]}"]
+
+    def close(self):
+        self.closed = True
+
+
+def _params(*args):
+    return StdioServerParameters(command="uvx", args=list(args), env={})
+
+
+def _pool(**kwargs):
+    started = []
+
+    def start_server(server_params):
+        started.append(FakeServer(server_params))
+        return started[-1]
+
+    pool = MCPServerPool(start_server=start_server, check_health=lambda server: server.healthy, **kwargs)
+    return pool, started
+
+
+def test_server_is_kept_warm_between_runs():
+    pool, started = _pool()
+
+    first = pool.acquire(_params("mcp-server-fetch"), {})
+    pool.release(first)
+    second = pool.acquire(_params("mcp-server-fetch"), {})
+
+    assert second is first
+    assert len(started) == 1
+    assert second.tools == ["tool of mcp-server-fetch"]
+    assert pool.get_stats()["reused"] == 1
+
+
+def test_servers_are_keyed_by_args_and_env():
+    key = get_mcp_server_key(_params("mcp-server-fetch"), {"TOKEN": "a"})
+
+    assert key == get_mcp_server_key(_params("mcp-server-fetch"), {"TOKEN": "a"})
+    assert key != get_mcp_server_key(_params("mcp-server-fetch"), {"TOKEN": "b"})
+    assert key != get_mcp_server_key(_params("mcp-server-time"), {"TOKEN": "a"})
+
+
+def test_concurrent_runs_beyond_capacity_start_more_servers():
+    pool, started = _pool(concurrency=2)
+
+    leases = [pool.acquire(_params("mcp-server-fetch"), {}) for _ in range(3)]
+
+    assert leases[0] is leases[1]
+    assert leases[2] is not leases[0]
+    assert len(started) == 2
+
+
+def test_servers_are_not_shared_by_default():
+    pool, started = _pool()
+
+    leases = [pool.acquire(_params("mcp-server-fetch"), {}) for _ in range(2)]
+
+    assert leases[0] is not leases[1]
+    assert len(started) == 2
+
+
+def test_server_that_fails_to_start_is_closed(monkeypatch):
+    adapters = []
+
+    class FailingAdapter:
+        def __init__(self, *args, **kwargs):
+            self.closed = False
+            adapters.append(self)
+
+        def start(self):
+            raise TimeoutError("Couldn't connect to the MCP server")
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(mcp_pool, "MCPAdapt", FailingAdapter)
+
+    with pytest.raises(TimeoutError):
+        mcp_pool.start_mcp_server(_params("mcp-server-fetch"))
+    assert adapters[0].closed
+
+
+def test_unhealthy_server_is_replaced():
+    pool, started = _pool()
+    first = pool.acquire(_params("mcp-server-fetch"), {})
+    pool.release(first)
+    started[0].healthy = False
+
+    second = pool.acquire(_params("mcp-server-fetch"), {})
+
+    assert second is not first
+    assert started[0].closed
+    assert pool.get_stats()["servers"] == 1
+
+
+def test_broken_server_is_recycled_after_its_runs():
+    pool, started = _pool(concurrency=2)
+    first = pool.acquire(_params("mcp-server-fetch"), {})
+    other = pool.acquire(_params("mcp-server-fetch"), {})
+    first.mark_broken()
+
+    pool.release(first)
+    assert not started[0].closed
+    pool.release(other)
+
+    assert started[0].closed
+    assert pool.get_stats()["recycled"] == 1
+
+
+def test_idle_servers_are_closed():
+    pool, started = _pool(idle_timeout_seconds=0.05)
+    pool.release(pool.acquire(_params("mcp-server-fetch"), {}))
+    time.sleep(0.1)
+
+    pool.close_idle_servers()
+
+    assert started[0].closed
+    assert pool.get_stats()["servers"] == 0
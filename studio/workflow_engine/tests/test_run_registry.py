@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from engine.run_registry import RunRegistry, RunState, track_run
+
+
+def test_tracked_runs_record_state_times_and_output():
+    registry = RunRegistry()
+    registry.register("t1")
+    assert registry.get("t1").state == RunState.QUEUED
+
+    async def run():
+        assert registry.get("t1").state == RunState.RUNNING
+        return SimpleNamespace(raw="final answer")
+
+    asyncio.run(track_run(registry, "t1", run)())
+
+    record = registry.get("t1")
+    assert record.state == RunState.COMPLETED
+    assert record.output == "final answer"
+    assert record.queued_at <= record.started_at <= record.ended_at
+
+
+def test_failed_runs_record_their_error():
+    registry = RunRegistry()
+    registry.register("t1")
+
+    async def run():
+        raise ValueError("LLM unavailable")
+
+    with pytest.raises(ValueError):
+        asyncio.run(track_run(registry, "t1", run)())
+    assert registry.get("t1").state == RunState.FAILED
+    assert registry.get("t1").error == "LLM unavailable"
+
+
+def test_oldest_finished_runs_are_evicted_first():
+    registry = RunRegistry(max_runs=2)
+    registry.register("running")
+    registry.register("done")
+    registry.mark_completed("done", "output")
+    registry.register("new")
+
+    assert registry.get("done") is None
+    assert registry.get("running") is not None
+    assert registry.get("new") is not None
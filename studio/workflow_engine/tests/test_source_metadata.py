@@ -0,0 +1,108 @@
+import os
+import pytest
+from pydantic import BaseModel
+
+import engine.tool.source_metadata as source_metadata
+from engine.tool.source_metadata import (
+    get_tool_source_metadata,
+    get_tool_source_metadata_for_code,
+    get_tool_source_metadata_cache_stats,
+)
+
+VENV_TOOL_CODE = '''"""
+Adds two numbers.
+"""
+from typing import Optional
+from pydantic import BaseModel
+
+OUTPUT_KEY = "RESULT:"
+MAX_OUTPUT_BYTES = 4096
+TIMEOUT_SECONDS = 30
+
+
+class UserParameters(BaseModel):
+    api_key: str
+    region: Optional[str] = None
+
+
+class ToolParameters(BaseModel):
+    a: int
+    b: int = 1
+'''
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    source_metadata.clear_tool_source_metadata_cache()
+    yield
+    source_metadata.clear_tool_source_metadata_cache()
+
+
+def test_metadata_of_venv_tool():
+    metadata = get_tool_source_metadata_for_code(VENV_TOOL_CODE)
+
+    assert metadata.is_venv_tool
+    assert metadata.docstring == "Adds two numbers."
+    assert metadata.output_key == "RESULT:"
+    assert metadata.max_output_bytes == 4096
+    assert metadata.timeout_seconds == 30
+    assert metadata.max_memory_mb is None
+    assert metadata.tool_class_name is None
+    assert metadata.class_names == ["UserParameters", "ToolParameters"]
+    assert metadata.user_params == {"api_key": {"required": True}, "region": {"required": False}}
+    assert metadata.tool_params == {"a": {"required": True}, "b": {"required": False}}
+
+
+def test_syntax_error_is_recorded():
+    metadata = get_tool_source_metadata_for_code("class Broken(:\n")
+    assert isinstance(metadata.syntax_error, SyntaxError)
+    with pytest.raises(SyntaxError):
+        metadata.get_tool_parameters_type()
+
+
+def test_source_is_parsed_once():
+    first = get_tool_source_metadata_for_code(VENV_TOOL_CODE)
+    misses = get_tool_source_metadata_cache_stats()["misses"]
+
+    assert get_tool_source_metadata_for_code(VENV_TOOL_CODE) is first
+    assert get_tool_source_metadata_cache_stats()["misses"] == misses
+
+
+def test_tool_parameters_type_is_compiled_once():
+    tool_parameters_type = get_tool_source_metadata_for_code(VENV_TOOL_CODE).get_tool_parameters_type()
+
+    assert issubclass(tool_parameters_type, BaseModel)
+    assert tool_parameters_type(a=1).b == 1
+    assert get_tool_source_metadata_for_code(VENV_TOOL_CODE).get_tool_parameters_type() is tool_parameters_type
+
+
+def test_tool_file_is_reparsed_after_change(tmp_path):
+    tool_file = tmp_path / "tool.py"
+    tool_file.write_text(VENV_TOOL_CODE)
+    metadata = get_tool_source_metadata(str(tool_file))
+    assert get_tool_source_metadata(str(tool_file)) is metadata
+
+    tool_file.write_text(VENV_TOOL_CODE.replace("RESULT:", "OUTPUT:"))
+    stat = os.stat(tool_file)
+    os.utime(tool_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert get_tool_source_metadata(str(tool_file)).output_key == "OUTPUT:"
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(source_metadata, "TOOL_SOURCE_METADATA_CACHE_SIZE", 2)
+    for i in range(5):
+        get_tool_source_metadata_for_code(f"X = {i}\n")
+    assert get_tool_source_metadata_cache_stats()["entries"] == 2
+
+
+def test_path_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(source_metadata, "TOOL_SOURCE_PATH_CACHE_SIZE", 2)
+    for i in range(5):
+        tool_file = tmp_path / f"tool_{i}" / "tool.py"
+        tool_file.parent.mkdir()
+        tool_file.write_text(VENV_TOOL_CODE)
+        get_tool_source_metadata(str(tool_file))
+    stats = get_tool_source_metadata_cache_stats()
+    assert stats["paths"] == 2
+    assert stats["entries"] == 1
@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import patch
+
+from engine.startup import StartupTimeline, install_cmlapi
+
+URL = "https://ml.example.com/api/v2/python.tar.gz"
+FINGERPRINT = {"ETag": '"abc"', "Content-Length": "1024"}
+
+
+@pytest.fixture(autouse=True)
+def marker(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENT_STUDIO_CMLAPI_INSTALL_MARKER", str(tmp_path / "cmlapi_install.json"))
+
+
+@patch("engine.startup._get_installed_cmlapi_version", return_value="2.0.50")
+@patch("engine.startup.get_cmlapi_tarball_fingerprint", return_value=FINGERPRINT)
+@patch("engine.startup.subprocess.call", return_value=0)
+def test_cmlapi_install_is_skipped_while_the_tarball_is_unchanged(mock_call, mock_fingerprint, mock_version):
+    assert install_cmlapi(URL) is True
+    assert install_cmlapi(URL) is False
+    assert mock_call.call_count == 1
+
+    mock_fingerprint.return_value = {"ETag": '"def"', "Content-Length": "1024"}
+    assert install_cmlapi(URL) is True
+    assert mock_call.call_count == 2
+
+
+@patch("engine.startup._get_installed_cmlapi_version", return_value="2.0.50")
+@patch("engine.startup.get_cmlapi_tarball_fingerprint", return_value=None)
+@patch("engine.startup.subprocess.call", return_value=0)
+def test_cmlapi_is_installed_when_the_tarball_cannot_be_checked(mock_call, mock_fingerprint, mock_version):
+    install_cmlapi(URL)
+    install_cmlapi(URL)
+    assert mock_call.call_count == 2
+
+
+def test_timeline_records_phase_durations():
+    timeline = StartupTimeline()
+    with timeline.phase("artifact_extract"):
+        pass
+    timeline.record("tool_virtual_envs", 1500.0)
+
+    summary = timeline.get_summary()
+    assert list(summary["phases_ms"]) == ["artifact_extract", "tool_virtual_envs"]
+    assert summary["phases_ms"]["tool_virtual_envs"] == 1500.0
@@ -0,0 +1,181 @@
+import os
+import sys
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+import engine.tool.execution as execution
+from engine.crewai.trace_context import set_trace_id
+from engine.tool.execution import (
+    ToolExecutionProfile,
+    ToolResourceLimits,
+    pop_tool_execution_profile,
+    pop_tool_usage_summary,
+    record_tool_execution,
+    run_tool_subprocess,
+)
+
+
+def test_run_tool_subprocess_profiles_the_call():
+    code = "import sys; data = bytearray(50 * 1024 * 1024); print(sys.stdin.read().upper()); sys.exit(3)"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], input="hello")
+
+    assert result.returncode == 3
+    assert result.stdout == "HELLO\n"
+    assert result.profile.exit_status == 3
+    assert result.profile.stdout_bytes == len("HELLO\n")
+    assert result.profile.peak_rss_kb > 50 * 1024
+    assert 0 < result.profile.spawn_ms <= result.profile.wall_ms
+    assert result.profile.cpu_user_ms + result.profile.cpu_system_ms > 0
+
+
+def test_run_tool_subprocess_captures_large_output():
+    code = "import sys; sys.stdout.write('x' * 1_000_000); sys.stderr.write('done')"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], max_output_bytes=2_000_000)
+
+    assert len(result.stdout) == 1_000_000
+    assert result.stderr == "done"
+    assert not result.profile.output_truncated
+    assert result.profile.stdout_spill_path is None
+
+
+@pytest.fixture
+def spill_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(execution, "TOOL_OUTPUT_SPILL_DIR", str(tmp_path / "outputs"))
+    return tmp_path / "outputs"
+
+
+def test_large_output_is_truncated_and_spilled(spill_dir):
+    code = "import sys; sys.stdout.write('x' * 1_000_000)"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], max_output_bytes=1000)
+
+    assert result.stdout == "x" * 1000
+    assert result.profile.output_truncated
+    assert result.profile.stdout_bytes == 1_000_000
+    assert os.path.dirname(result.profile.stdout_spill_path) == str(spill_dir)
+    assert os.path.getsize(result.profile.stdout_spill_path) == 1_000_000
+
+
+def test_truncated_output_keeps_result_after_output_key(spill_dir):
+    # Logs before the key are dropped, the key may be split across reads.
+    code = "import sys; sys.stdout.write('log ' * 100_000); sys.stdout.flush(); sys.stdout.write('RES'); sys.stdout.flush(); sys.stdout.write('ULT:' + 'y' * 500)"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], max_output_bytes=1000, output_key="RESULT:")
+
+    assert result.stdout == "RESULT:" + "y" * 500
+    assert not result.profile.output_truncated
+    assert os.path.getsize(result.profile.stdout_spill_path) == result.profile.stdout_bytes
+
+
+def test_output_limit_defaults_to_environment(monkeypatch):
+    monkeypatch.setenv("AGENT_STUDIO_TOOL_MAX_OUTPUT_BYTES", "2048")
+    assert execution.get_max_tool_output_bytes() == 2048
+    assert execution.get_max_tool_output_bytes(100) == 100
+
+
+def test_profiles_are_attached_to_events_and_summarized():
+    set_trace_id("trace-profiles")
+    record_tool_execution("tool-1", "Search", ToolExecutionProfile(wall_ms=100, peak_rss_kb=10, exit_status=0))
+    record_tool_execution("tool-1", "Search", ToolExecutionProfile(wall_ms=300, peak_rss_kb=30, exit_status=1))
+    record_tool_execution("tool-2", "Fetch", ToolExecutionProfile(wall_ms=50, exit_status=0))
+
+    assert pop_tool_execution_profile("tool-1")["wall_ms"] == 100
+    assert pop_tool_execution_profile("tool-1")["wall_ms"] == 300
+    assert pop_tool_execution_profile("tool-1") is None
+
+    summary = pop_tool_usage_summary("trace-profiles")
+    assert summary["tool-1"]["calls"] == 2
+    assert summary["tool-1"]["failed_calls"] == 1
+    assert summary["tool-1"]["mean_wall_ms"] == 200
+    assert summary["tool-1"]["max_peak_rss_kb"] == 30
+    assert summary["tool-2"]["tool_name"] == "Fetch"
+    assert pop_tool_usage_summary("trace-profiles") == {}
+
+
+def test_timeout_stops_the_tool_and_its_children():
+    code = "import subprocess, time; subprocess.Popen(['sleep', '30']); time.sleep(30)"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], limits=ToolResourceLimits(timeout_seconds=0.5))
+
+    assert result.profile.wall_ms < 10_000
+    assert result.profile.limit_error.limit == "timeout"
+    assert result.profile.limit_error.limit_value == 0.5
+
+
+def test_memory_limit_is_reported():
+    # Limits apply right after the spawn, give them a moment to be in place.
+    code = "import time; time.sleep(0.2); data = bytearray(512 * 1024 * 1024)"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], limits=ToolResourceLimits(max_memory_mb=256))
+
+    assert result.returncode != 0
+    assert result.profile.limit_error.limit == "memory"
+
+
+def test_native_crash_under_memory_limit_is_reported():
+    code = "import os; os.abort()"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], limits=ToolResourceLimits(max_memory_mb=256))
+
+    assert result.profile.limit_error.limit == "memory"
+    assert run_tool_subprocess([sys.executable, "-c", code]).profile.limit_error is None
+
+
+def test_cpu_limit_is_reported():
+    code = "while True: pass"
+
+    result = run_tool_subprocess(
+        [sys.executable, "-c", code], limits=ToolResourceLimits(max_cpu_seconds=1, timeout_seconds=30)
+    )
+
+    assert result.profile.limit_error.limit == "cpu"
+
+
+def test_nice_level_is_applied():
+    code = "import os, time; time.sleep(0.2); print(os.nice(0))"
+
+    result = run_tool_subprocess([sys.executable, "-c", code], limits=ToolResourceLimits(nice=7))
+
+    assert int(result.stdout) == os.nice(0) + 7
+    assert result.profile.limit_error is None
+
+
+def test_limits_are_applied_without_preexec_fn(monkeypatch):
+    popen = execution.subprocess.Popen
+    popen_kwargs = []
+
+    def spy_popen(*args, **kwargs):
+        popen_kwargs.append(kwargs)
+        return popen(*args, **kwargs)
+
+    monkeypatch.setattr(execution.subprocess, "Popen", spy_popen)
+    limits = ToolResourceLimits(max_memory_mb=256, max_cpu_seconds=10, nice=1)
+
+    result = run_tool_subprocess([sys.executable, "-c", "print('ok')"], limits=limits)
+
+    assert result.stdout.strip() == "ok"
+    assert popen_kwargs[0].get("preexec_fn") is None
+    assert execution.get_tool_resource_limits().nice == 0
+
+
+def test_concurrent_tool_processes_are_capped(monkeypatch):
+    monkeypatch.setattr(execution, "_tool_process_slots", threading.BoundedSemaphore(1))
+    code = "import time; time.sleep(0.3)"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(lambda _: run_tool_subprocess([sys.executable, "-c", code]), range(2)))
+
+    assert max(result.profile.queue_ms for result in results) > 200
+
+
+def test_tool_limits_default_to_environment(monkeypatch):
+    monkeypatch.setenv("AGENT_STUDIO_TOOL_TIMEOUT_SECONDS", "30")
+    monkeypatch.setenv("AGENT_STUDIO_TOOL_MAX_MEMORY_MB", "1024")
+
+    limits = execution.get_tool_resource_limits(max_memory_mb=2048)
+
+    assert limits.timeout_seconds == 30
+    assert limits.max_memory_mb == 2048
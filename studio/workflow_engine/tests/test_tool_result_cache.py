@@ -0,0 +1,120 @@
+import os
+import time
+import pytest
+
+import engine.tool.result_cache as result_cache
+from engine.crewai.trace_context import set_trace_id
+from engine.tool.execution import pop_tool_execution_profile, pop_tool_usage_summary
+from engine.tool.result_cache import (
+    DiskToolResultCache,
+    MemoryToolResultCache,
+    call_with_tool_result_cache,
+    get_tool_result_cache_key,
+)
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    cache = DiskToolResultCache(str(tmp_path / "cache"), max_entries=3)
+    monkeypatch.setattr(result_cache, "_tool_result_cache", cache)
+    return cache
+
+
+def test_disk_cache_round_trip_and_ttl(disk_cache):
+    disk_cache.put("a", {"rows": [1, 2]}, ttl_seconds=60)
+    disk_cache.put("b", "expired", ttl_seconds=-1)
+
+    assert disk_cache.get("a") == (True, {"rows": [1, 2]})
+    assert disk_cache.get("b") == (False, None)
+    assert not os.path.exists(os.path.join(disk_cache.cache_dir, "b.json"))
+    assert disk_cache.get("missing") == (False, None)
+
+
+def test_disk_cache_is_shared_between_instances(disk_cache):
+    disk_cache.put("a", "result", ttl_seconds=60)
+    assert DiskToolResultCache(disk_cache.cache_dir).get("a") == (True, "result")
+
+
+def test_disk_cache_evicts_least_recently_used(disk_cache):
+    for i, key in enumerate(["a", "b", "c"]):
+        disk_cache.put(key, key, ttl_seconds=60)
+        os.utime(os.path.join(disk_cache.cache_dir, f"{key}.json"), (time.time() - 100 + i, time.time() - 100 + i))
+    assert disk_cache.get("a")[0]
+
+    disk_cache.put("d", "d", ttl_seconds=60)
+
+    assert disk_cache.get("b") == (False, None)
+    assert [disk_cache.get(key)[0] for key in ["a", "c", "d"]] == [True, True, True]
+
+
+def test_disk_cache_only_scans_when_over_the_limit(tmp_path, monkeypatch):
+    cache = DiskToolResultCache(str(tmp_path / "cache"), max_entries=20)
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(result_cache.os, "scandir", lambda path: scans.append(path) or scandir(path))
+
+    for i in range(20):
+        cache.put(str(i), i, ttl_seconds=60)
+        cache.put(str(i), i, ttl_seconds=60)
+    assert len(scans) == 1
+
+    cache.put("20", 20, ttl_seconds=60)
+    assert len(scans) == 2
+    assert len([name for name in os.listdir(cache.cache_dir) if name.endswith(".json")]) == 18
+    for i in range(21, 23):
+        cache.put(str(i), i, ttl_seconds=60)
+    assert len(scans) == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryToolResultCache(max_entries=2)
+    cache.put("a", 1, ttl_seconds=60)
+    cache.put("b", 2, ttl_seconds=60)
+    cache.get("a")
+    cache.put("c", 3, ttl_seconds=60)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+
+def test_key_depends_on_code_and_arguments():
+    key = get_tool_result_cache_key("tool-1", "hash", {"api_key": "x"}, {"a": 1, "b": 2})
+
+    assert key == get_tool_result_cache_key("tool-1", "hash", {"api_key": "x"}, {"b": 2, "a": 1})
+    assert key != get_tool_result_cache_key("tool-1", "other-hash", {"api_key": "x"}, {"a": 1, "b": 2})
+    assert key != get_tool_result_cache_key("tool-1", "hash", {"api_key": "y"}, {"a": 1, "b": 2})
+    assert key != get_tool_result_cache_key("tool-2", "hash", {"api_key": "x"}, {"a": 1, "b": 2})
+
+
+def test_cached_calls_report_hit_rate(disk_cache):
+    set_trace_id("trace-result-cache")
+    calls = []
+
+    def call():
+        calls.append(1)
+        return f"result {len(calls)}", True
+
+    results = [call_with_tool_result_cache(60, "tool-1", "Query", "hash", {}, {"q": "x"}, call) for _ in range(3)]
+
+    assert results == ["result 1"] * 3
+    assert len(calls) == 1
+    assert pop_tool_execution_profile("tool-1")["cache_hit"]
+    summary = pop_tool_usage_summary("trace-result-cache")["tool-1"]
+    assert summary["cache_hits"] == 2
+    assert summary["cache_misses"] == 1
+    assert summary["cache_hit_rate"] == 0.667
+
+
+def test_failed_and_uncached_calls_run_every_time(disk_cache):
+    calls = []
+
+    def failing_call():
+        calls.append(1)
+        return "Error: boom", False
+
+    call_with_tool_result_cache(60, "tool-1", "Query", "hash", {}, {}, failing_call)
+    call_with_tool_result_cache(60, "tool-1", "Query", "hash", {}, {}, failing_call)
+    call_with_tool_result_cache(None, "tool-2", "Query", "hash", {}, {}, lambda: (calls.append(1), True))
+    call_with_tool_result_cache(None, "tool-2", "Query", "hash", {}, {}, lambda: (calls.append(1), True))
+
+    assert len(calls) == 4
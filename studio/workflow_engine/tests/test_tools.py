@@ -3,10 +3,17 @@ import sys
 __import__("pysqlite3")
 sys.modules["sqlite3"] = sys.modules.pop("pysqlite3")
 
+import os
 import pytest
 from unittest.mock import patch
 
-from engine.crewai.tools import extract_tool_class_name, is_venv_tool, get_crewai_tool
+from engine.crewai.tools import (
+    extract_tool_class_name,
+    is_venv_tool,
+    get_crewai_tool,
+    get_tool_instance_proxy,
+    get_tool_proxy_runner,
+)
 from engine.types import Input__ToolInstance
 
 
@@ -116,3 +123,71 @@ def test_get_crewai_tool_tool_proxy(
     )
     out = get_crewai_tool(tool_instance, {}, "/fake/workflow/directory")
     mock_get_tool_instance_proxy.assert_called_once()
+
+
+V1_TOOL_CODE = """
+from typing import Type
+from pydantic import BaseModel, Field
+from pydantic import BaseModel as StudioBaseTool
+
+
+class UserParameters(BaseModel):
+    greeting: str
+
+
+class GreetTool(StudioBaseTool):
+    class ToolParameters(BaseModel):
+        person: str = Field(description="Who to greet")
+
+    name: str = "Greet"
+    description: str = "Greets a person"
+    args_schema: Type[BaseModel] = ToolParameters
+    user_parameters: dict = {}
+
+    def _run(self, person: str) -> str:
+        print("this should not end up in the tool output")
+        return f"{self.user_parameters['greeting']}, {person}!"
+"""
+
+
+@pytest.fixture
+def v1_tool_workflow_dir(tmp_path):
+    tool_dir = tmp_path / "tool"
+    (tool_dir / ".venv" / "bin").mkdir(parents=True)
+    os.symlink(sys.executable, tool_dir / ".venv" / "bin" / "python")
+    (tool_dir / "tool.py").write_text(V1_TOOL_CODE)
+    return tmp_path
+
+
+@pytest.fixture
+def v1_tool_instance():
+    return Input__ToolInstance(
+        id="v1-tool",
+        name="Greeter",
+        python_code_file_name="tool.py",
+        python_requirements_file_name="requirements.txt",
+        tool_metadata="{}",
+        source_folder_path="tool",
+    )
+
+
+def test_tool_instance_proxy_runs_tool(v1_tool_workflow_dir, v1_tool_instance):
+    tool = get_tool_instance_proxy(v1_tool_instance, {"greeting": "Hello"}, str(v1_tool_workflow_dir))
+    assert tool._run(person="Ada") == "Hello, Ada!"
+    assert tool._run("Grace") == "Hello, Grace!"
+
+
+def test_tool_proxy_runner_cached_against_mtime(v1_tool_workflow_dir):
+    tool_file = v1_tool_workflow_dir / "tool" / "tool.py"
+    runner_path = get_tool_proxy_runner(str(tool_file))
+    runner_mtime = os.stat(runner_path).st_mtime_ns
+
+    assert get_tool_proxy_runner(str(tool_file)) == runner_path
+    assert os.stat(runner_path).st_mtime_ns == runner_mtime
+
+    tool_file.write_text(V1_TOOL_CODE.replace("GreetTool", "WaveTool"))
+    stat = os.stat(tool_file)
+    os.utime(tool_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert get_tool_proxy_runner(str(tool_file)) == runner_path
+    with open(runner_path) as runner_file:
+        assert "WaveTool(user_parameters" in runner_file.read()
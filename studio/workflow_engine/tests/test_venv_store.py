@@ -0,0 +1,177 @@
+import os
+import pytest
+
+import engine.tool.venv_store as venv_store
+
+
+@pytest.fixture(autouse=True)
+def venv_store_dir(tmp_path, monkeypatch):
+    store_dir = tmp_path / "store"
+    monkeypatch.setenv("AGENT_STUDIO_TOOL_VENV_STORE", str(store_dir))
+    return store_dir
+
+
+def _make_tool(tmp_path, name, requirements):
+    tool_dir = tmp_path / name
+    tool_dir.mkdir()
+    (tool_dir / "requirements.txt").write_text(requirements)
+    return tool_dir
+
+
+class FakeBuilder:
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, venv_dir):
+        os.makedirs(os.path.join(venv_dir, "bin"))
+        open(os.path.join(venv_dir, "bin", "python"), "w").close()
+        self.built.append(venv_dir)
+
+
+def _link(tool_dir, build):
+    return venv_store.link_shared_venv(str(tool_dir / ".venv"), str(tool_dir / "requirements.txt"), build)
+
+
+def test_tools_with_same_requirements_share_one_venv(tmp_path):
+    build = FakeBuilder()
+    tool_a = _make_tool(tmp_path, "tool_a", "requests==2.32.3\npandas\n")
+    tool_b = _make_tool(tmp_path, "tool_b", "# data tools\npandas\n\nrequests==2.32.3\n")
+
+    entry_a = _link(tool_a, build)
+    entry_b = _link(tool_b, build)
+
+    assert entry_a == entry_b
+    assert len(build.built) == 1
+    assert os.path.realpath(tool_a / ".venv") == os.path.realpath(entry_a)
+    assert os.path.exists(tool_b / ".venv" / "bin" / "python")
+    assert venv_store.get_venv_store_usage() == {os.path.basename(entry_a): 2}
+
+
+def test_different_requirements_get_different_venvs(tmp_path):
+    build = FakeBuilder()
+    tool_a = _make_tool(tmp_path, "tool_a", "requests\n")
+    tool_b = _make_tool(tmp_path, "tool_b", "pandas\n")
+
+    assert _link(tool_a, build) != _link(tool_b, build)
+    assert len(build.built) == 2
+
+
+def test_relinking_after_requirements_change(tmp_path):
+    build = FakeBuilder()
+    tool = _make_tool(tmp_path, "tool", "requests\n")
+    old_entry = _link(tool, build)
+
+    (tool / "requirements.txt").write_text("requests\npandas\n")
+    new_entry = _link(tool, build)
+
+    assert new_entry != old_entry
+    assert os.path.realpath(tool / ".venv") == os.path.realpath(new_entry)
+    assert venv_store.get_venv_store_usage()[os.path.basename(old_entry)] == 0
+
+
+def test_collect_unused_venvs(tmp_path):
+    build = FakeBuilder()
+    tool_a = _make_tool(tmp_path, "tool_a", "requests\n")
+    tool_b = _make_tool(tmp_path, "tool_b", "requests\n")
+    entry = _link(tool_a, build)
+    _link(tool_b, build)
+
+    os.unlink(tool_a / ".venv")
+    assert venv_store.collect_unused_venvs() == []
+    assert os.path.isdir(entry)
+
+    os.unlink(tool_b / ".venv")
+    assert venv_store.collect_unused_venvs() == [os.path.basename(entry)]
+    assert not os.path.exists(entry)
+
+
+def test_incomplete_venv_is_rebuilt(tmp_path):
+    tool = _make_tool(tmp_path, "tool", "requests\n")
+
+    def failing_build(venv_dir):
+        os.makedirs(venv_dir)
+        raise RuntimeError("COULD NOT INSTALL REQUIREMENTS")
+
+    with pytest.raises(RuntimeError):
+        _link(tool, failing_build)
+    assert not os.path.lexists(tool / ".venv")
+
+    build = FakeBuilder()
+    entry = _link(tool, build)
+    assert build.built == [entry]
+
+
+def test_existing_private_venv_is_replaced_by_link(tmp_path):
+    tool = _make_tool(tmp_path, "tool", "requests\n")
+    (tool / ".venv" / "bin").mkdir(parents=True)
+
+    entry = _link(tool, FakeBuilder())
+
+    assert os.path.islink(tool / ".venv")
+    assert os.path.realpath(tool / ".venv") == os.path.realpath(entry)
+
+
+def test_local_requirements_are_not_shareable(tmp_path):
+    assert venv_store.is_shareable_requirements(str(_make_tool(tmp_path, "a", "requests\n") / "requirements.txt"))
+    assert not venv_store.is_shareable_requirements(str(_make_tool(tmp_path, "b", "-e .\n") / "requirements.txt"))
+    assert not venv_store.is_shareable_requirements(str(_make_tool(tmp_path, "c", "./pkg\n") / "requirements.txt"))
+
+
+def test_install_fingerprint_tracks_requirements_and_index(tmp_path, monkeypatch):
+    tool = _make_tool(tmp_path, "tool", "requests\n")
+    requirements = str(tool / "requirements.txt")
+    monkeypatch.delenv("UV_DEFAULT_INDEX", raising=False)
+    fingerprint = venv_store.get_install_fingerprint(requirements)
+
+    assert venv_store.get_install_fingerprint(requirements) == fingerprint
+
+    monkeypatch.setenv("UV_DEFAULT_INDEX", "https://mirror.example.com/simple")
+    assert venv_store.get_install_fingerprint(requirements) != fingerprint
+
+    monkeypatch.delenv("UV_DEFAULT_INDEX")
+    (tool / "requirements.txt").write_text("requests\npandas\n")
+    assert venv_store.get_install_fingerprint(requirements) != fingerprint
+
+
+def test_index_change_reinstalls_shared_venv_in_place(tmp_path, monkeypatch):
+    tool = _make_tool(tmp_path, "tool", "requests\n")
+    installs = []
+
+    def build(venv_dir):
+        os.makedirs(os.path.join(venv_dir, "bin"), exist_ok=True)
+        open(os.path.join(venv_dir, "bin", "python"), "a").close()
+        installs.append(venv_dir)
+
+    entry = _link(tool, build)
+    open(os.path.join(entry, "installed_package"), "w").close()
+    _link(tool, build)
+    assert len(installs) == 1
+
+    monkeypatch.setenv("UV_DEFAULT_INDEX", "https://mirror.example.com/simple")
+    _link(tool, build)
+    assert len(installs) == 2
+    assert os.path.exists(os.path.join(entry, "installed_package"))
+
+
+def test_prepare_always_installs_private_requirements(tmp_path, monkeypatch):
+    from engine.crewai import tools
+
+    tool = _make_tool(tmp_path, "tool", "-r base.txt\n")
+    (tool / "base.txt").write_text("requests\n")
+    installs = []
+
+    def create_venv(venv_dir, with_, source_folder_path):
+        os.makedirs(os.path.join(venv_dir, "bin"), exist_ok=True)
+        open(os.path.join(venv_dir, "bin", "python"), "a").close()
+
+    monkeypatch.setattr(tools, "_create_virtual_env_at", create_venv)
+    monkeypatch.setattr(tools, "_install_requirements", lambda *args: installs.append(args))
+
+    assert tools.prepare_virtual_env_for_tool(str(tool), "requirements.txt") is True
+    assert not os.path.islink(tool / ".venv")
+
+    # The fingerprint only sees "-r base.txt", an edit of base.txt must still be installed.
+    (tool / "base.txt").write_text("requests\npandas\n")
+    assert tools.prepare_virtual_env_for_tool(str(tool), "requirements.txt") is True
+    assert len(installs) == 2
+    assert not os.path.exists(tool / ".venv" / venv_store.REQUIREMENTS_HASH_FILE)
@@ -0,0 +1,73 @@
+import json
+import hashlib
+import platform
+import pytest
+
+import engine.tool.wheelhouse as wheelhouse
+from engine.tool import venv_store
+from engine.tool.wheel_bundles import get_tool_wheel_bundle_dir, get_wheel_bundle_target
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENT_STUDIO_WHEELHOUSE", str(tmp_path / "wheelhouse"))
+    monkeypatch.delenv("UV_DEFAULT_INDEX", raising=False)
+    monkeypatch.delenv("UV_INSECURE_HOST", raising=False)
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("requests==2.32.3\n")
+    bundle_dir = tmp_path / "tool_wheels"
+    (bundle_dir / "wheels").mkdir(parents=True)
+    (bundle_dir / "wheels" / "requests-2.32.3-py3-none-any.whl").write_bytes(b"wheel")
+    lock = {
+        **get_wheel_bundle_target(),
+        "requirements": {
+            venv_store.get_requirements_key(str(requirements)): {
+                "wheels": {"requests-2.32.3-py3-none-any.whl": hashlib.sha256(b"wheel").hexdigest()}
+            }
+        },
+    }
+    (bundle_dir / "lock.json").write_text(json.dumps(lock))
+    return bundle_dir, requirements
+
+
+def test_verified_bundle_is_used(bundle):
+    bundle_dir, requirements = bundle
+    assert get_tool_wheel_bundle_dir(str(bundle_dir), str(requirements)) == str(bundle_dir / "wheels")
+
+
+def test_bundle_of_another_interpreter_is_not_used(bundle):
+    bundle_dir, requirements = bundle
+    lock = json.loads((bundle_dir / "lock.json").read_text())
+    lock["python"] = "2.7"
+    (bundle_dir / "lock.json").write_text(json.dumps(lock))
+    assert get_tool_wheel_bundle_dir(str(bundle_dir), str(requirements)) is None
+
+
+def test_bundle_is_used_across_python_micro_versions(bundle, monkeypatch):
+    bundle_dir, requirements = bundle
+    venv_key = venv_store.get_venv_key(str(requirements))
+    major, minor, _ = platform.python_version_tuple()
+    monkeypatch.setattr(platform, "python_version", lambda: f"{major}.{minor}.999")
+    assert venv_store.get_venv_key(str(requirements)) != venv_key
+    assert get_tool_wheel_bundle_dir(str(bundle_dir), str(requirements)) == str(bundle_dir / "wheels")
+
+
+def test_corrupt_or_unlisted_wheels_are_not_used(bundle, tmp_path):
+    bundle_dir, requirements = bundle
+    other_requirements = tmp_path / "other.txt"
+    other_requirements.write_text("httpx\n")
+    assert get_tool_wheel_bundle_dir(str(bundle_dir), str(other_requirements)) is None
+
+    (bundle_dir / "wheels" / "requests-2.32.3-py3-none-any.whl").write_bytes(b"tampered")
+    assert get_tool_wheel_bundle_dir(str(bundle_dir), str(requirements)) is None
+
+
+def test_install_tries_bundle_before_index():
+    assert wheelhouse.get_install_commands(["uv", "pip", "install"], "/workflow/tool_wheels/wheels") == [
+        ["uv", "pip", "install", "--no-index", "--find-links", "/workflow/tool_wheels/wheels"],
+        ["uv", "pip", "install"],
+    ]
@@ -0,0 +1,96 @@
+import os
+import sys
+import subprocess
+import pytest
+
+import engine.tool.wheelhouse as wheelhouse
+
+
+@pytest.fixture(autouse=True)
+def wheelhouse_dir(tmp_path, monkeypatch):
+    wheelhouse_dir = tmp_path / "wheelhouse"
+    monkeypatch.setenv("AGENT_STUDIO_WHEELHOUSE", str(wheelhouse_dir))
+    monkeypatch.setenv("AGENT_STUDIO_TOOL_VENV_STORE", str(tmp_path / "store"))
+    monkeypatch.delenv("AGENT_STUDIO_WHEELHOUSE_OFFLINE", raising=False)
+    monkeypatch.delenv("UV_DEFAULT_INDEX", raising=False)
+    monkeypatch.delenv("UV_INSECURE_HOST", raising=False)
+    return wheelhouse_dir
+
+
+def _populate(wheelhouse_dir):
+    wheelhouse_dir.mkdir(exist_ok=True)
+    (wheelhouse_dir / "requests-2.32.3-py3-none-any.whl").write_text("")
+
+
+def test_install_uses_index_without_wheelhouse(monkeypatch):
+    monkeypatch.setenv("UV_DEFAULT_INDEX", "https://mirror.example.com/simple")
+    assert wheelhouse.get_install_commands(["uv", "pip", "install"]) == [
+        ["uv", "pip", "install", "--index-url", "https://mirror.example.com/simple"]
+    ]
+
+
+def test_install_uses_wheelhouse_with_index(wheelhouse_dir):
+    _populate(wheelhouse_dir)
+    assert wheelhouse.get_install_commands(["uv", "pip", "install"]) == [
+        ["uv", "pip", "install", "--find-links", str(wheelhouse_dir)],
+    ]
+
+
+def test_offline_install_never_reaches_index(wheelhouse_dir, monkeypatch):
+    _populate(wheelhouse_dir)
+    monkeypatch.setenv("AGENT_STUDIO_WHEELHOUSE_OFFLINE", "true")
+    assert wheelhouse.get_install_commands(["uv", "pip", "install"]) == [
+        ["uv", "pip", "install", "--no-index", "--find-links", str(wheelhouse_dir)],
+    ]
+    assert wheelhouse.get_mcp_server_env()["UV_OFFLINE"] == "true"
+
+
+def test_install_falls_back_from_wheel_bundle(wheelhouse_dir, tmp_path):
+    _populate(wheelhouse_dir)
+    # Fails when restricted to the wheel bundle, as if a wheel is missing from it.
+    command = [sys.executable, "-c", "import sys; sys.exit('--no-index' in sys.argv)"]
+
+    result = wheelhouse.run_install_commands(command, os.environ.copy(), str(tmp_path / "bundle"))
+
+    assert result.returncode == 0
+    assert "--no-index" not in result.args
+    assert str(wheelhouse_dir) in result.args
+
+
+def test_mcp_servers_use_wheelhouse(wheelhouse_dir):
+    assert "UV_FIND_LINKS" not in wheelhouse.get_mcp_server_env()
+    _populate(wheelhouse_dir)
+    assert wheelhouse.get_mcp_server_env()["UV_FIND_LINKS"] == str(wheelhouse_dir)
+
+
+def test_npm_prefer_offline_is_opt_in(monkeypatch):
+    monkeypatch.delenv("AGENT_STUDIO_NPM_PREFER_OFFLINE", raising=False)
+    assert "npm_config_prefer_offline" not in wheelhouse.get_mcp_server_env()
+    monkeypatch.setenv("AGENT_STUDIO_NPM_PREFER_OFFLINE", "true")
+    assert wheelhouse.get_mcp_server_env()["npm_config_prefer_offline"] == "true"
+
+
+def test_warm_skips_already_warmed_requirements(tmp_path, wheelhouse_dir, monkeypatch):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("requests\n")
+    wheel_runs = []
+
+    def fake_run(command, **kwargs):
+        if "wheel" in command:
+            wheel_runs.append(command)
+            wheel_dir = command[command.index("--wheel-dir") + 1]
+            with open(os.path.join(wheel_dir, "requests-2.32.3-py3-none-any.whl"), "w") as f:
+                f.write("wheel")
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.setattr(wheelhouse.shutil, "which", lambda _: "uv")
+    monkeypatch.setattr(wheelhouse.subprocess, "run", fake_run)
+
+    assert wheelhouse.warm_wheelhouse([str(requirements)]) == [str(requirements)]
+    assert wheelhouse.warm_wheelhouse([str(requirements)]) == []
+    assert len(wheel_runs) == 1
+    assert wheel_runs[0][wheel_runs[0].index("--wheel-dir") + 1] != str(wheelhouse_dir)
+    assert sorted(os.listdir(wheelhouse_dir)) == [".lock", ".warmed.json", "requests-2.32.3-py3-none-any.whl"]
+
+    requirements.write_text("requests\npandas\n")
+    assert wheelhouse.warm_wheelhouse([str(requirements)]) == [str(requirements)]
@@ -0,0 +1,92 @@
+import time
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from studio.cross_cutting import apiv2
+from studio.proto.agent_studio_pb2 import DeployedWorkflow
+
+
+def _make_dao(model_ids):
+    dao = MagicMock()
+    session = dao.get_session.return_value.__enter__.return_value
+
+    def filter_by(id):
+        query = MagicMock()
+        query.one_or_none.return_value = SimpleNamespace(cml_deployed_model_id=model_ids[id]) if id in model_ids else None
+        return query
+
+    session.query.return_value.filter_by.side_effect = filter_by
+    return dao
+
+
+class FakeCml:
+    def __init__(self, failing_models=(), delay=0.0):
+        self.failing_models = set(failing_models)
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.created = []
+        self.lock = threading.Lock()
+
+    def list_model_builds(self, project_id, model_id):
+        return SimpleNamespace(model_builds=[SimpleNamespace(id=f"{model_id}-build", created_at=1)])
+
+    def list_model_deployments(self, project_id, model_id, build_id):
+        return SimpleNamespace(
+            model_deployments=[
+                SimpleNamespace(created_at=1, environment='{"A": "1"}', cpu=1, memory=2, replicas=1)
+            ]
+        )
+
+    def create_model_deployment(self, body, project_id, model_id, build_id):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+            self.created.append((model_id, body.environment))
+        if model_id in self.failing_models:
+            raise RuntimeError("model is gone")
+
+
+@patch("studio.cross_cutting.apiv2.get_api_key_from_env", return_value=("key-id", "new-key"))
+@patch("studio.cross_cutting.apiv2.get_deployed_workflows")
+def test_redeploy_all_workflows_is_bounded_and_isolates_failures(mock_get_deployed, mock_get_key):
+    model_ids = {f"d{i}": f"m{i}" for i in range(6)}
+    mock_get_deployed.return_value = [DeployedWorkflow(deployed_workflow_id=f"d{i}") for i in range(7)]
+    cml = FakeCml(failing_models={"m2"}, delay=0.05)
+
+    report = apiv2.redeploy_all_workflows(cml, _make_dao(model_ids), max_concurrency=3, rate_limit=0)
+
+    assert mock_get_key.call_count == 1
+    assert cml.max_running <= 3
+    assert cml.max_running > 1
+    assert report.count("redeployed") == 5
+    assert report.count("failed") == 1
+    assert report.count("skipped") == 1
+    failed = [result for result in report.results if result.status == "failed"][0]
+    assert failed.deployed_workflow_id == "d2"
+    assert "model is gone" in failed.message
+    assert all(environment == {"A": "1", "CDSW_APIV2_KEY": "new-key"} for _, environment in cml.created)
+    assert "Redeployed 5 of 7 workflows" in report.get_summary()
+
+
+def test_cml_api_rate_limiter():
+    limiter = apiv2.CmlApiRateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limited_client_waits_before_calls():
+    limiter = MagicMock()
+    cml = MagicMock()
+    cml.get_project.return_value = "project"
+
+    client = apiv2.RateLimitedCMLServiceApi(cml, limiter)
+
+    assert client.get_project("p") == "project"
+    limiter.acquire.assert_called_once()
@@ -0,0 +1,182 @@
+import os
+import json
+import shutil
+import threading
+import email
+import email.policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+import cmlapi
+
+from studio.cross_cutting import apiv2
+from engine.file_parts import assemble_file_parts
+
+
+class ProjectFilesServer(ThreadingHTTPServer):
+    """
+    Stand-in for the project files API of a workspace, backed by a local directory.
+    """
+
+    def __init__(self, project_root):
+        super().__init__(("127.0.0.1", 0), ProjectFilesHandler)
+        self.project_root = project_root
+        self.failures = {}
+        self.uploads = []
+        self.lock = threading.Lock()
+
+
+class ProjectFilesHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, status):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        message = email.message_from_bytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body, policy=email.policy.default
+        )
+        for part in message.iter_parts():
+            target = part.get_param("name", header="content-disposition")
+            with self.server.lock:
+                if self.server.failures.get(target, 0) > 0:
+                    self.server.failures[target] -= 1
+                    return self._respond(503)
+                self.server.uploads.append(target)
+            path = os.path.join(self.server.project_root, target)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(part.get_payload(decode=True))
+        self._respond(200)
+
+    def do_DELETE(self):
+        target = unquote(self.path.split("/files/", 1)[1])
+        path = os.path.join(self.server.project_root, target)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.isfile(path):
+            os.remove(path)
+        else:
+            return self._respond(404)
+        self._respond(200)
+
+
+@pytest.fixture
+def project_files(tmp_path, monkeypatch):
+    project_root = tmp_path / "project"
+    project_root.mkdir()
+    monkeypatch.setattr(apiv2, "PROJECT_FILESYSTEM_ROOT", str(project_root))
+    monkeypatch.setenv("AGENT_STUDIO_UPLOAD_CHUNK_SIZE", "1000")
+    monkeypatch.setenv("AGENT_STUDIO_UPLOAD_RETRY_BACKOFF_SECONDS", "0")
+    server = ProjectFilesServer(str(project_root))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    configuration = cmlapi.Configuration()
+    configuration.host = f"http://127.0.0.1:{server.server_address[1]}"
+    client = cmlapi.CMLServiceApi(cmlapi.ApiClient(configuration))
+    yield server, client, project_root
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    path = tmp_path / "artifact.tar.gz"
+    path.write_bytes(os.urandom(4500))
+    return path
+
+
+def test_small_files_are_uploaded_whole(project_files, tmp_path):
+    server, client, project_root = project_files
+    path = tmp_path / "workbench.py"
+    path.write_text("print('hello')")
+    progress = []
+
+    apiv2.upload_file_to_project(client, "p", "deploy/workbench.py", str(path), lambda *args: progress.append(args))
+
+    assert (project_root / "deploy" / "workbench.py").read_text() == "print('hello')"
+    assert not (project_root / "deploy" / "workbench.py.parts").exists()
+    assert progress == [(14, 14)]
+
+
+def test_large_files_are_uploaded_in_parts(project_files, large_file):
+    server, client, project_root = project_files
+    (project_root / "deploy").mkdir()
+    (project_root / "deploy" / "artifact.tar.gz").write_bytes(b"stale whole file")
+    progress = []
+
+    apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(large_file), lambda *args: progress.append(args))
+
+    parts_dir = project_root / "deploy" / "artifact.tar.gz.parts"
+    manifest = json.loads((parts_dir / "parts.json").read_text())
+    assert [part["name"] for part in manifest["parts"]] == [f"part-0000{i}" for i in range(5)]
+    assert server.uploads[-1] == "deploy/artifact.tar.gz.parts/parts.json"
+    assert not (project_root / "deploy" / "artifact.tar.gz").exists()
+    assert sorted(uploaded for uploaded, _ in progress)[-1] == 4500
+    assert all(total == 4500 for _, total in progress)
+
+    # Consumers assemble the file from its parts, and the project file is current.
+    assert apiv2.get_project_file_fingerprint("deploy/artifact.tar.gz") == (4500, apiv2.get_file_sha256(str(large_file)))
+    assert apiv2.is_project_file_current("deploy/artifact.tar.gz", str(large_file))
+    assert assemble_file_parts(str(project_root / "deploy" / "artifact.tar.gz"))
+    assert (project_root / "deploy" / "artifact.tar.gz").read_bytes() == large_file.read_bytes()
+
+
+def test_transient_part_failures_are_retried(project_files, large_file):
+    server, client, project_root = project_files
+    server.failures["deploy/artifact.tar.gz.parts/part-00002"] = 2
+
+    apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(large_file))
+
+    assert server.uploads.count("deploy/artifact.tar.gz.parts/part-00002") == 1
+    assert (project_root / "deploy" / "artifact.tar.gz.parts" / "parts.json").exists()
+
+
+def test_failed_uploads_resume(project_files, large_file, monkeypatch):
+    server, client, project_root = project_files
+    monkeypatch.setenv("AGENT_STUDIO_UPLOAD_CONCURRENCY", "1")
+    server.failures["deploy/artifact.tar.gz.parts/part-00003"] = 3
+
+    with pytest.raises(RuntimeError, match="resumes the upload"):
+        apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(large_file))
+    assert not (project_root / "deploy" / "artifact.tar.gz.parts" / "parts.json").exists()
+
+    server.uploads.clear()
+    apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(large_file))
+
+    # Parts that made it in the failed upload are not uploaded again.
+    assert "deploy/artifact.tar.gz.parts/part-00003" in server.uploads
+    assert not any(f"part-0000{i}" in uploaded for i in range(3) for uploaded in server.uploads)
+    assert server.uploads[-1] == "deploy/artifact.tar.gz.parts/parts.json"
+
+
+def test_parts_of_an_earlier_larger_upload_are_deleted(project_files, large_file, tmp_path):
+    server, client, project_root = project_files
+    apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(large_file))
+
+    smaller = tmp_path / "smaller.tar.gz"
+    smaller.write_bytes(os.urandom(2500))
+    apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(smaller))
+
+    parts_dir = project_root / "deploy" / "artifact.tar.gz.parts"
+    assert sorted(os.listdir(parts_dir)) == ["part-00000", "part-00001", "part-00002", "parts.json"]
+    assert assemble_file_parts(str(project_root / "deploy" / "artifact.tar.gz"))
+    assert (project_root / "deploy" / "artifact.tar.gz").read_bytes() == smaller.read_bytes()
+
+
+def test_whole_upload_replaces_parts(project_files, large_file, tmp_path):
+    server, client, project_root = project_files
+    apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(large_file))
+
+    small = tmp_path / "small.tar.gz"
+    small.write_bytes(b"small")
+    apiv2.upload_file_to_project(client, "p", "deploy/artifact.tar.gz", str(small))
+
+    assert (project_root / "deploy" / "artifact.tar.gz").read_bytes() == b"small"
+    assert not (project_root / "deploy" / "artifact.tar.gz.parts").exists()
@@ -0,0 +1,47 @@
+import os
+import tarfile
+
+from studio.deployments.package.archive import PackagingReport, iter_files, write_artifact_archive
+
+
+def _make_tree(root):
+    files = {
+        "workflow.yaml": b"type: collated_input\n",
+        "data/large.bin": os.urandom(9 * 1024 * 1024),
+        "data/.venv/bin/python": b"",
+    }
+    for name, content in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+    return files
+
+
+def test_files_are_selected_like_copytree_ignore(tmp_path):
+    _make_tree(tmp_path)
+    members = list(iter_files(str(tmp_path), "artifact", ignore=lambda src, names: {".venv"}))
+    assert [arcname for _, arcname in members] == ["artifact/workflow.yaml", "artifact/data/large.bin"]
+
+
+def test_parallel_compression_is_readable_as_one_gzip_stream(tmp_path):
+    files = _make_tree(tmp_path / "src")
+    archive_path = str(tmp_path / "artifact.tar.gz")
+
+    file_count, total_bytes = write_artifact_archive(
+        archive_path, iter_files(str(tmp_path / "src"), "."), compression_level=1, compression_threads=4
+    )
+
+    assert file_count == 3
+    assert total_bytes == sum(len(content) for content in files.values())
+    with tarfile.open(archive_path, "r:gz") as tar:
+        for name, content in files.items():
+            assert tar.extractfile(name).read() == content
+
+
+def test_report_records_each_phase():
+    report = PackagingReport()
+    with report.phase("archive") as phase:
+        phase["bytes"] = 10
+    assert report.phases["archive"]["bytes"] == 10
+    assert report.phases["archive"]["seconds"] >= 0
@@ -1,8 +1,9 @@
 import os
 import json
+import shutil
 import tarfile
-import tempfile
-from unittest.mock import patch, MagicMock, mock_open
+import pytest
+from unittest.mock import patch, MagicMock
 
 __import__('pysqlite3')
 import sys
@@ -22,37 +23,28 @@ from studio.deployments.types import (
 )
 
 
-@patch("studio.deployments.package.workflows.create_collated_input")
-@patch("studio.deployments.package.workflows.shutil.copytree")
-@patch("studio.deployments.package.workflows.os.makedirs")
-@patch("studio.deployments.package.workflows.yaml.dump")
-@patch("studio.deployments.package.workflows.json.dump")
-@patch("studio.deployments.package.workflows.tarfile.open")
-@patch("studio.deployments.package.workflows.os.walk")
-@patch("studio.deployments.package.workflows.open", new_callable=mock_open)
-def test_package_workflow_for_deployment(
-    mock_file_open,
-    mock_os_walk,
-    mock_tar_open,
-    mock_json_dump,
-    mock_yaml_dump,
-    mock_os_makedirs,
-    mock_copytree,
-    mock_create_collated_input,
-):
-    # Setup fake tar context
-    mock_tar = MagicMock()
-    mock_tar_open.return_value.__enter__.return_value = mock_tar
-
-    # Simulate a directory structure
-    mock_os_walk.return_value = [
-        ("/tmp/deployment_artifacts/fake-dir", [], ["workflow.yaml", "collated_input.json"]),
-    ]
+@pytest.fixture
+def studio_data(tmp_path, monkeypatch):
+    studio_data_dir = tmp_path / "studio-data"
+    for path in [
+        "workflows/my_dir/tools/t1/tool.py",
+        "workflows/my_dir/tools/t1/.venv/bin/python",
+        "workflows/other_dir/tools/t2/tool.py",
+        "tool_templates/template/tool.py",
+        "dynamic_assets/agent.png",
+    ]:
+        (studio_data_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (studio_data_dir / path).write_text(path)
+    monkeypatch.setattr(workflows.consts, "ALL_STUDIO_DATA_LOCATION", str(studio_data_dir))
+    return studio_data_dir
 
 
+@patch("studio.deployments.package.workflows.create_collated_input")
+def test_package_workflow_for_deployment(mock_create_collated_input, studio_data):
     # Mock return for create_collated_input
-    mock_collated_input = MagicMock()
+    mock_collated_input = MagicMock(spec=CollatedInput)
     mock_collated_input.language_models = [MagicMock()]
+    mock_collated_input.mcp_instances = []
     mock_collated_input.model_dump.return_value = {"mock": "data"}
     mock_create_collated_input.return_value = mock_collated_input
 
@@ -71,19 +63,60 @@ def test_package_workflow_for_deployment(
 
     assert isinstance(artifact, DeploymentArtifact)
     assert artifact.artifact_path.endswith("artifact.tar.gz")
-
-    mock_os_makedirs.assert_called()
-    mock_copytree.assert_called()
-    mock_yaml_dump.assert_called()
-    mock_json_dump.assert_called()
     mock_create_collated_input.assert_called_once_with(workflow, session, deployment.created_at)
 
-    added_files = [call[0][0] for call in mock_tar.add.call_args_list]
-    assert any("workflow.yaml" in f for f in added_files)
-    assert any("collated_input.json" in f for f in added_files)
-    assert all("artifact.tar.gz" not in f for f in added_files)
-    
-    
+    with tarfile.open(artifact.artifact_path, "r:gz") as tar:
+        added_files = set(tar.getnames())
+        collated_input = json.load(tar.extractfile("collated_input.json"))
+        manifest = json.load(tar.extractfile("artifact_manifest.json"))
+    shutil.rmtree(os.path.dirname(artifact.artifact_path))
+
+    assert collated_input == {"mock": "data"}
+    assert artifact.manifest_path.endswith("artifact_manifest.json")
+    assert set(manifest) == added_files - {"artifact_manifest.json"}
+    assert "artifact.tar.gz" not in added_files
+    assert added_files == {
+        "workflow.yaml",
+        "collated_input.json",
+        "artifact_manifest.json",
+        "studio-data/workflows/my_dir/tools/t1/tool.py",
+        "studio-data/dynamic_assets/agent.png",
+    }
+
+
+@patch("studio.deployments.package.workflows.uuid4", return_value="test-self-archive")
+@patch("studio.deployments.package.workflows.create_collated_input")
+def test_package_workflow_skips_self_archive(mock_create_collated_input, mock_uuid4, studio_data):
+    mock_collated_input = MagicMock(spec=CollatedInput)
+    mock_collated_input.language_models = []
+    mock_collated_input.mcp_instances = []
+    mock_collated_input.model_dump.return_value = {}
+    mock_create_collated_input.return_value = mock_collated_input
+
+    # An archive already in the packaging directory must not be archived into the new one.
+    packaging_dir = os.path.join("/tmp", "deployment_artifacts", "test-self-archive")
+    shutil.rmtree(packaging_dir, ignore_errors=True)
+    os.makedirs(packaging_dir)
+    with open(os.path.join(packaging_dir, "artifact.tar.gz"), "w") as f:
+        f.write("stale archive")
+
+    workflow = Workflow(id="wf1", name="Test Workflow", directory="my_dir")
+    deployment = DeployedWorkflowInstance(id="d1", workflow=workflow)
+    payload = DeploymentPayload(deployment_config=DeploymentConfig())
+    try:
+        artifact = workflows.package_workflow_for_deployment(payload, deployment, MagicMock(), MagicMock())
+        with open(artifact.manifest_path, "r") as f:
+            manifest = json.load(f)
+        with tarfile.open(artifact.artifact_path, "r:gz") as tar:
+            added_files = set(tar.getnames())
+    finally:
+        shutil.rmtree(packaging_dir)
+
+    assert "artifact.tar.gz" not in manifest
+    assert "artifact.tar.gz" not in added_files
+    assert added_files == set(manifest) | {"artifact_manifest.json"}
+
+
 def test_ignore_studio_data():
     ignore_fn = workflows.studio_data_workflow_ignore_factory("my-workflow-dir")
     ignored = ignore_fn("/some/path/studio-data", {"deployable_workflows", "tool_templates", "temp_files", "other"})
@@ -105,59 +138,3 @@ def test_ignore_other_directory():
     assert ".next" in ignored
     assert "node_modules" in ignored
     assert "README.md" not in ignored
-    
-    
-@patch("studio.deployments.package.workflows.create_collated_input")
-@patch("studio.deployments.package.workflows.studio_data_workflow_ignore_factory")
-@patch("studio.deployments.package.workflows.shutil.copytree")
-@patch("studio.deployments.package.workflows.os.walk")
-@patch("studio.deployments.package.workflows.tarfile.open")
-@patch("studio.deployments.package.workflows.yaml.dump")
-@patch("studio.deployments.package.workflows.open", create=True)
-@patch("studio.deployments.package.workflows.uuid4")
-def test_package_workflow_skips_self_archive(
-    mock_uuid4,
-    mock_open,
-    mock_yaml_dump,
-    mock_tarfile_open,
-    mock_os_walk,
-    mock_copytree,
-    mock_ignore_factory,
-    mock_create_collated_input,
-):
-    # Patch uuid4 to return a predictable value
-    mock_uuid4.return_value = "some-uuid"
-
-    packaging_dir = "/tmp/deployment_artifacts/some-uuid"
-    archive_path = os.path.join(packaging_dir, "artifact.tar.gz")
-
-    # Simulate os.walk returning the archive file itself
-    mock_os_walk.return_value = [
-        (packaging_dir, [], ["artifact.tar.gz", "some_other_file.txt"])
-    ]
-
-    # Patch tarfile object
-    mock_tar = MagicMock()
-    mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-
-    # Collated input
-    mock_collated_input = MagicMock(spec=CollatedInput)
-    mock_collated_input.language_models = []
-    mock_collated_input.model_dump.return_value = {}
-    mock_create_collated_input.return_value = mock_collated_input
-
-    # Payload and deployment
-    payload = DeploymentPayload(deployment_config=DeploymentConfig())
-    deployment = MagicMock(spec=DeployedWorkflowInstance)
-    deployment.workflow = MagicMock(spec=Workflow)
-    deployment.workflow.directory = "my_workflow"
-
-    mock_ignore_factory.return_value = lambda *_: set()
-
-    # Call function under test
-    artifact = workflows.package_workflow_for_deployment(payload, deployment, MagicMock(), MagicMock())
-
-    # Confirm the archive itself was skipped
-    added_files = [call.args[0] for call in mock_tar.add.call_args_list]
-    assert archive_path not in added_files
-    assert os.path.join(packaging_dir, "some_other_file.txt") in added_files
\ No newline at end of file
@@ -0,0 +1,141 @@
+import json
+from types import SimpleNamespace
+
+__import__('pysqlite3')
+import sys
+sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+
+import pytest
+
+from studio.db.dao import AgentStudioDao
+from studio.db.model import DeployedWorkflowInstance
+from studio.deployments.types import DeploymentStatus
+from studio.cross_cutting import apiv2
+from studio.deployments import status_watcher
+from studio.deployments.status_watcher import DeploymentStatusWatcher, get_cml_model_status
+
+
+class FakeCml:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = []
+
+    def list_model_builds(self, project_id, model_id):
+        self.calls.append(model_id)
+        if self.statuses[model_id] is None:
+            raise RuntimeError("model not found")
+        return SimpleNamespace(model_builds=[SimpleNamespace(id=f"{model_id}-build")])
+
+    def list_model_deployments(self, project_id, model_id, build_id):
+        return SimpleNamespace(model_deployments=[SimpleNamespace(status=self.statuses[model_id])])
+
+
+@pytest.fixture
+def dao(tmp_path):
+    dao = AgentStudioDao(engine_url=f"sqlite:///{tmp_path / 'studio.db'}")
+    with dao.get_session() as session:
+        for id, status, model_id in [
+            ("d1", DeploymentStatus.DEPLOYED, "m1"),
+            ("d2", DeploymentStatus.DEPLOYING, "m2"),
+            ("d3", DeploymentStatus.SUSPENDED, "m3"),
+            ("d4", DeploymentStatus.INITIALIZED, None),
+        ]:
+            session.add(
+                DeployedWorkflowInstance(
+                    id=id,
+                    name=id,
+                    workflow_id="w",
+                    status=status,
+                    cml_deployed_model_id=model_id,
+                    deployment_metadata=json.dumps({}),
+                )
+            )
+        session.commit()
+    return dao
+
+
+def _get(dao, id):
+    with dao.get_session() as session:
+        deployment = session.query(DeployedWorkflowInstance).filter_by(id=id).one()
+        return deployment.status, json.loads(deployment.deployment_metadata)
+
+
+def test_get_cml_model_status():
+    assert get_cml_model_status(FakeCml({"m": "Deployed"}), "m") == "deployed"
+    assert get_cml_model_status(FakeCml({"m": "stopped"}), "m") == "stopped"
+
+
+def _make_due(watcher):
+    watcher._next_polls = {key: 0 for key in watcher._next_polls}
+
+
+def test_watcher_records_transitions_and_backs_off(dao):
+    cml = FakeCml({"m1": "deployed", "m2": "pending"})
+    watcher = DeploymentStatusWatcher(cml, dao, min_interval_seconds=1, max_interval_seconds=4)
+
+    assert sorted(watcher.poll_once()) == ["d1", "d2"]
+    assert _get(dao, "d1")[1]["model_status"] == "deployed"
+    assert _get(dao, "d2")[1]["model_status"] == "pending"
+    assert watcher.poll_once() == []
+
+    # Settled deployments back off up to the max interval, in-flight ones don't.
+    for expected in [2, 4, 4]:
+        _make_due(watcher)
+        watcher.poll_once()
+        assert watcher._intervals["d1"] == expected
+        assert watcher._intervals["d2"] == 1
+
+    # Waking a deployment polls it right away, and transitions reset the interval.
+    cml.statuses["m1"] = "stopped"
+    watcher.wake("d1")
+    assert watcher.poll_once() == ["d1"]
+    assert watcher._intervals["d1"] == 1
+    status, metadata = _get(dao, "d1")
+    assert status == DeploymentStatus.DEPLOYED
+    assert metadata["model_status"] == "stopped"
+    assert "model_status_updated_at" in metadata
+
+
+def test_watcher_polls_in_batches_and_isolates_errors(dao):
+    cml = FakeCml({"m1": None, "m2": "deployed"})
+    watcher = DeploymentStatusWatcher(cml, dao, min_interval_seconds=0, batch_size=1)
+
+    first = watcher.poll_once()
+    second = watcher.poll_once()
+    assert len(first) == len(second) == 1
+    assert sorted(first + second) == ["d1", "d2"]
+    assert "model_status" not in _get(dao, "d1")[1]
+    assert _get(dao, "d2")[1]["model_status"] == "deployed"
+    assert "m3" not in cml.calls
+
+
+def test_watcher_keeps_the_last_status_when_a_poll_fails(dao):
+    cml = FakeCml({"m1": "deployed", "m2": "deployed"})
+    watcher = DeploymentStatusWatcher(cml, dao, min_interval_seconds=1, max_interval_seconds=8)
+    watcher.poll_once()
+    _make_due(watcher)
+    watcher.poll_once()
+    assert watcher._intervals["d1"] == 2
+    updated_at = _get(dao, "d1")[1]["model_status_updated_at"]
+
+    # A transient CML error is retried at the shortest interval, not recorded.
+    cml.statuses["m1"] = None
+    _make_due(watcher)
+    watcher.poll_once()
+    assert watcher._intervals["d1"] == 1
+    assert _get(dao, "d1")[1] == {"model_status": "deployed", "model_status_updated_at": updated_at}
+
+    cml.statuses["m1"] = "deployed"
+    _make_due(watcher)
+    watcher.poll_once()
+    assert watcher._intervals["d1"] == 2
+    assert _get(dao, "d1")[1]["model_status_updated_at"] == updated_at
+
+
+def test_watcher_shares_the_cml_api_rate_limiter_with_redeploys(dao, monkeypatch):
+    monkeypatch.setattr(apiv2, "_cml_api_rate_limiter", None)
+    monkeypatch.setattr(status_watcher, "_deployment_status_watcher", None)
+    monkeypatch.setattr(DeploymentStatusWatcher, "start", lambda self: None)
+
+    watcher = status_watcher.start_deployment_status_watcher(FakeCml({}), dao)
+    assert watcher.cml._rate_limiter is apiv2.get_cml_api_rate_limiter()
@@ -29,7 +29,10 @@ from studio.deployments.targets.workbench import (
     create_new_cml_model,
     deploy_artifact_to_workbench,
     monitor_workbench_deployment_for_completion,
-    get_workbench_model_deep_link
+    get_workbench_model_deep_link,
+    get_workflow_engine_package,
+    prepare_workflow_engine_package,
+    upload_workflow_artifact,
 )
 
 
@@ -371,4 +374,139 @@ def test_deploy_artifact_to_workbench_success_auto_redeploy(
     mock_update_metadata.assert_called()
     mock_monitor.assert_called_once()
     mock_create_app.assert_not_called()
-    
\ No newline at end of file
+    
+
+
+def _make_workflow_engine_dir(root):
+    engine_dir = root / "workflow_engine"
+    (engine_dir / "src" / "engine").mkdir(parents=True)
+    (engine_dir / "src" / "engine" / "__init__.py").write_text("VERSION = 1\n")
+    (engine_dir / ".venv").mkdir()
+    (engine_dir / ".venv" / "big").write_text("x" * 1000)
+    (engine_dir / "src" / "engine" / "__pycache__").mkdir()
+    (engine_dir / "src" / "engine" / "__pycache__" / "x.pyc").write_text("compiled")
+    (engine_dir / "cdsw-build.sh").write_text("#!/bin/bash\n")
+    return engine_dir
+
+
+def test_get_workflow_engine_package_is_cached_by_content(tmp_path, monkeypatch):
+    import tarfile
+
+    monkeypatch.setenv("AGENT_STUDIO_WORKFLOW_ENGINE_PACKAGE_CACHE_DIR", str(tmp_path / "cache"))
+    engine_dir = _make_workflow_engine_dir(tmp_path)
+
+    package_path, package_sha256 = get_workflow_engine_package(str(engine_dir))
+    with tarfile.open(package_path, "r:gz") as tar:
+        names = tar.getnames()
+    assert "src/engine/__init__.py" in names
+    assert not any(".venv" in name or "__pycache__" in name for name in names)
+
+    with patch("studio.deployments.targets.workbench.write_artifact_archive") as mock_write:
+        assert get_workflow_engine_package(str(engine_dir)) == (package_path, package_sha256)
+    mock_write.assert_not_called()
+
+    # Build files don't change the package, sources do.
+    (engine_dir / ".venv" / "big").write_text("y")
+    assert get_workflow_engine_package(str(engine_dir))[0] == package_path
+    (engine_dir / "src" / "engine" / "__init__.py").write_text("VERSION = 2\n")
+    new_package_path, new_package_sha256 = get_workflow_engine_package(str(engine_dir))
+    assert new_package_path != package_path
+    assert new_package_sha256 != package_sha256
+    assert not os.path.exists(package_path)
+
+
+def test_prepare_workflow_engine_package_skips_current_project_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENT_STUDIO_WORKFLOW_ENGINE_PACKAGE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("CDSW_PROJECT_ID", "project-id")
+    app_dir = tmp_path / "app"
+    _make_workflow_engine_dir(app_dir / "studio")
+    project_root = tmp_path / "project"
+    monkeypatch.setattr("studio.deployments.targets.workbench.app_dir", str(app_dir))
+    monkeypatch.setattr("studio.cross_cutting.apiv2.PROJECT_FILESYSTEM_ROOT", str(project_root))
+
+    uploaded = []
+
+    def fake_upload(client, project_id, target_project_path, local_abs_path, progress_callback=None):
+        uploaded.append(target_project_path)
+        target = project_root / target_project_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(open(local_abs_path, "rb").read())
+
+    with patch("studio.cross_cutting.apiv2.upload_file_to_project", side_effect=fake_upload):
+        prepare_workflow_engine_package(MagicMock(), MagicMock(), "deployments/one")
+        assert uploaded == ["deployments/one/workflow_engine.tar.gz", "deployments/one/cdsw-build.sh"]
+
+        uploaded.clear()
+        prepare_workflow_engine_package(MagicMock(), MagicMock(), "deployments/one")
+        assert uploaded == []
+
+        # A project file of the same size but different content is uploaded again.
+        package = project_root / "deployments" / "one" / "workflow_engine.tar.gz"
+        package.write_bytes(b"\0" * package.stat().st_size)
+        prepare_workflow_engine_package(MagicMock(), MagicMock(), "deployments/one")
+        assert uploaded == ["deployments/one/workflow_engine.tar.gz"]
+
+
+def _package_artifact(directory, files):
+    import tarfile
+    from engine.artifact_delta import ARTIFACT_MANIFEST_FILENAME, build_artifact_manifest
+
+    directory.mkdir(parents=True)
+    members = []
+    for arcname, content in files.items():
+        (directory / arcname).write_text(content)
+        members.append((str(directory / arcname), arcname))
+    manifest_path = directory / ARTIFACT_MANIFEST_FILENAME
+    manifest_path.write_text(json.dumps(build_artifact_manifest(members)))
+    members.append((str(manifest_path), ARTIFACT_MANIFEST_FILENAME))
+    with tarfile.open(directory / "artifact.tar.gz", "w:gz") as tar:
+        for path, arcname in members:
+            tar.add(path, arcname=arcname)
+    return DeploymentArtifact(artifact_path=str(directory / "artifact.tar.gz"), manifest_path=str(manifest_path))
+
+
+def test_upload_workflow_artifact_ships_only_changes(tmp_path, monkeypatch):
+    import tarfile
+
+    monkeypatch.setenv("CDSW_PROJECT_ID", "project-id")
+    project_root = tmp_path / "project"
+    monkeypatch.setattr("studio.cross_cutting.apiv2.PROJECT_FILESYSTEM_ROOT", str(project_root))
+    monkeypatch.setattr("studio.deployments.targets.workbench.PROJECT_FILESYSTEM_ROOT", str(project_root))
+
+    uploaded = []
+
+    def fake_upload(client, project_id, target_project_path, local_abs_path, progress_callback=None):
+        uploaded.append(target_project_path)
+        target = project_root / target_project_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(open(local_abs_path, "rb").read())
+
+    cml = MagicMock()
+    cml.delete_project_file.side_effect = lambda project_id, path: os.remove(project_root / path)
+    files = {"collated_input.json": "v1", "tool.py": "x" * 100}
+
+    with patch("studio.cross_cutting.apiv2.upload_file_to_project", side_effect=fake_upload):
+        upload_workflow_artifact(cml, "deployments/one", _package_artifact(tmp_path / "first", files))
+        assert uploaded == ["deployments/one/artifact.tar.gz", "deployments/one/artifact_manifest.json"]
+
+        # Only the collated input changed: it is shipped alone in a delta.
+        uploaded.clear()
+        artifact = _package_artifact(tmp_path / "second", {**files, "collated_input.json": "v2"})
+        upload_workflow_artifact(cml, "deployments/one", artifact)
+        assert uploaded == ["deployments/one/artifact.delta.tar.gz"]
+        with tarfile.open(project_root / "deployments/one/artifact.delta.tar.gz", "r:gz") as tar:
+            assert "collated_input.json" in tar.getnames()
+            assert "tool.py" not in tar.getnames()
+
+        # Back to the base: the delta is removed.
+        uploaded.clear()
+        upload_workflow_artifact(cml, "deployments/one", _package_artifact(tmp_path / "third", files))
+        assert uploaded == []
+        assert not (project_root / "deployments/one/artifact.delta.tar.gz").exists()
+
+        # Most of the artifact changed: the whole artifact is uploaded as the new base.
+        uploaded.clear()
+        upload_workflow_artifact(
+            cml, "deployments/one", _package_artifact(tmp_path / "fourth", {**files, "tool.py": "y" * 100})
+        )
+        assert uploaded == ["deployments/one/artifact.tar.gz", "deployments/one/artifact_manifest.json"]
@@ -0,0 +1,92 @@
+import sys
+import json
+import base64
+import types
+import importlib
+import importlib.util
+from unittest.mock import MagicMock
+
+import pytest
+
+ENDPOINT = "https://modelservice.ml.example.com/model"
+
+
+@pytest.fixture
+def sdk_workflows(monkeypatch):
+    # studio.sdk.ops reads the ops endpoint from studio.ops, which isn't part of every checkout.
+    if importlib.util.find_spec("studio.ops") is None:
+        ops = types.ModuleType("studio.ops")
+        ops.get_ops_endpoint = lambda: "https://ops.example.com"
+        monkeypatch.setitem(sys.modules, "studio.ops", ops)
+    workflows = importlib.import_module("studio.sdk.workflows")
+    monkeypatch.setattr(workflows, "_get_kickoff_endpoint", lambda *args: ENDPOINT)
+    monkeypatch.setattr(workflows.time, "sleep", lambda seconds: None)
+    return workflows
+
+
+def _response(status_code=200, body=None):
+    response = MagicMock(status_code=status_code, text=json.dumps(body))
+    response.json.return_value = body
+    return response
+
+
+def _batch_inputs(call):
+    return json.loads(base64.b64decode(call.kwargs["json"]["request"]["batch_kickoff_inputs"]))
+
+
+def test_run_workflow_returns_the_trace_id(sdk_workflows, monkeypatch):
+    post = MagicMock(return_value=_response(body={"success": True, "response": {"trace_id": "abc", "queued": False}}))
+    monkeypatch.setattr(sdk_workflows.requests, "post", post)
+
+    assert sdk_workflows.run_workflow(workflow_name="wf", inputs={"topic": "x"}) == "abc"
+    assert post.call_args.kwargs["json"]["request"]["action_type"] == "kickoff"
+
+
+def test_run_workflow_raises_when_the_kickoff_is_rejected(sdk_workflows, monkeypatch):
+    rejected = {"error": "Kickoff rejected: 4 of 4 runs are running", "queue_status": {"queued": 64}}
+    monkeypatch.setattr(
+        sdk_workflows.requests, "post", MagicMock(return_value=_response(body={"success": True, "response": rejected}))
+    )
+
+    with pytest.raises(ValueError) as e:
+        sdk_workflows.run_workflow(workflow_name="wf", inputs={})
+    assert e.value.args == (rejected["error"], rejected["queue_status"])
+
+
+def test_run_workflow_raises_when_the_deployed_workflow_is_unavailable(sdk_workflows, monkeypatch):
+    monkeypatch.setattr(sdk_workflows.requests, "post", MagicMock(return_value=_response(status_code=503)))
+
+    with pytest.raises(ValueError, match="unavailable"):
+        sdk_workflows.run_workflow(workflow_name="wf", inputs={})
+
+
+def test_run_workflow_batch_resends_rejected_runs_in_order(sdk_workflows, monkeypatch):
+    rejection = {"error": "Kickoff rejected", "queue_status": {}}
+    post = MagicMock(
+        side_effect=[
+            _response(body={"success": True, "response": {"runs": [{"trace_id": "t0"}, rejection]}}),
+            _response(body={"success": True, "response": {"runs": [rejection, {"trace_id": "t2"}]}}),
+            _response(status_code=503),
+            _response(body={"success": True, "response": {"runs": [{"trace_id": "t1"}, {"trace_id": "t3"}]}}),
+        ]
+    )
+    monkeypatch.setattr(sdk_workflows.requests, "post", post)
+    inputs_list = [{"n": i} for i in range(4)]
+
+    trace_ids = sdk_workflows.run_workflow_batch(workflow_name="wf", inputs_list=inputs_list, batch_size=2)
+
+    assert trace_ids == ["t0", "t1", "t2", "t3"]
+    assert [_batch_inputs(call) for call in post.call_args_list] == [
+        [{"n": 0}, {"n": 1}],
+        [{"n": 1}, {"n": 2}],
+        [{"n": 1}, {"n": 3}],
+        [{"n": 1}, {"n": 3}],
+    ]
+    assert all(call.kwargs["json"]["request"]["action_type"] == "batch-kickoff" for call in post.call_args_list)
+
+
+def test_run_workflow_batch_gives_up_after_the_timeout(sdk_workflows, monkeypatch):
+    monkeypatch.setattr(sdk_workflows.requests, "post", MagicMock(return_value=_response(status_code=503)))
+
+    with pytest.raises(ValueError, match="2 runs could not be scheduled"):
+        sdk_workflows.run_workflow_batch(workflow_name="wf", inputs_list=[{}, {}], timeout_seconds=0)
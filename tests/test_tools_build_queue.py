@@ -0,0 +1,158 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from studio.tools.build_queue import ToolBuildQueue, ToolBuildPriority
+
+
+class BlockingBuilder:
+    """
+    Build function that records the order of builds and blocks every build until released.
+    """
+
+    def __init__(self):
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+        self._release = threading.Semaphore(0)
+        self._started_event = threading.Semaphore(0)
+
+    def __call__(self, tool_instance_id):
+        with self._lock:
+            self.started.append(tool_instance_id)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self._started_event.release()
+        self._release.acquire()
+        with self._lock:
+            self.running -= 1
+
+    def wait_started(self, count=1):
+        for _ in range(count):
+            assert self._started_event.acquire(timeout=5)
+
+    def release(self, count=1):
+        for _ in range(count):
+            self._release.release()
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=8)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _drain(queue, builder):
+    builder.release(100)
+    for _ in range(500):
+        stats = queue.get_queue_stats()
+        if stats["queued"] == 0 and stats["building"] == 0:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("Build queue did not drain")
+
+
+def test_concurrent_builds_are_capped(executor):
+    builder = BlockingBuilder()
+    queue = ToolBuildQueue(builder, max_concurrent_builds=2, get_executor=lambda: executor)
+
+    for i in range(10):
+        queue.submit(f"tool_{i}")
+    builder.wait_started(2)
+
+    assert queue.get_queue_stats() == {"queued": 8, "building": 2, "max_concurrent_builds": 2}
+    _drain(queue, builder)
+    assert builder.max_running == 2
+    assert sorted(builder.started) == sorted(f"tool_{i}" for i in range(10))
+
+
+def test_queued_tool_is_deduped(executor):
+    builder = BlockingBuilder()
+    queue = ToolBuildQueue(builder, max_concurrent_builds=1, get_executor=lambda: executor)
+
+    queue.submit("tool_a")
+    builder.wait_started()
+    queue.submit("tool_b")
+    queue.submit("tool_b")
+
+    assert queue.get_queue_stats()["queued"] == 1
+    _drain(queue, builder)
+    assert builder.started == ["tool_a", "tool_b"]
+
+
+def test_request_during_build_rebuilds_once_afterwards(executor):
+    builder = BlockingBuilder()
+    queue = ToolBuildQueue(builder, max_concurrent_builds=1, get_executor=lambda: executor)
+
+    queue.submit("tool_a")
+    builder.wait_started()
+    queue.submit("tool_a")
+    queue.submit("tool_a")
+
+    assert queue.get_build_status("tool_a")["rebuild_pending"] is True
+    _drain(queue, builder)
+    assert builder.started == ["tool_a", "tool_a"]
+    assert queue.get_build_status("tool_a") is None
+
+
+def test_priority_and_queue_position(executor):
+    builder = BlockingBuilder()
+    queue = ToolBuildQueue(builder, max_concurrent_builds=1, get_executor=lambda: executor)
+
+    queue.submit("blocker")
+    builder.wait_started()
+    queue.submit("background", "wf_1", ToolBuildPriority.BACKGROUND)
+    queue.submit("interactive", "wf_1", ToolBuildPriority.INTERACTIVE)
+
+    assert queue.get_build_status("blocker")["state"] == "building"
+    assert queue.get_build_status("interactive")["position"] == 1
+    assert queue.get_build_status("background")["position"] == 2
+
+    _drain(queue, builder)
+    assert builder.started == ["blocker", "interactive", "background"]
+
+
+def test_tested_workflow_goes_first(executor):
+    builder = BlockingBuilder()
+    queue = ToolBuildQueue(builder, max_concurrent_builds=1, get_executor=lambda: executor)
+
+    queue.submit("blocker")
+    builder.wait_started()
+    queue.submit("other_tool", "wf_other", ToolBuildPriority.INTERACTIVE)
+    queue.submit("tested_tool", "wf_tested", ToolBuildPriority.BACKGROUND)
+
+    queue.prioritize_workflow("wf_tested")
+    assert queue.get_build_status("tested_tool") == {
+        "state": "queued",
+        "priority": "testing",
+        "position": 1,
+        "waiting_seconds": pytest.approx(0, abs=5),
+    }
+
+    # Tools of the tested workflow requested later also go first.
+    queue.submit("tested_tool_2", "wf_tested", ToolBuildPriority.BACKGROUND)
+    assert queue.get_build_status("tested_tool_2")["position"] == 2
+
+    _drain(queue, builder)
+    assert builder.started == ["blocker", "tested_tool", "tested_tool_2", "other_tool"]
+
+
+def test_failing_build_does_not_stop_the_queue(executor):
+    built = []
+    done = threading.Event()
+
+    def build(tool_instance_id):
+        built.append(tool_instance_id)
+        if tool_instance_id == "tool_b":
+            done.set()
+        raise RuntimeError("COULD NOT INSTALL REQUIREMENTS")
+
+    queue = ToolBuildQueue(build, max_concurrent_builds=1, get_executor=lambda: executor)
+    queue.submit("tool_a")
+    queue.submit("tool_b")
+
+    assert done.wait(timeout=5)
+    assert built == ["tool_a", "tool_b"]